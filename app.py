@@ -1,17 +1,29 @@
-from flask import Flask, render_template, request, jsonify, send_file, redirect, url_for
+from flask import Flask, render_template, request, jsonify, send_file, redirect, url_for, Response, stream_with_context
 import os
+import secrets
+from io import BytesIO
+from werkzeug.utils import secure_filename
 import json,base64
-from kolam.generator import generate_kolam, generate_kolam_with_analysis, generate_kolam_clean
+from kolam.generator import generate_kolam, generate_kolam_with_analysis, generate_kolam_clean, iter_kolam, generate_many, build_kolam_geometry
+from kolam.variation import generate_variant
 from kolam.animated_generator import generate_animated_kolam
 from kolam.analyzer import analyze_symmetry, detect_repetition, classify_pattern
 from kolam.exporter import (
-    save_svg, convert_svg_to_png, convert_svg_to_jpg, 
+    save_svg, geometry_to_png, geometry_to_jpg,
+    export_bytes, EXPORT_MIMETYPES,
     batch_export_patterns, export_pattern_with_metadata,
-    create_shareable_link, generate_qr_code
+    create_shareable_link, generate_qr_code, load_shared_pattern
+)
+from kolam.animation import (
+    generate_animation_deltas, create_delta_animation_svg, iter_animation_frames,
+    generate_stroke_animation, highlight_symmetry_axes
 )
-from kolam.animation import generate_animation_frames, create_animation_svg, highlight_symmetry_axes
 from kolam.image_processor import process_uploaded_image, generate_svg_from_detected_pattern
-from kolam.utils import get_pattern_categories, get_pattern_description, get_symmetry_explanation
+from kolam.utils import (
+    get_pattern_categories, get_pattern_description, get_symmetry_explanation, MAX_BATCH_SPECS,
+    check_large_grid_size
+)
+from kolam.svg import COMPACT_PRECISION
 
 app = Flask(__name__)
 app.config['MAX_CONTENT_LENGTH'] = 16 * 1024 * 1024  # 16MB max file size
@@ -36,10 +48,14 @@ def generate():
         grid_size = request.form.get('grid_size', 7)
         pattern = request.form.get('pattern', 'basic')
         include_analysis = request.form.get('include_analysis', 'false') == 'true'
+        stream = request.form.get('stream', 'false') == 'true'
+        large = request.form.get('large', 'false') == 'true'
     else:
         grid_size = request.args.get('grid_size', 7)
         pattern = request.args.get('pattern', 'basic')
         include_analysis = request.args.get('include_analysis', 'false') == 'true'
+        stream = request.args.get('stream', 'false') == 'true'
+        large = request.args.get('large', 'false') == 'true'
 
     # Defensive parsing
     try:
@@ -47,6 +63,16 @@ def generate():
     except ValueError:
         grid_size = 7
 
+    # Send the bare SVG in chunks as it is written; large grids are always streamed
+    if stream or large:
+        if large:
+            try:
+                check_large_grid_size(grid_size, pattern)
+            except ValueError as e:
+                return jsonify({'success': False, 'error': str(e)}), 400
+        chunks = iter_kolam(grid_size, pattern, precision=COMPACT_PRECISION, large=large)
+        return Response(stream_with_context(chunks), mimetype='image/svg+xml')
+
     # Generate animated SVG with or without analysis
     if include_analysis:
         result = generate_kolam_with_analysis(grid_size=grid_size, pattern=pattern)
@@ -91,14 +117,24 @@ def animate():
     pattern = data.get('pattern', 'basic').lower()
     grid_size = data.get('grid_size', 7)
     frame_count = data.get('frame_count', 30)
+    mode = data.get('mode', 'stroke')
     
-    # Generate animation frames
-    frames = generate_animation_frames('', grid_size, pattern, frame_count)
-    
-    # Create animated SVG
-    animated_svg = create_animation_svg(frames, duration=3.0)
+    # Declarative stroke drawing needs no frames; only the replay builds them
+    if mode == 'stroke':
+        animated_svg = generate_stroke_animation(grid_size, pattern, duration=3.0,
+                                                 precision=COMPACT_PRECISION, optimize=True)
+        return jsonify({'animated_svg': animated_svg})
     
-    return jsonify({'animated_svg': animated_svg, 'frames': frames})
+    animation = generate_animation_deltas('', grid_size, pattern, frame_count,
+                                          precision=COMPACT_PRECISION, classes=True)
+    # Full frames stay under 'frames' for existing clients; 'delta' asks for
+    # the compact encoding instead
+    response = {'animated_svg': create_delta_animation_svg(animation, duration=3.0)}
+    if data.get('delta'):
+        response['animation'] = animation
+    else:
+        response['frames'] = list(iter_animation_frames(animation))
+    return jsonify(response)
 
 @app.route('/upload', methods=['POST'])
 def upload_image():
@@ -151,18 +187,51 @@ def export_pattern():
     grid_size = data.get('grid_size', 7)
     pattern = data.get('pattern', 'basic')
 
+    # Stream the SVG straight to the client instead of saving it
+    if format_type == 'svg' and data.get('stream'):
+        if data.get('large'):
+            try:
+                check_large_grid_size(grid_size, pattern)
+            except ValueError as e:
+                return jsonify({'success': False, 'error': str(e)}), 400
+        chunks = iter_kolam(grid_size, pattern, show_grid=False, precision=COMPACT_PRECISION,
+                            optimize=True, large=bool(data.get('large')))
+        response = Response(stream_with_context(chunks), mimetype='image/svg+xml')
+        # Quoted as RFC 6266 asks; secure_filename drops quotes and line breaks
+        response.headers.set('Content-Disposition', 'attachment',
+                             filename=f"{secure_filename(filename) or 'kolam'}.svg")
+        return response
+    
     try:
-        # Generate clean SVG without grid dots for export
-        clean_svg = generate_kolam_clean(grid_size, pattern)
+        # Build only what the format needs: the clean SVG, or the geometry that
+        # raster formats are drawn from instead of parsing the SVG back
+        clean_svg = clean_geometry = None
+        if format_type in ('svg', 'all'):
+            clean_svg = generate_kolam_clean(grid_size, pattern, precision=COMPACT_PRECISION,
+                                             optimize=True)
+        if format_type in ('png', 'jpg', 'all'):
+            clean_geometry = build_kolam_geometry(grid_size, pattern, show_grid=False)
+        # Print resolution and anti-aliasing for PNG and JPG, see kolam.raster.render_canvas
+        raster = {'dpi': data.get('dpi'), 'supersample': int(data.get('supersample', 1))}
+        
+        # Send the file itself as the response: one request per download and
+        # nothing left behind in exports/
+        if data.get('download') and format_type in EXPORT_MIMETYPES:
+            drawing = clean_svg if format_type == 'svg' else clean_geometry
+            return send_file(BytesIO(export_bytes(drawing, format_type, **raster)),
+                             mimetype=EXPORT_MIMETYPES[format_type], as_attachment=True,
+                             download_name=f"{secure_filename(filename) or 'kolam'}.{format_type}")
         
         if format_type == 'svg':
             fname = save_svg(clean_svg, f"{filename}.svg")
         elif format_type == 'png':
-            fname = convert_svg_to_png(clean_svg, f"{filename}.png")
+            fname = geometry_to_png(clean_geometry, f"{filename}.png", **raster)
         elif format_type == 'jpg':
-            fname = convert_svg_to_jpg(clean_svg, f"{filename}.jpg")
+            fname = geometry_to_jpg(clean_geometry, f"{filename}.jpg", **raster)
         elif format_type == 'all':
-            results = export_pattern_with_metadata(clean_svg, metadata, filename)
+            results = export_pattern_with_metadata(clean_svg, metadata, filename,
+                                                   geometry=clean_geometry,
+                                                   base_url=request.host_url.rstrip('/'))
             return jsonify({'success': True, 'files': results})
         else:
             return jsonify({'success': False, 'error': 'Unsupported format'})
@@ -177,8 +246,11 @@ def export_pattern():
 @app.route('/shared/<encoded>')
 def shared(encoded):
     try:
-        raw = base64.b64decode(encoded.encode()).decode()
-        data = json.loads(raw)
+        # Links from the share store carry a fingerprint, older ones the data itself
+        data = load_shared_pattern(encoded)
+        if data is None:
+            raw = base64.b64decode(encoded.encode()).decode()
+            data = json.loads(raw)
         svg = data.get('svg') or data.get('pattern')
         analysis = data.get('analysis') or data.get('metadata', {}).get('analysis')
         pattern_categories = get_pattern_categories()
@@ -206,6 +278,52 @@ def generate_qr():
     except Exception as e:
         return jsonify({'success': False, 'error': str(e)})
 
+@app.route('/batch_generate', methods=['POST'])
+def batch_generate():
+    """Generate many patterns at once, streamed back as JSON lines in request order."""
+    data = request.get_json() or {}
+    specs = data.get('specs', [])
+    # Every request shares one process pool, so bound what a single one may queue
+    if not isinstance(specs, list) or len(specs) > MAX_BATCH_SPECS:
+        return jsonify({'success': False,
+                        'error': f'specs must be a list of at most {MAX_BATCH_SPECS} patterns'}), 400
+    if any(isinstance(spec, dict) and spec.get('large') for spec in specs):
+        return jsonify({'success': False,
+                        'error': 'large grids are not batched; use /generate with large=true'}), 400
+
+    try:
+        results = generate_many(specs)
+        # Validate the specs before the response starts
+        first = next(results, None)
+    except Exception as e:
+        return jsonify({'success': False, 'error': str(e)}), 400
+
+    def lines():
+        if first is None:
+            return
+        yield json.dumps({'index': 0, 'spec': specs[0], 'svg': first}) + '\n'
+        for index, svg in enumerate(results, start=1):
+            yield json.dumps({'index': index, 'spec': specs[index], 'svg': svg}) + '\n'
+
+    return Response(stream_with_context(lines()), mimetype='application/x-ndjson')
+
+@app.route('/variant', methods=['POST'])
+def variant():
+    """Generate a seeded variant of a pattern; the same seed redraws the same kolam."""
+    data = request.get_json() or {}
+    seed = data.get('seed')
+    if seed is None:
+        seed = secrets.randbits(32)
+    params = {name: tuple(value) if isinstance(value, list) else value
+              for name, value in data.get('parameters', {}).items()}
+
+    try:
+        svg, parameters = generate_variant(data.get('grid_size', 7), data.get('pattern', 'flower'),
+                                           seed, data.get('show_grid', True), **params)
+    except (TypeError, ValueError) as e:
+        return jsonify({'success': False, 'error': str(e)}), 400
+    return jsonify({'success': True, 'svg': svg, 'seed': seed, 'parameters': parameters})
+
 @app.route('/batch_export', methods=['POST'])
 def batch_export():
     """Export multiple patterns with sharing options."""
@@ -3,24 +3,13 @@
 import numpy as np
 import math
 from typing import List, Tuple, Dict, Any
+from kolam.registry import get_pattern, is_registered
 
 def analyze_symmetry_from_pattern(pattern_type: str, grid_size: int) -> Dict[str, bool]:
     """Analyze symmetry based on pattern type and mathematical properties."""
-    # Define symmetry properties for each pattern type
-    symmetry_map = {
-        'basic': {"horizontal": True, "vertical": True, "diagonal": True, "radial": False},
-        'diamond': {"horizontal": True, "vertical": True, "diagonal": True, "radial": False},
-        'spiral': {"horizontal": False, "vertical": False, "diagonal": False, "radial": True},
-        'flower': {"horizontal": True, "vertical": True, "diagonal": False, "radial": True},
-        'lotus': {"horizontal": True, "vertical": True, "diagonal": False, "radial": True},
-        'rose': {"horizontal": False, "vertical": False, "diagonal": False, "radial": True},
-        'star': {"horizontal": True, "vertical": True, "diagonal": True, "radial": True},
-        'sunburst': {"horizontal": True, "vertical": True, "diagonal": True, "radial": True},
-        'mandala': {"horizontal": True, "vertical": True, "diagonal": True, "radial": True},
-        'compass': {"horizontal": True, "vertical": True, "diagonal": True, "radial": False}
-    }
-    
-    return symmetry_map.get(pattern_type, {"horizontal": False, "vertical": False, "diagonal": False, "radial": False})
+    if not is_registered(pattern_type):
+        return {"horizontal": False, "vertical": False, "diagonal": False, "radial": False}
+    return dict(get_pattern(pattern_type).symmetry)
 
 def analyze_symmetry(coords: List[Tuple[float, float]], grid_size: int) -> Dict[str, bool]:
     """Check for horizontal, vertical, diagonal, and radial symmetry."""
@@ -247,103 +236,21 @@ def classify_pattern(coords: List[Tuple[float, float]], grid_size: int, pattern_
 
 def _analyze_repetition_from_pattern(pattern_type: str, grid_size: int) -> Dict[str, Any]:
     """Analyze repetition based on pattern type."""
-    repetition_map = {
-        'basic': {"has_repetition": True, "motif_size": 1, "description": "Nested square repetition"},
-        'diamond': {"has_repetition": True, "motif_size": 1, "description": "Diamond shape repetition"},
-        'spiral': {"has_repetition": False, "motif_size": 0, "description": "Continuous spiral pattern"},
-        'flower': {"has_repetition": True, "motif_size": 6, "description": "Petal repetition"},
-        'lotus': {"has_repetition": True, "motif_size": 8, "description": "Layered petal repetition"},
-        'rose': {"has_repetition": False, "motif_size": 0, "description": "Continuous spiral rose"},
-        'star': {"has_repetition": True, "motif_size": 2, "description": "Star point repetition"},
-        'sunburst': {"has_repetition": True, "motif_size": 1, "description": "Ray repetition"},
-        'mandala': {"has_repetition": True, "motif_size": 1, "description": "Concentric repetition"},
-        'compass': {"has_repetition": True, "motif_size": 4, "description": "Directional repetition"}
-    }
-    
-    return repetition_map.get(pattern_type, {"has_repetition": False, "motif_size": 0, "description": "No repetition detected"})
+    if not is_registered(pattern_type):
+        return {"has_repetition": False, "motif_size": 0, "description": "No repetition detected"}
+    return dict(get_pattern(pattern_type).repetition)
 
 def _get_pattern_attributes(pattern_type: str, grid_size: int) -> Dict[str, bool]:
     """Get pattern attributes based on pattern type."""
-    attributes_map = {
-        'basic': {
-            "looped_traversal": True,
-            "grid_repetition": True,
-            "rotational_symmetry": False,
-            "bilateral_symmetry": True,
-            "diagonal_symmetry": True
-        },
-        'diamond': {
-            "looped_traversal": True,
-            "grid_repetition": True,
-            "rotational_symmetry": False,
-            "bilateral_symmetry": True,
-            "diagonal_symmetry": True
-        },
-        'spiral': {
-            "looped_traversal": False,
-            "grid_repetition": False,
-            "rotational_symmetry": True,
-            "bilateral_symmetry": False,
-            "diagonal_symmetry": False
-        },
-        'flower': {
-            "looped_traversal": False,
-            "grid_repetition": True,
-            "rotational_symmetry": True,
-            "bilateral_symmetry": True,
-            "diagonal_symmetry": False
-        },
-        'lotus': {
-            "looped_traversal": False,
-            "grid_repetition": True,
-            "rotational_symmetry": True,
-            "bilateral_symmetry": True,
-            "diagonal_symmetry": False
-        },
-        'rose': {
+    if not is_registered(pattern_type):
+        return {
             "looped_traversal": False,
             "grid_repetition": False,
-            "rotational_symmetry": True,
+            "rotational_symmetry": False,
             "bilateral_symmetry": False,
             "diagonal_symmetry": False
-        },
-        'star': {
-            "looped_traversal": True,
-            "grid_repetition": True,
-            "rotational_symmetry": True,
-            "bilateral_symmetry": True,
-            "diagonal_symmetry": True
-        },
-        'sunburst': {
-            "looped_traversal": False,
-            "grid_repetition": True,
-            "rotational_symmetry": True,
-            "bilateral_symmetry": True,
-            "diagonal_symmetry": True
-        },
-        'mandala': {
-            "looped_traversal": False,
-            "grid_repetition": True,
-            "rotational_symmetry": True,
-            "bilateral_symmetry": True,
-            "diagonal_symmetry": True
-        },
-        'compass': {
-            "looped_traversal": False,
-            "grid_repetition": True,
-            "rotational_symmetry": False,
-            "bilateral_symmetry": True,
-            "diagonal_symmetry": True
         }
-    }
-    
-    return attributes_map.get(pattern_type, {
-        "looped_traversal": False,
-        "grid_repetition": False,
-        "rotational_symmetry": False,
-        "bilateral_symmetry": False,
-        "diagonal_symmetry": False
-    })
+    return dict(get_pattern(pattern_type).attributes)
 
 def _determine_pattern_type(symmetry: Dict[str, bool], repetition: Dict[str, Any]) -> str:
     """Determine the overall pattern type based on analysis."""
@@ -1,80 +1,109 @@
 # kolam/animated_generator.py
 
 import math
+import numpy as np
+from collections.abc import Sequence
 from kolam.generator import generate_kolam
+from kolam.cache import LRUCache
+from kolam.geometry import polar_points, OP_LINE, OP_QUAD
+from kolam.svg import dot_grid_markup, iter_svg_elements, DEFAULT_DOT_MODE
+from kolam.patterns.pulli import generate_pulli_pattern
+from kolam.patterns.sikku import generate_sikku_pattern
+from kolam.registry import get_pattern
+from kolam.utils import clamp_grid_size
 from kolam.animation import generate_animation_frames, create_animation_svg
 
-def generate_animated_kolam(grid_size=7, pattern='basic', frame_count=30):
+# Final frames are what /generate displays, so keep the recent ones around
+_final_frame_cache = LRUCache(maxsize=256)
+
+def generate_animated_kolam(grid_size=7, pattern='basic', frame_count=30,
+                            dot_mode=DEFAULT_DOT_MODE):
     """Generate an animated Kolam pattern that draws step by step."""
-    # Generate animation frames
-    frames = generate_clean_animation_frames(grid_size, pattern, frame_count)
-    
-    # Return the final frame (complete pattern) for display
-    if frames:
-        return frames[-1]  # Return the last frame (complete pattern)
+    if frame_count > 0:
+        # Return the last frame (complete pattern) for display
+        key = (pattern, grid_size, frame_count, dot_mode)
+        return _final_frame_cache.get_or_compute(
+            key, lambda: generate_final_frame(grid_size, pattern, frame_count, dot_mode)
+        )
     else:
         # Fallback to regular generation
-        from kolam.generator import generate_kolam
-        return generate_kolam(grid_size, pattern)
+        return generate_kolam(grid_size, pattern, dot_mode=dot_mode)
 
-def generate_animated_kolam_clean(grid_size=7, pattern='basic', frame_count=30):
+def generate_animated_kolam_clean(grid_size=7, pattern='basic', frame_count=30,
+                                  dot_mode=DEFAULT_DOT_MODE):
     """Generate a clean animated Kolam pattern without grid dots for export."""
-    # Generate clean frames without grid dots
-    frames = generate_clean_animation_frames(grid_size, pattern, frame_count)
+    # Frames are rendered one at a time while the document is written
+    frames = LazyAnimationFrames(grid_size, pattern, frame_count, dot_mode)
     
     # Create animated SVG
     animated_svg = create_animation_svg(frames, duration=3.0)
     
     return animated_svg
 
-def generate_clean_animation_frames(grid_size, pattern, frame_count=30):
+def generate_clean_animation_frames(grid_size, pattern, frame_count=30,
+                                    dot_mode=DEFAULT_DOT_MODE):
     """Generate clean animation frames without grid dots."""
-    frames = []
-    dot_spacing = 40
-    padding = 20
-    center = grid_size // 2
-    
-    for frame in range(frame_count):
+    return list(LazyAnimationFrames(grid_size, pattern, frame_count, dot_mode))
+
+def generate_final_frame(grid_size, pattern, frame_count=30, dot_mode=DEFAULT_DOT_MODE):
+    """Render only the last animation frame, skipping every earlier one."""
+    if frame_count <= 0:
+        return None
+    return LazyAnimationFrames(grid_size, pattern, frame_count, dot_mode)[-1]
+
+class LazyAnimationFrames(Sequence):
+    """Animation frames rendered on demand.
+
+    Behaves like the list returned by ``generate_clean_animation_frames``
+    but only builds the frames that are indexed or iterated. The grid dot
+    markup is shared by every frame and is built once.
+    """
+
+    def __init__(self, grid_size, pattern, frame_count=30, dot_mode=DEFAULT_DOT_MODE):
+        self.grid_size = clamp_grid_size(grid_size)
+        self.pattern = pattern
+        self.frame_count = max(frame_count, 0)
+        self.dot_mode = dot_mode
+        self._dots = None
+
+    def __len__(self):
+        return self.frame_count
+
+    def __getitem__(self, index):
+        if isinstance(index, slice):
+            return [self[i] for i in range(*index.indices(self.frame_count))]
+        if index < 0:
+            index += self.frame_count
+        if not 0 <= index < self.frame_count:
+            raise IndexError("animation frame index out of range")
+        return self._render(index)
+
+    def _grid_dots(self, dot_spacing, padding):
+        if self._dots is None:
+            self._dots = dot_grid_markup(self.grid_size, dot_spacing, padding, self.dot_mode)
+        return self._dots
+
+    def _render(self, frame):
+        grid_size = self.grid_size
+        pattern = self.pattern
+        dot_spacing = 40
+        padding = 20
+        
         svg = f'<svg width="{grid_size * dot_spacing + 2 * padding}" height="{grid_size * dot_spacing + 2 * padding}" xmlns="http://www.w3.org/2000/svg">'
         svg += '<rect width="100%" height="100%" fill="white"/>'
         
         # Add grid dots for reference during animation
-        for y in range(grid_size):
-            for x in range(grid_size):
-                cx = x * dot_spacing + padding
-                cy = y * dot_spacing + padding
-                svg += f'<circle cx="{cx}" cy="{cy}" r="3" fill="#333"/>\n'
+        spec = get_pattern(pattern)
+        lattice = spec.lattice_padding(dot_spacing, padding)
+        svg += self._grid_dots(dot_spacing, lattice)
         
         # Animate pattern drawing based on type
-        progress = frame / frame_count
+        progress = frame / self.frame_count
         
-        if pattern == 'basic':
-            svg += _animate_basic_pattern_clean(grid_size, dot_spacing, padding, progress)
-        elif pattern == 'diamond':
-            svg += _animate_diamond_pattern_clean(grid_size, dot_spacing, padding, progress)
-        elif pattern == 'spiral':
-            svg += _animate_spiral_pattern_clean(grid_size, dot_spacing, padding, progress)
-        elif pattern == 'flower':
-            svg += _animate_flower_pattern_clean(grid_size, dot_spacing, padding, progress)
-        elif pattern == 'lotus':
-            svg += _animate_lotus_pattern_clean(grid_size, dot_spacing, padding, progress)
-        elif pattern == 'rose':
-            svg += _animate_rose_pattern_clean(grid_size, dot_spacing, padding, progress)
-        elif pattern == 'star':
-            svg += _animate_star_pattern_clean(grid_size, dot_spacing, padding, progress)
-        elif pattern == 'sunburst':
-            svg += _animate_sunburst_pattern_clean(grid_size, dot_spacing, padding, progress)
-        elif pattern == 'mandala':
-            svg += _animate_mandala_pattern_clean(grid_size, dot_spacing, padding, progress)
-        elif pattern == 'compass':
-            svg += _animate_compass_pattern_clean(grid_size, dot_spacing, padding, progress)
-        else:
-            svg += _animate_basic_pattern_clean(grid_size, dot_spacing, padding, progress)
+        svg += spec.clean_animator(grid_size, dot_spacing, lattice, progress)
         
         svg += '</svg>'
-        frames.append(svg)
-    
-    return frames
+        return svg
 
 def _animate_basic_pattern_clean(grid_size, dot_spacing, padding, progress):
     """Animate basic square pattern without grid dots."""
@@ -145,12 +174,10 @@ def _animate_spiral_pattern_clean(grid_size, dot_spacing, padding, progress):
     max_radius = (grid_size // 2) * dot_spacing * 0.8
     
     if max_angle > 0:
-        path = f"M{center_x},{center_y}"
-        for angle in range(0, max_angle, 5):
-            radius = (angle / 720) * max_radius
-            x = center_x + radius * math.cos(math.radians(angle))
-            y = center_y + radius * math.sin(math.radians(angle))
-            path += f" L{x},{y}"
+        angles = np.arange(0, max_angle, 5)
+        radii = (angles / 720) * max_radius
+        points = polar_points(center_x, center_y, radii, np.radians(angles))
+        path = f"M{center_x},{center_y}" + ''.join(f" L{x},{y}" for x, y in points.tolist())
         
         pattern += f'<path d="{path}" fill="none" stroke="#8B4513" stroke-width="3" stroke-linecap="round"/>'
     
@@ -234,26 +261,26 @@ def _animate_rose_pattern_clean(grid_size, dot_spacing, padding, progress):
     max_angle = int(progress * 1440)  # 4 full rotations
     
     if max_angle > 0:
-        for angle in range(0, max_angle, 2):
-            radius = (angle / 1440) * max_radius
-            x = center_x + radius * math.cos(math.radians(angle))
-            y = center_y + radius * math.sin(math.radians(angle))
+        # Only every 20th degree carries a petal
+        angles = np.arange(0, max_angle, 20)
+        radii = (angles / 1440) * max_radius
+        petal_angles = np.radians(angles)
+        centers = polar_points(center_x, center_y, radii, petal_angles)
+        petal_radii = radii * 0.3
+        side1 = polar_points(centers[:, 0], centers[:, 1], petal_radii, petal_angles + math.pi/4)
+        side2 = polar_points(centers[:, 0], centers[:, 1], petal_radii, petal_angles - math.pi/4)
+        
+        petals = []
+        for angle, (x, y), (x1, y1), (x2, y2) in zip(angles.tolist(), centers.tolist(),
+                                                     side1.tolist(), side2.tolist()):
+            path_color = f"hsl({(angle * 0.5) % 360}, 80%, 60%)"
             
-            if angle % 20 == 0:
-                petal_angle = math.radians(angle)
-                petal_radius = radius * 0.3
-                x1 = x + petal_radius * math.cos(petal_angle + math.pi/4)
-                y1 = y + petal_radius * math.sin(petal_angle + math.pi/4)
-                x2 = x + petal_radius * math.cos(petal_angle - math.pi/4)
-                y2 = y + petal_radius * math.sin(petal_angle - math.pi/4)
-                
-                path_color = f"hsl({(angle * 0.5) % 360}, 80%, 60%)"
-                
-                pattern += f'''
+            petals.append(f'''
     <path d="M{x},{y} Q{x1},{y1} {x},{y} Q{x2},{y2} {x},{y}" 
           fill="none" stroke="{path_color}" stroke-width="1.5" 
           stroke-linecap="round"/>
-    '''
+    ''')
+        pattern += ''.join(petals)
     return pattern
 
 def _animate_star_pattern_clean(grid_size, dot_spacing, padding, progress):
@@ -270,17 +297,14 @@ def _animate_star_pattern_clean(grid_size, dot_spacing, padding, progress):
     points_to_draw = int(progress * num_points * 2)
     
     if points_to_draw > 0:
-        path = f"M{center_x},{center_y}"
-        for i in range(points_to_draw):
-            angle = (i * 360 / (num_points * 2)) * (math.pi / 180)
-            radius = outer_radius if i % 2 == 0 else inner_radius
-            x = center_x + radius * math.cos(angle)
-            y = center_y + radius * math.sin(angle)
-            path += f" L{x},{y}"
+        i = np.arange(points_to_draw)
+        angles = (i * 360 / (num_points * 2)) * (math.pi / 180)
+        radii = np.where(i % 2 == 0, outer_radius, inner_radius)
+        points = polar_points(center_x, center_y, radii, angles)
+        path = f"M{center_x},{center_y}" + ''.join(f" L{x},{y}" for x, y in points.tolist())
         
-        if points_to_draw > 0:
-            path += " Z"
-            pattern += f'<path d="{path}" fill="none" stroke="#4B0082" stroke-width="2" stroke-linejoin="round"/>'
+        path += " Z"
+        pattern += f'<path d="{path}" fill="none" stroke="#4B0082" stroke-width="2" stroke-linejoin="round"/>'
     
     return pattern
 
@@ -337,16 +361,14 @@ def _animate_mandala_pattern_clean(grid_size, dot_spacing, padding, progress):
         for i in range(3, min(shapes_to_draw + 3, center + 1), 2):
             radius = i * dot_spacing * 0.6
             num_sides = 6 + i
-            for j in range(num_sides):
-                angle1 = (j * 360 / num_sides) * (math.pi / 180)
-                angle2 = ((j + 1) * 360 / num_sides) * (math.pi / 180)
-                
-                x1 = center_x + radius * math.cos(angle1)
-                y1 = center_y + radius * math.sin(angle1)
-                x2 = center_x + radius * math.cos(angle2)
-                y2 = center_y + radius * math.sin(angle2)
-                
-                path_color = f"hsl({(i * 45 + j * 30) % 360}, 70%, 60%)"
+            j = np.arange(num_sides)
+            angle1 = (j * 360 / num_sides) * (math.pi / 180)
+            angle2 = ((j + 1) * 360 / num_sides) * (math.pi / 180)
+            starts = polar_points(center_x, center_y, radius, angle1).tolist()
+            ends = polar_points(center_x, center_y, radius, angle2).tolist()
+            
+            for side, (x1, y1), (x2, y2) in zip(j.tolist(), starts, ends):
+                path_color = f"hsl({(i * 45 + side * 30) % 360}, 70%, 60%)"
                 
                 pattern += f'''
     <line x1="{x1}" y1="{y1}" x2="{x2}" y2="{y2}" 
@@ -394,3 +416,15 @@ def _animate_compass_pattern_clean(grid_size, dot_spacing, padding, progress):
     
     return pattern
 
+def _animate_pulli_pattern_clean(grid_size, dot_spacing, padding, progress):
+    """Animate the pulli kolam along its single stroke without grid dots."""
+    return _draw_segments(generate_pulli_pattern(grid_size, dot_spacing, padding), progress)
+
+def _animate_sikku_pattern_clean(grid_size, dot_spacing, padding, progress):
+    """Animate the sikku kolam one mirror curve after another without grid dots."""
+    return _draw_segments(generate_sikku_pattern(grid_size, dot_spacing, padding), progress)
+
+def _draw_segments(geometry, progress):
+    """Serialize the share ``progress`` of the segments of a geometry, in drawing order."""
+    segments = np.count_nonzero((geometry.ops == OP_LINE) | (geometry.ops == OP_QUAD))
+    return ''.join(iter_svg_elements(geometry.head_segments(int(progress * segments))))
@@ -3,291 +3,231 @@
 import math
 from typing import List, Tuple, Dict, Any
 import json
+import numpy as np
+from kolam.geometry import (
+    Geometry, GeometryBuilder, element_lengths, polar_points,
+    OP_MOVE, OP_LINE, OP_QUAD
+)
+from kolam.svg import iter_svg_open, iter_svg_elements, SVG_CLOSE, DEFAULT_DOT_MODE
+from kolam.registry import get_pattern
+from kolam.utils import clamp_grid_size
+from kolam.patterns.pulli import pulli_stroke, PULLI_STYLE
+from kolam.patterns.sikku import mirror_curve_paths, sikku_mirrors, SIKKU_STYLE
+
+# A timeline is a geometry plus, for every frame, how many of its
+# elements are visible in that frame. Counts never decrease, so each
+# frame only adds elements to the previous one.
+Timeline = Tuple[Geometry, List[int]]
 
 def generate_animation_frames(svg_content: str, grid_size: int, 
-                            pattern_type: str, frame_count: int = 30) -> List[str]:
+                            pattern_type: str, frame_count: int = 30,
+                            dot_mode: str = DEFAULT_DOT_MODE, precision: int = None) -> List[str]:
     """Generate animation frames for step-by-step Kolam drawing."""
-    frames = []
-    
-    if pattern_type == "basic":
-        frames = _animate_basic_pattern(grid_size, frame_count)
-    elif pattern_type == "flower":
-        frames = _animate_flower_pattern(grid_size, frame_count)
-    elif pattern_type == "star":
-        frames = _animate_star_pattern(grid_size, frame_count)
-    elif pattern_type == "diamond":
-        frames = _animate_diamond_pattern(grid_size, frame_count)
-    elif pattern_type == "spiral":
-        frames = _animate_spiral_pattern(grid_size, frame_count)
+    animation = generate_animation_deltas(svg_content, grid_size, pattern_type, frame_count,
+                                          dot_mode, precision)
+    return list(iter_animation_frames(animation))
+
+def generate_animation_deltas(svg_content: str, grid_size: int,
+                              pattern_type: str, frame_count: int = 30,
+                              dot_mode: str = DEFAULT_DOT_MODE,
+                              precision: int = None, classes: bool = False) -> Dict[str, Any]:
+    """Generate delta-encoded animation frames.
+
+    ``base`` holds the background and grid dots, emitted once. ``deltas[i]``
+    holds only the markup added by frame ``i``; a full frame is ``base`` plus
+    every delta up to it plus ``end``.
+    """
+    geometry, counts = _build_timeline(grid_size, pattern_type, frame_count)
+    deltas = []
+    shown = 0
+    for count in counts:
+        deltas.append(''.join(iter_svg_elements(geometry, shown, count,
+                                                precision=precision, classes=classes)))
+        shown = count
+    return {
+        "base": ''.join(iter_svg_open(geometry, dot_mode, classes)),
+        "deltas": deltas,
+        "end": SVG_CLOSE
+    }
+
+def animation_frame(animation: Dict[str, Any], index: int) -> str:
+    """Rebuild the full SVG of a single frame of a delta-encoded animation."""
+    return animation["base"] + ''.join(animation["deltas"][:index + 1]) + animation["end"]
+
+def iter_animation_frames(animation: Dict[str, Any]):
+    """Yield the full SVG of every frame of a delta-encoded animation."""
+    body = ''
+    for delta in animation["deltas"]:
+        body += delta
+        yield animation["base"] + body + animation["end"]
+
+def _build_timeline(grid_size: int, pattern_type: str, frame_count: int) -> Timeline:
+    grid_size = clamp_grid_size(grid_size)
+    spec = get_pattern(pattern_type)
+    if spec.timeline is not None:
+        geometry, counts = spec.timeline(grid_size, frame_count)
     else:
-        frames = _animate_basic_pattern(grid_size, frame_count)
-    
-    return frames
+        geometry, counts = _animate_elements(spec.generate(grid_size, 40, 20), frame_count)
 
-def _animate_basic_pattern(grid_size: int, frame_count: int) -> List[str]:
-    """Animate basic square pattern."""
-    frames = []
     dot_spacing = 40
     padding = 20
-    center = grid_size // 2
-    
-    for frame in range(frame_count):
-        svg = f'<svg width="{grid_size * dot_spacing + 2 * padding}" height="{grid_size * dot_spacing + 2 * padding}" xmlns="http://www.w3.org/2000/svg">'
-        svg += '<rect width="100%" height="100%" fill="white"/>'
-        
-        # Draw grid dots
-        for y in range(grid_size):
-            for x in range(grid_size):
-                cx = x * dot_spacing + padding
-                cy = y * dot_spacing + padding
-                svg += f'<circle cx="{cx}" cy="{cy}" r="3" fill="#333"/>'
-        
-        # Animate pattern drawing
-        progress = frame / frame_count
-        max_rings = center
-        
-        for ring in range(int(progress * max_rings)):
-            i = ring
-            x1 = (center - i) * dot_spacing + padding
-            y1 = (center - i) * dot_spacing + padding
-            x2 = (center + i) * dot_spacing + padding
-            y2 = (center - i) * dot_spacing + padding
-            x3 = (center + i) * dot_spacing + padding
-            y3 = (center + i) * dot_spacing + padding
-            x4 = (center - i) * dot_spacing + padding
-            y4 = (center + i) * dot_spacing + padding
-
-            path_color = f"hsl({(i * 30) % 360}, 70%, 50%)"
-            path_width = 2 + (center - i) / 2
-
-            svg += f'''
-        <path d="M{x1},{y1} L{x2},{y2} L{x3},{y3} L{x4},{y4} Z" 
-              fill="none" stroke="{path_color}" stroke-width="{path_width}" 
-              stroke-linecap="round"/>
-        '''
-        
-        svg += '</svg>'
-        frames.append(svg)
-    
-    return frames
+    canvas_size = grid_size * dot_spacing + 2 * padding
+    geometry = geometry.on_canvas(canvas_size, canvas_size, background='white',
+                                  grid=(grid_size, dot_spacing,
+                                        spec.lattice_padding(dot_spacing, padding)))
+    return geometry, counts
 
-def _animate_flower_pattern(grid_size: int, frame_count: int) -> List[str]:
-    """Animate flower pattern drawing."""
-    frames = []
-    dot_spacing = 40
-    padding = 20
-    center = grid_size // 2
-    center_x = center * dot_spacing + padding
-    center_y = center * dot_spacing + padding
-    
-    for frame in range(frame_count):
-        svg = f'<svg width="{grid_size * dot_spacing + 2 * padding}" height="{grid_size * dot_spacing + 2 * padding}" xmlns="http://www.w3.org/2000/svg">'
-        svg += '<rect width="100%" height="100%" fill="white"/>'
-        
-        # Draw grid dots
-        for y in range(grid_size):
-            for x in range(grid_size):
-                cx = x * dot_spacing + padding
-                cy = y * dot_spacing + padding
-                svg += f'<circle cx="{cx}" cy="{cy}" r="3" fill="#333"/>'
-        
-        # Animate flower drawing
-        progress = frame / frame_count
-        num_petals = min(grid_size - 2, 8)
-        radius = (grid_size // 2) * dot_spacing * 0.8
-        
-        petals_to_draw = int(progress * num_petals)
-        
-        for i in range(petals_to_draw):
-            angle1 = (i * 360 / num_petals) * (math.pi / 180)
-            angle2 = ((i + 1) * 360 / num_petals) * (math.pi / 180)
-
-            x1 = center_x + radius * 0.8 * math.cos(angle1)
-            y1 = center_y + radius * 0.8 * math.sin(angle1)
-            x2 = center_x + radius * 0.8 * math.cos(angle2)
-            y2 = center_y + radius * 0.8 * math.sin(angle2)
-            cx = center_x + radius * 1.2 * math.cos((angle1 + angle2) / 2)
-            cy = center_y + radius * 1.2 * math.sin((angle1 + angle2) / 2)
-
-            path_color = f"hsl({(i * 45) % 360}, 70%, 50%)"
-
-            svg += f'''
-        <path d="M{center_x},{center_y} Q{cx},{cy} {x1},{y1}" 
-              fill="none" stroke="{path_color}" stroke-width="2" 
-              stroke-linecap="round" stroke-linejoin="round"/>
-        <path d="M{center_x},{center_y} Q{cx},{cy} {x2},{y2}" 
-              fill="none" stroke="{path_color}" stroke-width="2" 
-              stroke-linecap="round" stroke-linejoin="round"/>
-        '''
-        
-        svg += '</svg>'
-        frames.append(svg)
-    
-    return frames
+def _frame_progress(frame_count: int) -> List[float]:
+    return [frame / frame_count for frame in range(frame_count)]
+
+def _animate_elements(geometry: Geometry, frame_count: int) -> Timeline:
+    """Animate any pattern by revealing its elements in drawing order."""
+    return geometry, [int(progress * len(geometry)) for progress in _frame_progress(frame_count)]
+
+def _animate_basic_pattern(grid_size: int, frame_count: int) -> Timeline:
+    """Animate basic square pattern, one ring at a time."""
+    geometry = get_pattern('basic').generate(grid_size, 40, 20)
+    max_rings = grid_size // 2
+    return geometry, [int(progress * max_rings) for progress in _frame_progress(frame_count)]
+
+def _animate_flower_pattern(grid_size: int, frame_count: int) -> Timeline:
+    """Animate flower pattern drawing; each petal is two curves."""
+    geometry = get_pattern('flower').generate(grid_size, 40, 20)
+    num_petals = min(grid_size - 2, 8)
+    return geometry, [2 * int(progress * num_petals) for progress in _frame_progress(frame_count)]
 
-def _animate_star_pattern(grid_size: int, frame_count: int) -> List[str]:
-    """Animate star pattern drawing."""
-    frames = []
+def _animate_diamond_pattern(grid_size: int, frame_count: int) -> Timeline:
+    """Animate diamond pattern drawing, one diamond at a time."""
+    geometry = get_pattern('diamond').generate(grid_size, 40, 20)
+    max_diamonds = grid_size // 2
+    return geometry, [int(progress * max_diamonds) for progress in _frame_progress(frame_count)]
+
+def _animate_star_pattern(grid_size: int, frame_count: int) -> Timeline:
+    """Animate star pattern drawing as a path growing from the center."""
     dot_spacing = 40
     padding = 20
     center = grid_size // 2
     center_x = center * dot_spacing + padding
     center_y = center * dot_spacing + padding
-    
-    for frame in range(frame_count):
-        svg = f'<svg width="{grid_size * dot_spacing + 2 * padding}" height="{grid_size * dot_spacing + 2 * padding}" xmlns="http://www.w3.org/2000/svg">'
-        svg += '<rect width="100%" height="100%" fill="white"/>'
-        
-        # Draw grid dots
-        for y in range(grid_size):
-            for x in range(grid_size):
-                cx = x * dot_spacing + padding
-                cy = y * dot_spacing + padding
-                svg += f'<circle cx="{cx}" cy="{cy}" r="3" fill="#333"/>'
-        
-        # Animate star drawing
-        progress = frame / frame_count
-        num_points = min(grid_size * 2, 16)
-        outer_radius = (grid_size // 2) * dot_spacing * 0.9
-        inner_radius = outer_radius * 0.4
-        
-        # Draw star path progressively
-        path = f"M{center_x},{center_y}"
-        points_to_draw = int(progress * num_points * 2)
-        
-        for i in range(points_to_draw):
-            angle = (i * 360 / (num_points * 2)) * (math.pi / 180)
-            radius = outer_radius if i % 2 == 0 else inner_radius
-            x = center_x + radius * math.cos(angle)
-            y = center_y + radius * math.sin(angle)
-            path += f" L{x},{y}"
-        
-        if points_to_draw > 0:
-            path += " Z"
-            svg += f'<path d="{path}" fill="none" stroke="#4B0082" stroke-width="2" stroke-linejoin="round"/>'
-        
-        svg += '</svg>'
-        frames.append(svg)
-    
-    return frames
 
-def _animate_diamond_pattern(grid_size: int, frame_count: int) -> List[str]:
-    """Animate diamond pattern drawing."""
-    frames = []
-    dot_spacing = 40
-    padding = 20
-    center = grid_size // 2
+    num_points = min(grid_size * 2, 16)
+    outer_radius = (grid_size // 2) * dot_spacing * 0.9
+    inner_radius = outer_radius * 0.4
     
-    for frame in range(frame_count):
-        svg = f'<svg width="{grid_size * dot_spacing + 2 * padding}" height="{grid_size * dot_spacing + 2 * padding}" xmlns="http://www.w3.org/2000/svg">'
-        svg += '<rect width="100%" height="100%" fill="white"/>'
-        
-        # Draw grid dots
-        for y in range(grid_size):
-            for x in range(grid_size):
-                cx = x * dot_spacing + padding
-                cy = y * dot_spacing + padding
-                svg += f'<circle cx="{cx}" cy="{cy}" r="3" fill="#333"/>'
-        
-        # Animate diamond drawing
-        progress = frame / frame_count
-        max_diamonds = center
-        
-        for diamond in range(int(progress * max_diamonds)):
-            i = diamond + 1
-            # Top to right
-            x1 = center * dot_spacing + padding
-            y1 = (center - i) * dot_spacing + padding
-            x2 = (center + i) * dot_spacing + padding
-            y2 = center * dot_spacing + padding
-            
-            # Right to bottom
-            x3 = (center + i) * dot_spacing + padding
-            y3 = center * dot_spacing + padding
-            x4 = center * dot_spacing + padding
-            y4 = (center + i) * dot_spacing + padding
-            
-            # Bottom to left
-            x5 = center * dot_spacing + padding
-            y5 = (center + i) * dot_spacing + padding
-            x6 = (center - i) * dot_spacing + padding
-            y6 = center * dot_spacing + padding
-            
-            # Left to top
-            x7 = (center - i) * dot_spacing + padding
-            y7 = center * dot_spacing + padding
-            x8 = center * dot_spacing + padding
-            y8 = (center - i) * dot_spacing + padding
-
-            path_color = f"hsl({(i * 45) % 360}, 70%, 50%)"
-            path_width = 2 + (center - i) / 3
-
-            svg += f'''
-        <path d="M{x1},{y1} L{x2},{y2} L{x3},{y3} L{x4},{y4} L{x5},{y5} L{x6},{y6} L{x7},{y7} L{x8},{y8} Z" 
-              fill="none" stroke="{path_color}" stroke-width="{path_width}" 
-              stroke-linecap="round"/>
-        '''
-        
-        svg += '</svg>'
-        frames.append(svg)
-    
-    return frames
+    i = np.arange(num_points * 2)
+    angles = (i * 360 / (num_points * 2)) * (math.pi / 180)
+    radii = np.where(i % 2 == 0, outer_radius, inner_radius)
+    points = np.vstack(([(center_x, center_y)], polar_points(center_x, center_y, radii, angles)))
+
+    visible = [int(progress * num_points * 2) for progress in _frame_progress(frame_count)]
+    builder = GeometryBuilder()
+    style = builder.style(fill="none", stroke="#4B0082", stroke_width=2, stroke_linejoin="round")
+    return _growing_path(builder, points, visible, style)
 
-def _animate_spiral_pattern(grid_size: int, frame_count: int) -> List[str]:
-    """Animate spiral pattern drawing."""
-    frames = []
+def _animate_spiral_pattern(grid_size: int, frame_count: int) -> Timeline:
+    """Animate spiral pattern drawing as a path growing from the center."""
     dot_spacing = 40
     padding = 20
     center = grid_size // 2
     center_x = center * dot_spacing + padding
     center_y = center * dot_spacing + padding
-    
-    for frame in range(frame_count):
-        svg = f'<svg width="{grid_size * dot_spacing + 2 * padding}" height="{grid_size * dot_spacing + 2 * padding}" xmlns="http://www.w3.org/2000/svg">'
-        svg += '<rect width="100%" height="100%" fill="white"/>'
-        
-        # Draw grid dots
-        for y in range(grid_size):
-            for x in range(grid_size):
-                cx = x * dot_spacing + padding
-                cy = y * dot_spacing + padding
-                svg += f'<circle cx="{cx}" cy="{cy}" r="3" fill="#333"/>'
-        
-        # Animate spiral drawing
-        progress = frame / frame_count
-        max_radius = (grid_size // 2) * dot_spacing * 0.8
-        max_angle = int(progress * 720)  # Two full rotations
-        
-        if max_angle > 0:
-            path = f"M{center_x},{center_y}"
-            for angle in range(0, max_angle, 5):
-                radius = (angle / 720) * max_radius
-                x = center_x + radius * math.cos(math.radians(angle))
-                y = center_y + radius * math.sin(math.radians(angle))
-                path += f" L{x},{y}"
-            
-            svg += f'<path d="{path}" fill="none" stroke="#8B4513" stroke-width="3" stroke-linecap="round"/>'
-        
-        svg += '</svg>'
-        frames.append(svg)
-    
-    return frames
+    max_radius = (grid_size // 2) * dot_spacing * 0.8
+
+    angles = np.arange(0, 720, 5)  # Two full rotations
+    radii = (angles / 720) * max_radius
+    points = np.vstack(([(center_x, center_y)],
+                        polar_points(center_x, center_y, radii, np.radians(angles))))
+
+    # Points with an angle below int(progress * 720) are drawn, 5 degrees apart
+    visible = [math.ceil(int(progress * 720) / 5) for progress in _frame_progress(frame_count)]
+    builder = GeometryBuilder()
+    style = builder.style(fill="none", stroke="#8B4513", stroke_width=3, stroke_linecap="round")
+    return _growing_path(builder, points, visible, style)
+
+def _animate_pulli_pattern(grid_size: int, frame_count: int) -> Timeline:
+    """Animate the pulli kolam along its single stroke, in drawing order."""
+    padding = get_pattern('pulli').lattice_padding(40, 20)
+    points, ops = pulli_stroke(grid_size, grid_size, 40, padding)
+    segments = np.count_nonzero((ops == OP_LINE) | (ops == OP_QUAD))
+    visible = [int(progress * segments) for progress in _frame_progress(frame_count)]
+    builder = GeometryBuilder()
+    return _growing_stroke(builder, points, ops, visible, builder.style(**PULLI_STYLE))
+
+def _animate_sikku_pattern(grid_size: int, frame_count: int) -> Timeline:
+    """Animate the sikku kolam one mirror curve after another, in drawing order."""
+    padding = get_pattern('sikku').lattice_padding(40, 20)
+    points, ops, _ = mirror_curve_paths(grid_size, grid_size, 40, padding,
+                                        *sikku_mirrors(grid_size, grid_size))
+    segments = np.count_nonzero((ops == OP_LINE) | (ops == OP_QUAD))
+    visible = [int(progress * segments) for progress in _frame_progress(frame_count)]
+    builder = GeometryBuilder()
+    return _growing_stroke(builder, points, ops, visible, builder.style(**SIKKU_STYLE))
+
+def _growing_stroke(builder: GeometryBuilder, points: np.ndarray, ops: np.ndarray,
+                    visible: List[int], style: int) -> Timeline:
+    """Split a path with curves into one piece per frame.
+
+    Like :func:`_growing_path`, but ``visible[f]`` counts drawn segments
+    (lines or whole quadratic curves) rather than points. The path may
+    hold several strokes, each starting with its own move.
+    """
+    ends = np.flatnonzero((ops == OP_LINE) | (ops == OP_QUAD))
+    counts = []
+    drawn = 0
+    elements = 0
+    for count in visible:
+        if count > drawn:
+            start = ends[drawn - 1] if drawn else 0
+            piece = ops[start:ends[count - 1] + 1].copy()
+            piece[0] = OP_MOVE
+            builder.path(points[start:ends[count - 1] + 1], piece, style)
+            drawn = count
+            elements += 1
+        counts.append(elements)
+    return builder.build(), counts
+
+def _growing_path(builder: GeometryBuilder, points: np.ndarray,
+                  visible: List[int], style: int) -> Timeline:
+    """Split a path into one piece per frame.
+
+    ``points[0]`` is the start of the path and ``visible[f]`` how many of the
+    remaining points frame ``f`` shows. Each piece starts where the previous
+    one ended, so a frame only adds the newly drawn stretch.
+    """
+    counts = []
+    drawn = 0
+    elements = 0
+    for count in visible:
+        if count > drawn:
+            builder.polyline(points[drawn:count + 1], style)
+            drawn = count
+            elements += 1
+        counts.append(elements)
+    return builder.build(), counts
 
 def create_animation_svg(frames: List[str], duration: float = 3.0) -> str:
     """Create an animated SVG with all frames."""
+    return ''.join(iter_animation_svg(frames, duration))
+
+def iter_animation_svg(frames, duration: float = 3.0):
+    """Yield the animated SVG of ``create_animation_svg`` piece by piece.
+
+    ``frames`` may be any sequence, e.g. ``LazyAnimationFrames``; frames are
+    read and written one at a time, so only one of them is held at once.
+    """
     if not frames:
-        return ""
-    
+        return
+
     # Use the first frame as base
-    base_svg = frames[0]
-    
-    # Add animation elements
-    animated_svg = base_svg.replace('</svg>', '')
-    
-    # Add animation script
-    animated_svg += '''
+    yield frames[0].replace('</svg>', '')
+
+    # Add animation script, writing the frame list one frame at a time
+    yield '''
     <script>
-        const frames = ''' + json.dumps(frames) + ''';
+        const frames = ['''
+    for index, frame in enumerate(frames):
+        yield (', ' if index else '') + json.dumps(frame)
+    yield '''];
         let currentFrame = 0;
         const duration = ''' + str(duration) + ''' * 1000;
         const frameInterval = duration / frames.length;
@@ -308,8 +248,102 @@ def create_animation_svg(frames: List[str], duration: float = 3.0) -> str:
         setTimeout(animate, 100);
     </script>
     </svg>'''
+
+def create_delta_animation_svg(animation: Dict[str, Any], duration: float = 3.0) -> str:
+    """Create an animated SVG that replays delta-encoded frames.
+
+    The static base is written once and each timer tick appends the markup
+    of the next frame, so the document carries every primitive only once.
+    """
+    if not animation or not animation.get("deltas"):
+        return ""
     
-    return animated_svg
+    return animation["base"] + '''<g class="kolam-animation-layer"></g>
+    <script>
+        const deltas = ''' + json.dumps(animation["deltas"]) + ''';
+        let currentFrame = 0;
+        const duration = ''' + str(duration) + ''' * 1000;
+        const frameInterval = duration / deltas.length;
+        
+        function animate() {
+            if (currentFrame < deltas.length) {
+                // Append only what this frame adds
+                const layer = document.querySelector('.kolam-animation-layer');
+                if (layer) {
+                    layer.insertAdjacentHTML('beforeend', deltas[currentFrame]);
+                }
+                currentFrame++;
+                setTimeout(animate, frameInterval);
+            }
+        }
+        
+        // Start animation
+        setTimeout(animate, 100);
+    </script>
+    ''' + animation["end"]
+
+def create_stroke_animation_svg(geometry: Geometry, duration: float = 3.0,
+                               precision: int = None, classes: bool = False) -> str:
+    """Create a declarative (SMIL) animation of a finished pattern.
+
+    The final geometry is written once. Stroked elements are drawn in order
+    by animating ``stroke-dashoffset`` from their precomputed length to 0,
+    so each one takes a share of ``duration`` proportional to its length.
+    Filled circles and text fade in at their turn. No script or frame copies
+    are embedded, so the document is barely larger than the plain pattern.
+    """
+    if geometry is None:
+        return ""
+    
+    lengths = element_lengths(geometry)
+    dashed = []
+    for index in range(len(geometry)):
+        style = dict(geometry.style(index))
+        stroked = style.get('stroke', 'none') != 'none' and style.get('fill', 'none') == 'none'
+        dashed.append(stroked and lengths[index] > 0)
+    
+    # Faded elements take the time of an average stroke
+    stroked_lengths = [length for length, dash in zip(lengths, dashed) if dash]
+    fade_weight = sum(stroked_lengths) / len(stroked_lengths) if stroked_lengths else 1.0
+    weights = [length if dash else fade_weight for length, dash in zip(lengths, dashed)]
+    total = sum(weights) or 1.0
+    
+    starts = []
+    elapsed = 0.0
+    for weight in weights:
+        starts.append(elapsed)
+        elapsed += weight
+    
+    def decorate(index):
+        begin = f'{duration * starts[index] / total:.3f}s'
+        dur = f'{max(duration * weights[index] / total, 0.001):.3f}s'
+        if dashed[index]:
+            length = f'{lengths[index]:.2f}'
+            return (f' stroke-dasharray="{length}" stroke-dashoffset="{length}"',
+                    f'<animate attributeName="stroke-dashoffset" from="{length}" to="0" '
+                    f'begin="{begin}" dur="{dur}" fill="freeze"/>')
+        if weights[index] == 0:
+            return '', ''
+        return (' opacity="0"',
+                f'<animate attributeName="opacity" from="0" to="1" '
+                f'begin="{begin}" dur="{dur}" fill="freeze"/>')
+    
+    return (''.join(iter_svg_open(geometry, classes=classes))
+            + ''.join(iter_svg_elements(geometry, decorate=decorate, precision=precision,
+                                        classes=classes))
+            + SVG_CLOSE)
+
+def generate_stroke_animation(grid_size: int, pattern_type: str, duration: float = 3.0,
+                              precision: int = None, optimize: bool = False) -> str:
+    """Generate a stroke-drawing animation of the complete pattern.
+
+    With ``optimize`` shared style attributes become CSS classes. Elements
+    are never merged here: browsers restart the dash pattern at every
+    subpath, so a merged path would draw all its subpaths at once.
+    """
+    from kolam.generator import build_kolam_geometry
+    geometry = build_kolam_geometry(grid_size, pattern_type)
+    return create_stroke_animation_svg(geometry, duration, precision, classes=optimize)
 
 def highlight_symmetry_axes(svg_content: str, symmetry_info: Dict[str, bool], 
                           grid_size: int) -> str:
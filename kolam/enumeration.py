@@ -0,0 +1,207 @@
+# kolam/enumeration.py
+
+import json
+import os
+from concurrent.futures import ProcessPoolExecutor, as_completed
+from typing import Any, Dict
+import numpy as np
+from kolam.fingerprint import _canvas_symmetries
+from kolam.patterns.sikku import count_loops_many, MIRROR_ACROSS
+
+# Mirror kinds tried on every inner edge: 2 enumerates empty edges and
+# mirrors on the edge (the pulli kolams), 3 adds mirrors across the edge
+MIRROR_KINDS = MIRROR_ACROSS + 1
+
+# Configurations per task; the leading edges are split off as a prefix
+# until every task is at most this big
+TASK_SIZE = 1 << 16
+
+# One fixed-width record per distinct kolam: its canonical code, how many
+# configurations its orbit holds and how many loops it draws
+INDEX_RECORD = np.dtype([('code', '<u8'), ('orbit', 'u1'), ('loops', '<u2')])
+
+
+def inner_edge_count(n: int) -> int:
+    """Number of edges between adjacent dots of an ``n x n`` lattice."""
+    return 2 * n * (n - 1)
+
+
+def edge_symmetries(n: int) -> np.ndarray:
+    """Return the D4 symmetries of an ``n x n`` lattice as permutations of its inner edges.
+
+    Edges are numbered like :func:`kolam.patterns.sikku.count_loops_many`:
+    the vertical edges row by row, then the horizontal ones. Row ``g`` maps
+    edge ``e`` to edge ``g[e]``.
+    """
+    rows, cols = np.mgrid[0:n, 0:n - 1]
+    # Edge midpoints in half units, so every symmetry maps integers to integers
+    x = np.concatenate((2 * cols.ravel() + 1, 2 * rows.T.ravel()))
+    y = np.concatenate((2 * rows.ravel(), 2 * cols.T.ravel() + 1))
+    order = {point: index for index, point in enumerate(zip(x.tolist(), y.tolist()))}
+    size = 2 * (n - 1)
+    return np.array([
+        [order[point] for point in zip(*(axis.tolist() for axis in transform(x, y)))]
+        for transform in _canvas_symmetries(size, size)
+    ], dtype=np.int64).reshape(-1, len(x))
+
+
+def count_distinct_kolams(n: int, kinds: int = MIRROR_KINDS) -> int:
+    """Count mirror configurations of an ``n x n`` lattice up to D4, by Burnside's lemma.
+
+    A configuration is fixed by a symmetry when it is constant on each of
+    the symmetry's cycles of edges, so the orbits number the average of
+    ``kinds ** cycles`` over the group.
+    """
+    fixed = 0
+    for permutation in edge_symmetries(n).tolist():
+        seen = set()
+        cycles = 0
+        for start in range(len(permutation)):
+            if start not in seen:
+                cycles += 1
+                edge = start
+                while edge not in seen:
+                    seen.add(edge)
+                    edge = permutation[edge]
+        fixed += kinds ** cycles
+    return fixed // 8
+
+
+def decode_mirrors(code: int, n: int, kinds: int = MIRROR_KINDS):
+    """Turn an index code back into the ``(vertical, horizontal)`` mirrors of its kolam."""
+    digits = _digits(np.array([code], dtype=np.int64), inner_edge_count(n), kinds)[0]
+    half = n * (n - 1)
+    return digits[:half].reshape(n, n - 1), digits[half:].reshape(n - 1, n)
+
+
+def _digits(codes: np.ndarray, edges: int, kinds: int) -> np.ndarray:
+    """Split codes into one base-``kinds`` digit per edge, least significant first."""
+    return ((codes[:, None] // kinds ** np.arange(edges, dtype=np.int64)) % kinds).astype(np.uint8)
+
+
+def _prefix_edges(edges: int, kinds: int) -> int:
+    suffix = 0
+    while suffix < edges and kinds ** (suffix + 1) <= TASK_SIZE:
+        suffix += 1
+    return edges - suffix
+
+
+def _enumerate_task(n: int, kinds: int, prefix: int) -> np.ndarray:
+    """Process pool entry point: index every canonical configuration under one prefix.
+
+    The prefix fixes the leading (most significant) edges; the task walks
+    every value of the rest. A configuration is kept when its code is the
+    smallest among its images, so each orbit is kept exactly once.
+    """
+    edges = inner_edge_count(n)
+    span = kinds ** (edges - _prefix_edges(edges, kinds))
+    codes = prefix * span + np.arange(span, dtype=np.int64)
+    digits = _digits(codes, edges, kinds)
+    weights = kinds ** np.arange(edges, dtype=np.int64)
+    canonical = np.ones(len(codes), dtype=bool)
+    stabilizer = np.zeros(len(codes), dtype=np.int64)
+    for permutation in edge_symmetries(n):
+        # The image puts each edge's mirror on the edge it maps to
+        image = np.empty_like(digits)
+        image[:, permutation] = digits
+        image_codes = image.astype(np.int64) @ weights
+        canonical &= codes <= image_codes
+        stabilizer += codes == image_codes
+
+    kept = np.flatnonzero(canonical)
+    records = np.empty(len(kept), dtype=INDEX_RECORD)
+    records['code'] = codes[kept]
+    records['orbit'] = 8 // stabilizer[kept]
+    records['loops'] = count_loops_many(n, n, digits[kept])
+    return records
+
+
+def _checkpoint_path(index_path: str) -> str:
+    return index_path + '.json'
+
+
+def _save_checkpoint(index_path: str, state: Dict[str, Any]) -> None:
+    """Write the checkpoint beside the index, replacing the old one atomically."""
+    path = _checkpoint_path(index_path)
+    with open(path + '.tmp', 'w') as f:
+        json.dump(state, f)
+    os.replace(path + '.tmp', path)
+
+
+def enumerate_kolams(n: int, index_path: str, kinds: int = MIRROR_KINDS,
+                     workers=None, max_tasks=None) -> Dict[str, Any]:
+    """Enumerate every mirror kolam of an ``n x n`` lattice once per D4 orbit.
+
+    Each inner edge takes one of ``kinds`` mirror kinds, and a
+    configuration is encoded as a base-``kinds`` number with one digit per
+    edge. The leading edges are split off as prefixes and each prefix is
+    one task, fanned out over ``workers`` processes (default and maximum:
+    one per CPU; ``workers=1`` runs in this process). Finished tasks are
+    appended to ``index_path`` as :data:`INDEX_RECORD` rows, and
+    ``index_path + '.json'`` records which prefixes are done. Calling
+    again with the same arguments resumes where the last run stopped;
+    ``max_tasks`` caps how many tasks this call runs.
+
+    Returns a summary with the number of distinct kolams found so far and
+    the total Burnside's lemma predicts.
+    """
+    edges = inner_edge_count(n)
+    if kinds ** edges >= 2 ** 63:
+        raise ValueError(f"a {n}x{n} lattice has too many configurations to encode")
+    prefix_edges = _prefix_edges(edges, kinds)
+    state = {"n": n, "kinds": kinds, "prefix_edges": prefix_edges,
+             "done": [], "records": 0}
+    if os.path.exists(_checkpoint_path(index_path)):
+        with open(_checkpoint_path(index_path)) as f:
+            saved = json.load(f)
+        if any(saved[name] != state[name] for name in ("n", "kinds", "prefix_edges")):
+            raise ValueError(f"{index_path} indexes a different enumeration")
+        state = saved
+    done = set(state["done"])
+    pending = [prefix for prefix in range(kinds ** prefix_edges) if prefix not in done]
+    if max_tasks is not None:
+        pending = pending[:max_tasks]
+
+    def finish(index, prefix, records):
+        index.write(records.tobytes())
+        index.flush()
+        os.fsync(index.fileno())
+        state["done"].append(prefix)
+        state["records"] += len(records)
+        _save_checkpoint(index_path, state)
+
+    pool = None
+    if pending and workers != 1:
+        cpus = os.cpu_count() or 1
+        pool = ProcessPoolExecutor(max_workers=min(workers or cpus, cpus, len(pending)))
+    try:
+        with open(index_path, 'ab') as index:
+            # Drop anything written after the last checkpoint
+            index.truncate(state["records"] * INDEX_RECORD.itemsize)
+            if pool is None:
+                for prefix in pending:
+                    finish(index, prefix, _enumerate_task(n, kinds, prefix))
+            else:
+                futures = {pool.submit(_enumerate_task, n, kinds, prefix): prefix
+                           for prefix in pending}
+                for future in as_completed(futures):
+                    finish(index, futures[future], future.result())
+    finally:
+        if pool is not None:
+            pool.shutdown(cancel_futures=True)
+
+    return {
+        "n": n,
+        "kinds": kinds,
+        "distinct": state["records"],
+        "expected": count_distinct_kolams(n, kinds),
+        "tasks_done": len(state["done"]),
+        "tasks": kinds ** prefix_edges,
+        "complete": len(state["done"]) == kinds ** prefix_edges
+    }
+
+
+def load_kolam_index(index_path: str) -> np.ndarray:
+    """Read an index written by :func:`enumerate_kolams`, sorted by code."""
+    records = np.fromfile(index_path, dtype=INDEX_RECORD)
+    return records[np.argsort(records['code'], kind='stable')]
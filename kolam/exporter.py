@@ -1,206 +1,359 @@
 # kolam/exporter.py
 
 import os
+import re
 import json
+import hashlib
 import qrcode
 from datetime import datetime
-from typing import List, Dict, Any
+from typing import List, Dict, Any, Optional
 import base64
+import threading
 from io import BytesIO
+from kolam.fingerprint import geometry_fingerprint, svg_fingerprint
 
 EXPORT_DIR = "exports"
 os.makedirs(EXPORT_DIR, exist_ok=True)
 
-def save_svg(svg_string: str, filename: str = "kolam.svg", output_dir: str = None) -> str:
-    """Save SVG string to a file in exports/ and return filename."""
+# Shared patterns, stored once per drawing as <fingerprint>.json
+SHARE_DIR = os.path.join(EXPORT_DIR, "shared")
+
+# Content types of the formats export_bytes encodes
+EXPORT_MIMETYPES = {"svg": "image/svg+xml", "png": "image/png", "jpg": "image/jpeg"}
+
+def write_export(data: bytes, filename: str, output_dir: str = None) -> str:
+    """Write encoded export bytes to a file in exports/ and return filename.
+
+    The bytes go to a file of this process and thread first, which then
+    replaces ``filename`` in one step, so workers exporting the same name
+    never read or write a partial file.
+    """
     if output_dir is None:
         output_dir = EXPORT_DIR
     filepath = os.path.join(output_dir, filename)
-    with open(filepath, "w", encoding="utf-8") as f:
-        f.write(svg_string)
-    return filename  # return just the filename
+    temp_path = f"{filepath}.{os.getpid()}.{threading.get_ident()}.tmp"
+    try:
+        with open(temp_path, "wb") as f:
+            f.write(data)
+        os.replace(temp_path, filepath)
+    finally:
+        if os.path.exists(temp_path):
+            os.remove(temp_path)
+    return filename
+
+def _raster_scale(scale: float, dpi: float):
+    """Return the scale to render at and the save options recording its DPI.
+
+    ``dpi`` overrides ``scale``: SVG units are CSS pixels, so 192 DPI
+    renders at twice the size. Files keep their physical size either way.
+    """
+    from kolam.raster import CSS_DPI
+
+    if dpi:
+        scale = float(dpi) / CSS_DPI
+    if scale == 1:
+        return 1.0, {}
+    return float(scale), {'dpi': (CSS_DPI * scale, CSS_DPI * scale)}
+
+def export_bytes(drawing, format_type: str = "svg", tolerance: float = None,
+                 scale: float = 1.0, dpi: float = None, supersample: int = 1,
+                 resample: str = 'box') -> bytes:
+    """Encode a drawing as SVG, PNG or JPG and return the file's bytes.
+
+    ``drawing`` is SVG text or a geometry. Raster formats are drawn
+    straight from a geometry (see ``kolam.raster``) and parse SVG text
+    with :func:`render_svg`; ``scale`` or ``dpi`` set the resolution and
+    ``supersample`` anti-aliases, see ``kolam.raster.render_canvas``.
+    Nothing touches the disk; :func:`write_export` saves the result.
+    """
+    if format_type not in EXPORT_MIMETYPES:
+        raise ValueError(f"Unsupported format: {format_type}")
+    if format_type == "svg":
+        if not isinstance(drawing, str):
+            from kolam.svg import geometry_to_svg
+            drawing = geometry_to_svg(drawing)
+        return drawing.encode("utf-8")
+
+    scale, options = _raster_scale(scale, dpi)
+    if isinstance(drawing, str):
+        img = render_svg(drawing, tolerance, scale, supersample, resample)
+    else:
+        from kolam.raster import render_geometry
+        img = render_geometry(drawing, tolerance, scale, supersample, resample)
+    buffer = BytesIO()
+    if format_type == "png":
+        img.save(buffer, 'PNG', **options)
+    else:
+        img.save(buffer, 'JPEG', quality=95, **options)
+    return buffer.getvalue()
+
+def save_svg(svg_string: str, filename: str = "kolam.svg", output_dir: str = None) -> str:
+    """Save SVG string to a file in exports/ and return filename."""
+    return write_export(export_bytes(svg_string, "svg"), filename, output_dir)
+
+def geometry_to_png(geometry, filename: str = "kolam.png", output_dir: str = None,
+                    tolerance: float = None, scale: float = 1.0, dpi: float = None,
+                    supersample: int = 1, resample: str = 'box') -> str:
+    """Rasterize a geometry straight to PNG and return filename.
+
+    This skips writing and re-parsing SVG, see ``kolam.raster``; use
+    :func:`convert_svg_to_png` for SVG from elsewhere. Options are those
+    of :func:`export_bytes`.
+    """
+    return write_export(export_bytes(geometry, "png", tolerance, scale, dpi, supersample,
+                                     resample), filename, output_dir)
 
-def convert_svg_to_png(svg_string: str, filename: str = "kolam.png", output_dir: str = None) -> str:
-    """Convert SVG string to PNG using an advanced SVG parser that handles paths and curves."""
+def geometry_to_jpg(geometry, filename: str = "kolam.jpg", output_dir: str = None,
+                    tolerance: float = None, scale: float = 1.0, dpi: float = None,
+                    supersample: int = 1, resample: str = 'box') -> str:
+    """Rasterize a geometry straight to JPG and return filename, see :func:`geometry_to_png`."""
+    return write_export(export_bytes(geometry, "jpg", tolerance, scale, dpi, supersample,
+                                     resample), filename, output_dir)
+
+def render_svg(svg_string: str, tolerance: float = None, scale: float = 1.0,
+               supersample: int = 1, resample: str = 'box'):
+    """Draw SVG text into a Pillow RGB image using an advanced SVG parser that handles paths and curves.
+
+    ``tolerance`` (pixels) picks the number of segments per curve from its
+    curvature instead of the fixed 20, see ``kolam.lod``. All the curves of
+    a path are flattened together and each subpath is drawn as one
+    polyline, see ``kolam.raster.flatten_commands``. See
+    ``kolam.raster.render_canvas`` for the other options. SVG the parser
+    cannot read gives a placeholder image naming the error.
+    Drawings this app generates are faster to draw with ``kolam.raster.render_geometry``.
+    """
     try:
         from PIL import Image, ImageDraw
         import xml.etree.ElementTree as ET
         import re
         import math
+        from bisect import bisect_left
+        from kolam.raster import (parse_color, flatten_paths, draw_subpaths, render_canvas,
+                                  check_raster_options)
     except ImportError as e:
         raise ImportError(f"Please install Pillow: pip install Pillow. Error: {e}")
 
-    if output_dir is None:
-        output_dir = EXPORT_DIR
-    filepath = os.path.join(output_dir, filename)
-    
-    def parse_color(color_str):
-        """Parse color string to RGB tuple."""
-        if not color_str or color_str == 'none':
-            return None
-        
-        # Handle hsl colors
-        if color_str.startswith('hsl('):
-            # Extract HSL values
-            match = re.match(r'hsl\((\d+),\s*(\d+)%,\s*(\d+)%\)', color_str)
-            if match:
-                h, s, l = map(int, match.groups())
-                # Convert HSL to RGB
-                h = h / 360.0
-                s = s / 100.0
-                l = l / 100.0
-                
-                if s == 0:
-                    r = g = b = l
-                else:
-                    def hue_to_rgb(p, q, t):
-                        if t < 0: t += 1
-                        if t > 1: t -= 1
-                        if t < 1/6: return p + (q - p) * 6 * t
-                        if t < 1/2: return q
-                        if t < 2/3: return p + (q - p) * (2/3 - t) * 6
-                        return p
-                    
-                    q = l * (1 + s) if l < 0.5 else l + s - l * s
-                    p = 2 * l - q
-                    r = hue_to_rgb(p, q, h + 1/3)
-                    g = hue_to_rgb(p, q, h)
-                    b = hue_to_rgb(p, q, h - 1/3)
-                
-                return (int(r * 255), int(g * 255), int(b * 255))
-        
-        # Handle hex colors
-        if color_str.startswith('#'):
-            hex_color = color_str.lstrip('#')
-            return tuple(int(hex_color[i:i+2], 16) for i in (0, 2, 4))
-        
-        # Handle named colors (basic)
-        color_map = {
-            'black': (0, 0, 0),
-            'white': (255, 255, 255),
-            'red': (255, 0, 0),
-            'green': (0, 128, 0),
-            'blue': (0, 0, 255),
-            'yellow': (255, 255, 0),
-            'orange': (255, 165, 0),
-            'purple': (128, 0, 128),
-        }
-        return color_map.get(color_str.lower(), (0, 0, 0))
+    # Bad options are the caller's mistake, not a drawing the parser failed on
+    check_raster_options(scale, supersample, resample)
     
     def parse_path_data(path_data):
-        """Parse SVG path data and return list of drawing commands."""
+        """Parse SVG path data and return list of drawing commands.
+
+        Commands come back absolute, as ``M``, ``L``, ``Q``, ``C``, ``A``
+        and ``Z``: ``H``/``V`` become lines and the smooth ``S``/``T``
+        curves get their reflected control point.
+        """
         commands = []
         # Simple regex to split path commands
         pattern = r'([MmLlHhVvCcSsQqTtAaZz])([^MmLlHhVvCcSsQqTtAaZz]*)'
         matches = re.findall(pattern, path_data)
         
+        # Numbers may be written as '.5', '-.5' or '1e-3' and run together ('1.5.5')
+        number = r'[-+]?(?:\d+\.?\d*|\.\d+)(?:[eE][-+]?\d+)?'
+        arity = {'M': 2, 'L': 2, 'H': 1, 'V': 1, 'Q': 4, 'T': 2, 'C': 6, 'S': 4, 'A': 7, 'Z': 0}
+        current = (0.0, 0.0)
+        subpath_start = current
+        # Last control point of the previous curve, for S and T to reflect
+        last_control = None
         for cmd, params in matches:
-            coords = [float(x) for x in re.findall(r'-?\d+\.?\d*', params)]
-            commands.append((cmd, coords))
+            coords = [float(x) for x in re.findall(number, params)]
+            absolute = cmd.upper()
+            relative = cmd.islower()
+            size = arity.get(absolute)
+            if size is None:
+                commands.append((cmd, coords))
+                continue
+            if size == 0:
+                commands.append(('Z', []))
+                current = subpath_start
+                last_control = None
+                continue
+            # Resolve relative and implicitly repeated commands to absolute ones
+            for i in range(0, len(coords) - size + 1, size):
+                chunk = coords[i:i + size]
+                if absolute == 'H':
+                    absolute_coords = [chunk[0] + current[0] if relative else chunk[0], current[1]]
+                    name = 'L'
+                elif absolute == 'V':
+                    absolute_coords = [current[0], chunk[0] + current[1] if relative else chunk[0]]
+                    name = 'L'
+                elif absolute == 'A':
+                    # Only the end point of an arc is relative
+                    absolute_coords = chunk[:5] + ([chunk[5] + current[0], chunk[6] + current[1]]
+                                                   if relative else chunk[5:])
+                    name = 'A'
+                else:
+                    absolute_coords = [value + current[j % 2] if relative else value
+                                       for j, value in enumerate(chunk)]
+                    # Pairs after a moveto are implicit linetos
+                    name = 'L' if absolute == 'M' and i > 0 else absolute
+
+                if name in ('S', 'T'):
+                    smooth = 'C' if name == 'S' else 'Q'
+                    if last_control is not None and last_control[0] == smooth:
+                        reflected = [2 * current[0] - last_control[1], 2 * current[1] - last_control[2]]
+                    else:
+                        reflected = list(current)
+                    absolute_coords = reflected + absolute_coords
+                    name = smooth
+                commands.append((name, absolute_coords))
+                current = (absolute_coords[-2], absolute_coords[-1])
+                last_control = ((name,) + tuple(absolute_coords[-4:-2])
+                                if name in ('C', 'Q') else None)
+                if name == 'M':
+                    subpath_start = current
         
         return commands
     
-    def draw_quadratic_bezier(draw, start, control, end, color, width, steps=20):
-        """Draw a quadratic Bézier curve."""
-        points = []
-        for i in range(steps + 1):
-            t = i / steps
-            # Quadratic Bézier formula: B(t) = (1-t)²P₀ + 2(1-t)tP₁ + t²P₂
-            x = (1-t)**2 * start[0] + 2*(1-t)*t * control[0] + t**2 * end[0]
-            y = (1-t)**2 * start[1] + 2*(1-t)*t * control[1] + t**2 * end[1]
-            points.append((x, y))
-        
-        # Draw the curve as connected line segments
-        for i in range(len(points) - 1):
-            draw.line([points[i], points[i+1]], fill=color, width=width)
-    
     try:
         # Parse SVG
         root = ET.fromstring(svg_string)
         
         # Get SVG dimensions
-        width = int(float(root.get('width', '400')))
-        height = int(float(root.get('height', '400')))
+        width = float(root.get('width', '400'))
+        height = float(root.get('height', '400'))
         
-        # Create image
-        img = Image.new('RGB', (width, height), color='white')
-        draw = ImageDraw.Draw(img)
+        # Apply class rules from <style> as attributes, without overriding inline ones
+        rules = {}
+        for sheet in root.iter():
+            if sheet.tag.endswith('style') and sheet.text:
+                for name, body in re.findall(r'\.([\w-]+)\s*\{([^}]*)\}', sheet.text):
+                    for declaration in body.split(';'):
+                        prop, _, value = declaration.partition(':')
+                        if value.strip():
+                            value = value.strip()
+                            if value.endswith('px'):
+                                value = value[:-2]
+                            rules.setdefault(name, {})[prop.strip()] = value
+        if rules:
+            for elem in root.iter():
+                for name in elem.get('class', '').split():
+                    for prop, value in rules.get(name, {}).items():
+                        if elem.get(prop) is None:
+                            elem.set(prop, value)
         
-        # Process all elements
-        for elem in root.iter():
-            if elem.tag.endswith('rect') and elem.get('width') == '100%':
-                # Background rectangle
-                fill_color = parse_color(elem.get('fill', 'white'))
-                if fill_color:
-                    draw.rectangle([0, 0, width, height], fill=fill_color)
+        # Pattern tiles are only drawn where a shape fills with them
+        patterns = {}
+        defined = set()
+        for defs in root.iter():
+            if defs.tag.endswith('defs'):
+                defined.update(e for e in defs.iter() if e is not defs)
+                for tile in defs.iter():
+                    if tile.tag.endswith('pattern') and tile.get('id'):
+                        patterns[tile.get('id')] = tile
+        
+        def fill_with_pattern(draw, tile, x, y, w, h):
+            """Repeat the circles of a userSpaceOnUse pattern tile over a rectangle."""
+            tx = float(tile.get('x', 0))
+            ty = float(tile.get('y', 0))
+            tw = float(tile.get('width', 0))
+            th = float(tile.get('height', 0))
+            if tw <= 0 or th <= 0:
+                return
+            for dot in tile:
+                if not dot.tag.endswith('circle'):
+                    continue
+                r = float(dot.get('r', 0))
+                # Same defaults as standalone circles below
+                dot_color = parse_color(dot.get('fill', 'black'))
+                dot_stroke = parse_color(dot.get('stroke', 'black'))
+                dot_stroke_width = float(dot.get('stroke-width', '1'))
+                first_col = math.floor((x - tx) / tw)
+                first_row = math.floor((y - ty) / th)
+                cols = int(math.ceil((x + w - tx) / tw)) - first_col
+                rows = int(math.ceil((y + h - ty) / th)) - first_row
+                for row in range(first_row, first_row + rows):
+                    for col in range(first_col, first_col + cols):
+                        cx = tx + col * tw + float(dot.get('cx', 0))
+                        cy = ty + row * th + float(dot.get('cy', 0))
+                        if not (x <= cx <= x + w and y <= cy <= y + h):
+                            continue
+                        if dot_color:
+                            draw.ellipse([cx-r, cy-r, cx+r, cy+r], fill=dot_color)
+                        if dot_stroke:
+                            draw.ellipse([cx-r, cy-r, cx+r, cy+r], outline=dot_stroke,
+                                         width=dot_stroke_width)
+        
+        # Flatten the curves of every path in one pass before drawing
+        drawn = [elem for elem in root.iter() if elem not in defined]
+        paths = [elem for elem in drawn if elem.tag.endswith('path') and elem.get('d')]
+        flat, moves, bounds = flatten_paths([parse_path_data(elem.get('d')) for elem in paths],
+                                            tolerance / scale if tolerance else None)
+        moves, bounds = moves.tolist(), bounds.tolist()
+        polylines = {}
+        for index, elem in enumerate(paths):
+            first, last = bounds[index], bounds[index + 1]
+            polylines[elem] = (moves[bisect_left(moves, first):bisect_left(moves, last)], last)
+        
+        def paint(draw):
+            coords = draw.array(flat)
+            # Process all elements
+            for elem in drawn:
+                if elem.tag.endswith('rect') and elem.get('fill', '').startswith('url(#'):
+                    tile = patterns.get(elem.get('fill')[5:-1])
+                    if tile is not None:
+                        fill_with_pattern(draw, tile, float(elem.get('x', 0)),
+                                          float(elem.get('y', 0)), float(elem.get('width', 0)),
+                                          float(elem.get('height', 0)))
             
-            elif elem.tag.endswith('path'):
-                # Handle path elements (most important for Kolam patterns)
-                path_data = elem.get('d', '')
-                stroke_color = parse_color(elem.get('stroke', 'black'))
-                stroke_width = int(float(elem.get('stroke-width', '2')))
-                fill_color = parse_color(elem.get('fill', 'none'))
+                elif elem.tag.endswith('rect') and elem.get('width') == '100%':
+                    # Background rectangle
+                    fill_color = parse_color(elem.get('fill', 'white'))
+                    if fill_color:
+                        draw.rectangle([0, 0, width, height], fill=fill_color)
+            
+                elif elem.tag.endswith('path'):
+                    # Handle path elements (most important for Kolam patterns)
+                    path_data = elem.get('d', '')
+                    stroke_color = parse_color(elem.get('stroke', 'black'))
+                    stroke_width = float(elem.get('stroke-width', '2'))
+                    fill_color = parse_color(elem.get('fill', 'none'))
                 
-                if path_data and stroke_color:
-                    commands = parse_path_data(path_data)
-                    current_pos = (0, 0)
-                    
-                    for cmd, coords in commands:
-                        if cmd == 'M':  # Move to
-                            current_pos = (coords[0], coords[1])
-                        elif cmd == 'Q':  # Quadratic Bézier curve
-                            if len(coords) >= 4:
-                                control = (coords[0], coords[1])
-                                end = (coords[2], coords[3])
-                                draw_quadratic_bezier(draw, current_pos, control, end, stroke_color, stroke_width)
-                                current_pos = end
-                        elif cmd == 'L':  # Line to
-                            if len(coords) >= 2:
-                                end = (coords[0], coords[1])
-                                draw.line([current_pos, end], fill=stroke_color, width=stroke_width)
-                                current_pos = end
-                        elif cmd == 'Z':  # Close path
-                            pass  # Not needed for stroke-only paths
+                    if path_data and stroke_color:
+                        joint = 'curve' if elem.get('stroke-linejoin') == 'round' else None
+                        draw_subpaths(draw.draw, coords, *polylines[elem], stroke_color,
+                                      draw.width(stroke_width), joint)
             
-            elif elem.tag.endswith('circle'):
-                cx = float(elem.get('cx', width/2))
-                cy = float(elem.get('cy', height/2))
-                r = float(elem.get('r', 50))
-                fill_color = parse_color(elem.get('fill', 'black'))
-                stroke_color = parse_color(elem.get('stroke', 'black'))
-                stroke_width = int(float(elem.get('stroke-width', '1')))
+                elif elem.tag.endswith('circle'):
+                    cx = float(elem.get('cx', width/2))
+                    cy = float(elem.get('cy', height/2))
+                    r = float(elem.get('r', 50))
+                    fill_color = parse_color(elem.get('fill', 'black'))
+                    stroke_color = parse_color(elem.get('stroke', 'black'))
+                    stroke_width = float(elem.get('stroke-width', '1'))
                 
-                if fill_color:
-                    draw.ellipse([cx-r, cy-r, cx+r, cy+r], fill=fill_color)
-                if stroke_color:
-                    draw.ellipse([cx-r, cy-r, cx+r, cy+r], outline=stroke_color, width=stroke_width)
+                    if fill_color:
+                        draw.ellipse([cx-r, cy-r, cx+r, cy+r], fill=fill_color)
+                    if stroke_color:
+                        draw.ellipse([cx-r, cy-r, cx+r, cy+r], outline=stroke_color,
+                                     width=stroke_width)
             
-            elif elem.tag.endswith('rect') and elem.get('width') != '100%':
-                x = float(elem.get('x', 0))
-                y = float(elem.get('y', 0))
-                w = float(elem.get('width', 100))
-                h = float(elem.get('height', 100))
-                fill_color = parse_color(elem.get('fill', 'black'))
-                stroke_color = parse_color(elem.get('stroke', 'black'))
-                stroke_width = int(float(elem.get('stroke-width', '1')))
+                elif elem.tag.endswith('rect') and elem.get('width') != '100%':
+                    x = float(elem.get('x', 0))
+                    y = float(elem.get('y', 0))
+                    w = float(elem.get('width', 100))
+                    h = float(elem.get('height', 100))
+                    fill_color = parse_color(elem.get('fill', 'black'))
+                    stroke_color = parse_color(elem.get('stroke', 'black'))
+                    stroke_width = float(elem.get('stroke-width', '1'))
                 
-                if fill_color:
-                    draw.rectangle([x, y, x+w, y+h], fill=fill_color)
-                if stroke_color:
-                    draw.rectangle([x, y, x+w, y+h], outline=stroke_color, width=stroke_width)
+                    if fill_color:
+                        draw.rectangle([x, y, x+w, y+h], fill=fill_color)
+                    if stroke_color:
+                        draw.rectangle([x, y, x+w, y+h], outline=stroke_color, width=stroke_width)
             
-            elif elem.tag.endswith('line'):
-                x1 = float(elem.get('x1', 0))
-                y1 = float(elem.get('y1', 0))
-                x2 = float(elem.get('x2', 100))
-                y2 = float(elem.get('y2', 100))
-                stroke_color = parse_color(elem.get('stroke', 'black'))
-                stroke_width = int(float(elem.get('stroke-width', '1')))
+                elif elem.tag.endswith('line'):
+                    x1 = float(elem.get('x1', 0))
+                    y1 = float(elem.get('y1', 0))
+                    x2 = float(elem.get('x2', 100))
+                    y2 = float(elem.get('y2', 100))
+                    stroke_color = parse_color(elem.get('stroke', 'black'))
+                    stroke_width = float(elem.get('stroke-width', '1'))
                 
-                if stroke_color:
-                    draw.line([x1, y1, x2, y2], fill=stroke_color, width=stroke_width)
+                    if stroke_color:
+                        draw.line([x1, y1, x2, y2], fill=stroke_color, width=stroke_width)
         
-        img.save(filepath, 'PNG')
+        return render_canvas(width, height, paint, scale, supersample, resample)
         
     except Exception as e:
         # Fallback to simple placeholder if SVG parsing fails
@@ -208,33 +361,25 @@ def convert_svg_to_png(svg_string: str, filename: str = "kolam.png", output_dir:
         draw = ImageDraw.Draw(img)
         draw.rectangle([50, 50, 350, 350], outline='black', width=2)
         draw.text((200, 200), f"SVG Export Error: {str(e)[:50]}", fill='black', anchor='mm')
-        img.save(filepath, 'PNG')
-    
-    return filename
+        return img
 
-def convert_svg_to_jpg(svg_string: str, filename: str = "kolam.jpg", output_dir: str = None) -> str:
-    """Convert SVG string to JPG using a simple fallback method and return filename."""
-    try:
-        from PIL import Image, ImageDraw
-    except ImportError as e:
-        raise ImportError(f"Please install Pillow: pip install Pillow. Error: {e}")
+def convert_svg_to_png(svg_string: str, filename: str = "kolam.png", output_dir: str = None,
+                       tolerance: float = None, scale: float = 1.0, dpi: float = None,
+                       supersample: int = 1, resample: str = 'box') -> str:
+    """Convert SVG string to PNG and return filename, see :func:`render_svg`.
 
-    if output_dir is None:
-        output_dir = EXPORT_DIR
-    
-    # Convert to PNG first using our fallback method
-    png_path = os.path.join(output_dir, filename.replace('.jpg', '.png'))
-    png_file = convert_svg_to_png(svg_string, os.path.basename(png_path), output_dir)
-
-    # Convert PNG to JPG
-    with Image.open(os.path.join(output_dir, png_file)) as img:
-        if img.mode == 'RGBA':
-            img = img.convert('RGB')
-        jpg_path = os.path.join(output_dir, filename)
-        img.save(jpg_path, 'JPEG', quality=95)
-
-    os.remove(os.path.join(output_dir, png_file))  # cleanup temp PNG
-    return filename
+    Options are those of :func:`export_bytes`. Drawings this app generates
+    are faster to export with :func:`geometry_to_png`.
+    """
+    return write_export(export_bytes(svg_string, "png", tolerance, scale, dpi, supersample,
+                                     resample), filename, output_dir)
+
+def convert_svg_to_jpg(svg_string: str, filename: str = "kolam.jpg", output_dir: str = None,
+                       tolerance: float = None, scale: float = 1.0, dpi: float = None,
+                       supersample: int = 1, resample: str = 'box') -> str:
+    """Convert SVG string to JPG and return filename, see :func:`convert_svg_to_png`."""
+    return write_export(export_bytes(svg_string, "jpg", tolerance, scale, dpi, supersample,
+                                     resample), filename, output_dir)
 
 
 
@@ -249,38 +394,46 @@ def batch_export_patterns(patterns: List[Dict[str, Any]], output_dir: str = "exp
         "metadata_files": []
     }
     
-    timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
-    
     for i, pattern_data in enumerate(patterns):
         pattern_name = pattern_data.get("name", f"pattern_{i+1}")
         svg_content = pattern_data.get("svg", "")
         metadata = pattern_data.get("metadata", {})
         
         if svg_content:
-            # Export SVG
-            svg_filename = f"{pattern_name}_{timestamp}.svg"
-            svg_path = save_svg(svg_content, svg_filename, output_dir)
-            results["svg_files"].append(svg_path)
-            
-            # Export PNG
-            png_filename = f"{pattern_name}_{timestamp}.png"
-            png_path = convert_svg_to_png(svg_content, png_filename, output_dir)
-            results["png_files"].append(png_path)
-            
-            # Export JPG
-            jpg_filename = f"{pattern_name}_{timestamp}.jpg"
-            jpg_path = convert_svg_to_jpg(svg_content, jpg_filename, output_dir)
-            results["jpg_files"].append(jpg_path)
+            name = f"{pattern_name}_{svg_fingerprint(svg_content)[:16]}"
+            files = _export_drawing(svg_content, name, output_dir)
+            results["svg_files"].append(files["svg"])
+            results["png_files"].append(files["png"])
+            results["jpg_files"].append(files["jpg"])
             
             # Save metadata
-            metadata_filename = f"{pattern_name}_{timestamp}_metadata.json"
-            metadata_path = os.path.join(output_dir, metadata_filename)
+            metadata_path = os.path.join(output_dir, f"{name}_metadata.json")
             with open(metadata_path, "w", encoding="utf-8") as f:
                 json.dump(metadata, f, indent=2)
             results["metadata_files"].append(metadata_path)
     
     return results
 
+def _drawing_fingerprint(svg_string: str, geometry=None) -> str:
+    """Fingerprint a drawing by its geometry, or by its markup when it has none."""
+    return geometry_fingerprint(geometry) if geometry is not None else svg_fingerprint(svg_string)
+
+def _export_drawing(svg_string: str, name: str, output_dir: str, geometry=None) -> Dict[str, str]:
+    """Write ``name``.svg/.png/.jpg, reusing files an earlier export already wrote.
+
+    Callers put the drawing's fingerprint in ``name``, so an existing file
+    always holds the same drawing and is not rasterized again. With the
+    drawing's ``geometry`` the PNG and JPG are drawn from it directly.
+    """
+    files = {}
+    for extension in EXPORT_MIMETYPES:
+        filename = f"{name}.{extension}"
+        if not os.path.exists(os.path.join(output_dir, filename)):
+            drawing = svg_string if extension == "svg" or geometry is None else geometry
+            write_export(export_bytes(drawing, extension), filename, output_dir)
+        files[extension] = filename
+    return files
+
 def generate_qr_code(data: str, filename: str = "kolam_qr.png", output_dir: str = "exports") -> str:
     """Generate QR code for sharing Kolam patterns."""
     os.makedirs(output_dir, exist_ok=True)
@@ -303,8 +456,17 @@ def generate_qr_code(data: str, filename: str = "kolam_qr.png", output_dir: str
     img.save(filepath)
     return filepath
 
-def create_shareable_link(pattern_data: Dict[str, Any], base_url: str = "http://localhost:5000") -> str:
-    """Create a shareable link for a Kolam pattern."""
+def create_shareable_link(pattern_data: Dict[str, Any], base_url: str = "http://localhost:5000",
+                          geometry=None) -> str:
+    """Create a shareable link for a Kolam pattern.
+
+    Patterns with an SVG go to the share store and the link carries only
+    their fingerprint; sharing the same drawing and data twice gives the
+    same link. Pass the drawing's ``geometry`` when there is one.
+    """
+    if pattern_data.get('svg'):
+        return f"{base_url}/shared/{store_shared_pattern(pattern_data, geometry)}"
+
     # Encode pattern data as base64
     pattern_json = json.dumps(pattern_data)
     encoded_data = base64.b64encode(pattern_json.encode()).decode()
@@ -313,44 +475,72 @@ def create_shareable_link(pattern_data: Dict[str, Any], base_url: str = "http://
     shareable_url = f"{base_url}/shared/{encoded_data}"
     return shareable_url
 
+def _share_fingerprint(pattern_data: Dict[str, Any], geometry=None) -> str:
+    """Fingerprint the drawing together with the rest of the shared payload."""
+    rest = {key: value for key, value in pattern_data.items()
+            if key != 'svg' and value is not None}
+    text = (_drawing_fingerprint(pattern_data['svg'], geometry)
+            + json.dumps(rest, sort_keys=True, default=str))
+    return hashlib.blake2b(text.encode(), digest_size=16).hexdigest()
+
+def store_shared_pattern(pattern_data: Dict[str, Any], geometry=None) -> str:
+    """Save shared pattern data once per payload and return its fingerprint.
+
+    The fingerprint covers the analysis and metadata as well as the drawing,
+    so sharing a drawing with new data stores a new record instead of
+    pointing at the first one. The drawing is identified by its
+    ``geometry`` when given and by its markup otherwise.
+    """
+    fingerprint = _share_fingerprint(pattern_data, geometry)
+    os.makedirs(SHARE_DIR, exist_ok=True)
+    path = os.path.join(SHARE_DIR, f"{fingerprint}.json")
+    if not os.path.exists(path):
+        with open(path, "w", encoding="utf-8") as f:
+            json.dump(pattern_data, f)
+    return fingerprint
+
+def load_shared_pattern(fingerprint: str) -> Optional[Dict[str, Any]]:
+    """Return the stored pattern data for a fingerprint, or None if there is none."""
+    if not re.fullmatch(r'[0-9a-f]{32}', fingerprint):
+        return None
+    path = os.path.join(SHARE_DIR, f"{fingerprint}.json")
+    if not os.path.exists(path):
+        return None
+    with open(path, encoding="utf-8") as f:
+        return json.load(f)
+
 def export_pattern_with_metadata(svg_string: str, metadata: Dict[str, Any], 
-                               filename_prefix: str = "kolam", output_dir: str = "exports") -> Dict[str, str]:
-    """Export pattern with comprehensive metadata."""
+                               filename_prefix: str = "kolam", output_dir: str = "exports",
+                               geometry=None, base_url: str = "http://localhost:5000") -> Dict[str, str]:
+    """Export pattern with comprehensive metadata.
+
+    Files are named after the drawing's fingerprint (see ``kolam.fingerprint``),
+    so exporting the same drawing again reuses the SVG, PNG and JPG on disk.
+    Passing the drawing's ``geometry`` fingerprints and rasterizes it
+    without going through the SVG. The QR code holds a share link under
+    ``base_url`` that ``/shared`` resolves back to the drawing and metadata.
+    """
     os.makedirs(output_dir, exist_ok=True)
     
-    timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
-    results = {}
-    
-    # Export SVG
-    svg_filename = f"{filename_prefix}_{timestamp}.svg"
-    svg_path = save_svg(svg_string, svg_filename, output_dir)
-    results["svg"] = svg_path
+    fingerprint = _drawing_fingerprint(svg_string, geometry)
+    name = f"{filename_prefix}_{fingerprint[:16]}"
     
-    # Export PNG
-    png_filename = f"{filename_prefix}_{timestamp}.png"
-    png_path = convert_svg_to_png(svg_string, png_filename, output_dir)
-    results["png"] = png_path
-    
-    # Export JPG
-    jpg_filename = f"{filename_prefix}_{timestamp}.jpg"
-    jpg_path = convert_svg_to_jpg(svg_string, jpg_filename, output_dir)
-    results["jpg"] = jpg_path
+    # Export SVG, PNG and JPG
+    results = dict(_export_drawing(svg_string, name, output_dir, geometry))
     
     # Save metadata
-    metadata_filename = f"{filename_prefix}_{timestamp}_metadata.json"
+    metadata_filename = f"{name}_metadata.json"
     metadata_path = os.path.join(output_dir, metadata_filename)
     with open(metadata_path, "w", encoding="utf-8") as f:
         json.dump(metadata, f, indent=2)
     results["metadata"] = metadata_path
     
-    # Generate QR code
-    qr_data = json.dumps({
-        "pattern": svg_string,
-        "metadata": metadata,
-        "timestamp": timestamp
-    })
-    qr_filename = f"{filename_prefix}_{timestamp}_qr.png"
-    qr_path = generate_qr_code(qr_data, qr_filename, output_dir)
+    # Generate QR code; the drawing goes to the share store, so the code only
+    # needs its short link rather than the SVG, which had to be cut to fit
+    link = create_shareable_link({"svg": svg_string, "metadata": metadata}, base_url, geometry)
+    results["shareable_link"] = link
+    qr_filename = f"{name}_qr.png"
+    qr_path = generate_qr_code(link, qr_filename, output_dir)
     results["qr_code"] = qr_path
     
     return results
@@ -374,16 +564,7 @@ def create_zip_archive(file_paths: List[str], zip_filename: str = "kolam_pattern
 
 def generate_shareable_link(pattern_data: Dict[str, Any], base_url: str = "http://localhost:5000") -> str:
     """Generate a shareable link for a pattern."""
-    import base64
-    import json
-    
-    # Encode pattern data as base64
-    pattern_json = json.dumps(pattern_data)
-    encoded_data = base64.b64encode(pattern_json.encode()).decode()
-    
-    # Create shareable link
-    shareable_link = f"{base_url}/shared/{encoded_data}"
-    return shareable_link
+    return create_shareable_link(pattern_data, base_url)
 
 def generate_qr_code_for_sharing(shareable_link: str, filename: str = "kolam_qr.png") -> str:
     """Generate QR code for sharing."""
@@ -431,7 +612,7 @@ def batch_export_with_sharing(patterns: List[Dict[str, Any]], include_qr: bool =
         # Generate QR code if requested
         if include_qr:
             qr_data = json.dumps({
-                "pattern": pattern['svg'],
+                "fingerprint": svg_fingerprint(pattern['svg']),
                 "metadata": pattern.get('metadata', {}),
                 "timestamp": datetime.now().isoformat()
             })
@@ -0,0 +1,99 @@
+# kolam/fingerprint.py
+
+import hashlib
+import json
+import re
+import numpy as np
+from kolam.svg import format_compact
+
+# Decimal places kept when hashing; coordinates that differ by float noise
+# (e.g. 139.99999999999997 and 140) hash the same
+FINGERPRINT_PRECISION = 3
+
+_NUMBER = re.compile(r'-?(?:\d+\.?\d*|\.\d+)(?:[eE][-+]?\d+)?')
+
+
+def _quantize(values, precision: int) -> np.ndarray:
+    return np.round(np.asarray(values, dtype=np.float64) * 10 ** precision).astype('<i8')
+
+
+def _canonical_styles(geometry):
+    """Return the sorted style table and each element's index into it.
+
+    Style indices depend on the order a generator registered them in, and
+    attribute order within a style does not change the drawing.
+    """
+    entries = [tuple(sorted(entry)) for entry in geometry.style_table]
+    table = sorted(set(entries))
+    position = {entry: index for index, entry in enumerate(table)}
+    remap = np.array([position[entry] for entry in entries], dtype='<i4')
+    return table, remap[geometry.styles] if len(remap) else np.zeros(0, dtype='<i4')
+
+
+def _canvas_symmetries(width: int, height: int):
+    """Integer maps of the canvas onto itself: the symmetry group of the dot grid."""
+    maps = [
+        lambda x, y: (x, y),
+        lambda x, y: (width - x, y),
+        lambda x, y: (x, height - y),
+        lambda x, y: (width - x, height - y)
+    ]
+    if width == height:
+        maps += [
+            lambda x, y: (y, x),
+            lambda x, y: (width - y, x),
+            lambda x, y: (y, height - x),
+            lambda x, y: (width - y, height - x)
+        ]
+    return maps
+
+
+def geometry_fingerprint(geometry, precision: int = FINGERPRINT_PRECISION,
+                         symmetric: bool = False) -> str:
+    """Return a stable hex digest of what a geometry draws.
+
+    Coordinates and radii are rounded to ``precision`` decimals and styles
+    are compared by content, so renders that differ only by float noise or
+    style registration order share a fingerprint. Canvas size, background
+    and the dot grid are part of it; element order is too.
+
+    With ``symmetric`` the fingerprint is also the same for every image of
+    the geometry under the canvas symmetries (reflections, and quarter turns
+    on a square canvas), so a mirrored render matches the original.
+    """
+    table, styles = _canonical_styles(geometry)
+    header = json.dumps([
+        precision, geometry.width, geometry.height, geometry.background,
+        list(geometry.grid) if geometry.grid else None, table,
+        sorted(geometry.texts.items())
+    ]).encode()
+    points = _quantize(geometry.points, precision).reshape(-1, 2)
+    shared = [header, geometry.kinds.astype('<u1').tobytes(),
+              geometry.offsets.astype('<i8').tobytes(), geometry.ops.astype('<u1').tobytes(),
+              styles.tobytes(), _quantize(geometry.radii, precision).tobytes()]
+
+    maps = [lambda x, y: (x, y)]
+    if symmetric:
+        maps = _canvas_symmetries(int(_quantize(geometry.width, precision)),
+                                  int(_quantize(geometry.height, precision)))
+    digests = []
+    for transform in maps:
+        x, y = transform(points[:, 0], points[:, 1])
+        digest = hashlib.blake2b(digest_size=16)
+        for part in shared:
+            digest.update(part)
+        digest.update(np.column_stack((x, y)).astype('<i8').tobytes())
+        digests.append(digest.hexdigest())
+    return min(digests)
+
+
+def svg_fingerprint(svg_string: str, precision: int = FINGERPRINT_PRECISION) -> str:
+    """Return a stable hex digest of SVG markup, for drawings without a geometry.
+
+    Numbers are rounded to ``precision`` decimals and whitespace between
+    tags is ignored, so markup that differs only by float noise or line
+    breaks matches.
+    """
+    text = re.sub(r'>\s+<', '><', svg_string.strip())
+    text = _NUMBER.sub(lambda match: format_compact(float(match.group()), precision), text)
+    return hashlib.blake2b(text.encode(), digest_size=16).hexdigest()
@@ -1,83 +1,254 @@
 # kolam/generator.py
-import math
+import os
+import threading
+from collections import Counter
+from concurrent.futures import ProcessPoolExecutor
 from kolam.utils import (
     validate_pattern,
     clamp_grid_size,
+    check_large_grid_size,
     generate_grid_coordinates,
-    wrap_svg
-)
-from kolam.patterns.basic import (
-    generate_basic_pattern,
-    generate_diamond_pattern,
-    generate_spiral_pattern
-)
-from kolam.patterns.flower import (
-    generate_flower_pattern,
-    generate_lotus_pattern,
-    generate_rose_pattern
-)
-from kolam.patterns.star import (
-    generate_star_pattern,
-    generate_sunburst_pattern,
-    generate_mandala_pattern,
-    generate_compass_pattern
+    MAX_GRID_SIZE
 )
+from kolam.svg import geometry_to_svg, iter_svg, iter_chunks, DEFAULT_DOT_MODE, STREAM_CHUNK_SIZE
+from kolam.cache import LRUCache
+from kolam.geometry import merge_elements, shape_cache_stats
+from kolam.fingerprint import geometry_fingerprint
+from kolam.lod import lod_tolerance, DEFAULT_PIXEL_TOLERANCE
+from kolam.registry import get_pattern, pattern_names
 
-def generate_kolam(grid_size=7, pattern='basic', show_grid=True):
-    """Generate a Kolam pattern with enhanced pattern types."""
-    grid_size = clamp_grid_size(grid_size)
-    pattern = validate_pattern(pattern)
-    
+# Render caches. Geometry and fingerprints are keyed by (pattern, grid_size,
+# show_grid) after validation; SVG markup by the geometry's fingerprint
+# (see kolam.fingerprint) plus the output options, so requests that draw
+# the same thing share one document. The caches are sized to the whole
+# input space, registered patterns x grid sizes x 2 grid modes, so every
+# full-detail combination fits. Large grids (above MAX_GRID_SIZE) bypass the
+# caches: a single 1001x1001 mandala is about 2 MB of arrays and 7 MB of markup.
+_RENDER_KEYS = len(pattern_names()) * (MAX_GRID_SIZE - 2) * 2
+_geometry_cache = LRUCache(maxsize=_RENDER_KEYS)
+_fingerprint_cache = LRUCache(maxsize=2 * _RENDER_KEYS)
+_svg_cache = LRUCache(maxsize=_RENDER_KEYS)
+
+# Curve tolerance (canvas units) for large grids when the caller gives none;
+# fixed 5 degree sampling turns visibly polygonal on a canvas 40000 units wide
+LARGE_GRID_TOLERANCE = DEFAULT_PIXEL_TOLERANCE
+
+def _render_key(grid_size, pattern, show_grid, tolerance=None, large=False):
+    grid_size = check_large_grid_size(grid_size, pattern) if large else clamp_grid_size(grid_size)
+    if tolerance is None and grid_size > MAX_GRID_SIZE:
+        tolerance = LARGE_GRID_TOLERANCE
+    key = (validate_pattern(pattern), grid_size, bool(show_grid))
+    # Keep the original 3-tuple key for full-detail renders
+    return key + (float(tolerance),) if tolerance else key
+
+def _is_large(key):
+    return key[1] > MAX_GRID_SIZE
+
+def build_kolam_geometry(grid_size=7, pattern='basic', show_grid=True, tolerance=None,
+                         large=False):
+    """Build the geometry of a Kolam pattern without serializing it.
+
+    ``tolerance`` enables level of detail: curves are sampled so they stay
+    within that many canvas units of the exact shape (see ``kolam.lod``).
+    ``large`` raises the grid limit to ``MAX_LARGE_GRID_SIZE``.
+    """
+    key = _render_key(grid_size, pattern, show_grid, tolerance, large)
+    if _is_large(key):
+        return _build_kolam_geometry(*key)
+    return _geometry_cache.get_or_compute(key, lambda: _build_kolam_geometry(*key))
+
+def _build_kolam_geometry(pattern, grid_size, show_grid, tolerance=None, **params):
     # SVG canvas size and scaling
     dot_spacing = 40
     padding = 20
     canvas_size = grid_size * dot_spacing + 2 * padding
 
-    # Start SVG string
-    svg = f'''
-<svg width="{canvas_size}" height="{canvas_size}" xmlns="http://www.w3.org/2000/svg">
-    <rect width="100%" height="100%" fill="white"/>
-'''
-
-    # Draw grid dots only if show_grid is True
-    if show_grid:
-        for y in range(grid_size):
-            for x in range(grid_size):
-                cx = x * dot_spacing + padding
-                cy = y * dot_spacing + padding
-                svg += f'<circle cx="{cx}" cy="{cy}" r="3" fill="#333"/>\n'
-
-    # Generate pattern based on type
-    if pattern == 'basic':
-        svg += generate_basic_pattern(grid_size, dot_spacing, padding)
-    elif pattern == 'diamond':
-        svg += generate_diamond_pattern(grid_size, dot_spacing, padding)
-    elif pattern == 'spiral':
-        svg += generate_spiral_pattern(grid_size, dot_spacing, padding)
-    elif pattern == 'flower':
-        svg += generate_flower_pattern(grid_size, dot_spacing, padding)
-    elif pattern == 'lotus':
-        svg += generate_lotus_pattern(grid_size, dot_spacing, padding)
-    elif pattern == 'rose':
-        svg += generate_rose_pattern(grid_size, dot_spacing, padding)
-    elif pattern == 'star':
-        svg += generate_star_pattern(grid_size, dot_spacing, padding)
-    elif pattern == 'sunburst':
-        svg += generate_sunburst_pattern(grid_size, dot_spacing, padding)
-    elif pattern == 'mandala':
-        svg += generate_mandala_pattern(grid_size, dot_spacing, padding)
-    elif pattern == 'compass':
-        svg += generate_compass_pattern(grid_size, dot_spacing, padding)
-    else:
-        svg += generate_basic_pattern(grid_size, dot_spacing, padding)
-
-    # Close SVG
-    svg += '</svg>'
-    return svg
-
-def generate_kolam_clean(grid_size=7, pattern='basic'):
+    spec = get_pattern(pattern)
+    padding = spec.lattice_padding(dot_spacing, padding)
+    geometry = spec.generate(grid_size, dot_spacing, padding, tolerance, **params)
+
+    # Grid dots are kept as lattice parameters and drawn by the serializer
+    grid = (grid_size, dot_spacing, padding) if show_grid else None
+    return geometry.on_canvas(canvas_size, canvas_size, background='white', grid=grid)
+
+def kolam_fingerprint(grid_size=7, pattern='basic', show_grid=True, tolerance=None,
+                      large=False, symmetric=False):
+    """Return the fingerprint of a render's geometry, see ``kolam.fingerprint``.
+
+    ``symmetric`` gives mirrored and rotated renders the same fingerprint.
+    """
+    key = _render_key(grid_size, pattern, show_grid, tolerance, large)
+
+    def compute():
+        geometry = build_kolam_geometry(grid_size, pattern, show_grid, tolerance, large)
+        return geometry_fingerprint(geometry, symmetric=symmetric)
+
+    if _is_large(key):
+        return compute()
+    return _fingerprint_cache.get_or_compute(key + (bool(symmetric),), compute)
+
+def _svg_key(grid_size, pattern, show_grid, tolerance, dot_mode, precision, optimize, large):
+    """Return the SVG cache key of a render, or None for large grids."""
+    if _is_large(_render_key(grid_size, pattern, show_grid, tolerance, large)):
+        return None
+    fingerprint = kolam_fingerprint(grid_size, pattern, show_grid, tolerance, large)
+    return (fingerprint, dot_mode, precision, optimize)
+
+def _optimized_geometry(grid_size, pattern, show_grid, tolerance, optimize, large):
+    geometry = build_kolam_geometry(grid_size, pattern, show_grid, tolerance, large)
+    return merge_elements(geometry) if optimize else geometry
+
+def generate_kolam(grid_size=7, pattern='basic', show_grid=True, tolerance=None,
+                   dot_mode=DEFAULT_DOT_MODE, precision=None, optimize=False, large=False):
+    """Generate a Kolam pattern with enhanced pattern types.
+
+    ``dot_mode`` selects how grid dots are written, see ``kolam.svg.dot_grid_markup``.
+    ``precision`` selects the compact path encoding with that many decimals.
+    ``optimize`` merges same-style strokes and moves shared styles into classes.
+    ``large`` enables large-grid mode; prefer :func:`iter_kolam` for those.
+    """
+    key = _svg_key(grid_size, pattern, show_grid, tolerance, dot_mode, precision, optimize, large)
+
+    def render():
+        geometry = _optimized_geometry(grid_size, pattern, show_grid, tolerance, optimize, large)
+        return geometry_to_svg(geometry, dot_mode, precision, classes=optimize)
+
+    if key is None:
+        return render()
+    return _svg_cache.get_or_compute(key, render)
+
+def iter_kolam(grid_size=7, pattern='basic', show_grid=True, tolerance=None,
+               dot_mode=DEFAULT_DOT_MODE, precision=None, optimize=False, large=False,
+               chunk_size=STREAM_CHUNK_SIZE):
+    """Yield the SVG of ``generate_kolam`` in chunks of about ``chunk_size`` characters.
+
+    A document already in the SVG cache is sent from there. Otherwise it is
+    serialized element by element and never held as one string, so the
+    first chunk leaves before the last element is formatted.
+    """
+    key = _svg_key(grid_size, pattern, show_grid, tolerance, dot_mode, precision, optimize, large)
+    svg = None if key is None else _svg_cache.get(key)
+    if svg is not None:
+        for start in range(0, len(svg), chunk_size):
+            yield svg[start:start + chunk_size]
+        return
+    geometry = _optimized_geometry(grid_size, pattern, show_grid, tolerance, optimize, large)
+    yield from iter_chunks(iter_svg(geometry, dot_mode, precision, optimize), chunk_size)
+
+def generate_kolam_clean(grid_size=7, pattern='basic', tolerance=None, precision=None,
+                         optimize=False, large=False):
     """Generate a clean Kolam pattern without grid dots for export."""
-    return generate_kolam(grid_size, pattern, show_grid=False)
+    return generate_kolam(grid_size, pattern, show_grid=False, tolerance=tolerance,
+                          precision=precision, optimize=optimize, large=large)
+
+# Options a batch spec may set, with the defaults of generate_kolam
+_BATCH_DEFAULTS = {
+    'grid_size': 7,
+    'pattern': 'basic',
+    'show_grid': True,
+    'tolerance': None,
+    'dot_mode': DEFAULT_DOT_MODE,
+    'precision': None,
+    'optimize': False,
+    'large': False
+}
+
+def _batch_args(spec):
+    unknown = set(spec) - set(_BATCH_DEFAULTS)
+    if unknown:
+        raise ValueError(f"Unknown batch option(s): {', '.join(sorted(unknown))}")
+    return tuple(spec.get(name, default) for name, default in _BATCH_DEFAULTS.items())
+
+def _batch_key(grid_size, pattern, show_grid, tolerance, dot_mode, precision, optimize, large):
+    return _render_key(grid_size, pattern, show_grid, tolerance, large), (dot_mode, precision, optimize)
+
+def _cached_batch_svg(render_key, options):
+    """Return a cached document without rendering anything on a miss."""
+    if _is_large(render_key):
+        return None
+    fingerprint = _fingerprint_cache.get(render_key + (False,))
+    return None if fingerprint is None else _svg_cache.get((fingerprint,) + options)
+
+def _render_batch_spec(*spec_args):
+    """Process pool entry point: return the SVG cache key and the document."""
+    return _svg_key(*spec_args), generate_kolam(*spec_args)
+
+# Process pool shared by every batch, started on first use; one per request
+# would pay the worker start-up each time and let requests stack up pools
+_batch_pool = None
+_batch_pool_lock = threading.Lock()
+
+def _shared_batch_pool():
+    global _batch_pool
+    with _batch_pool_lock:
+        if _batch_pool is None or _batch_pool._broken:
+            _batch_pool = ProcessPoolExecutor(max_workers=os.cpu_count() or 1)
+        return _batch_pool
+
+def generate_many(specs, workers=None):
+    """Generate the SVG of every spec, yielding them in the order given.
+
+    Each spec is a dict of ``generate_kolam`` keyword arguments. Specs that
+    render the same document (after validation and clamping) are generated
+    once, as are documents already in the SVG cache. The rest are fanned
+    out over the shared pool of one process per CPU, or over a pool of its
+    own with ``workers`` processes (at most one per CPU; ``workers=1``
+    renders in this process), and each result is yielded as soon as it and
+    every result before it are done.
+    """
+    if workers is not None and (isinstance(workers, bool) or not isinstance(workers, int)
+                                or workers < 1):
+        raise ValueError(f"workers must be a positive integer or None, not {workers!r}")
+    args = [_batch_args(spec) for spec in specs]
+    keys = [_batch_key(*spec_args) for spec_args in args]
+    remaining = Counter(keys)
+    results = {}
+    pending = {}
+    for key, spec_args in zip(keys, args):
+        if key in results or key in pending:
+            continue
+        svg = _cached_batch_svg(*key)
+        if svg is not None:
+            results[key] = svg
+        else:
+            pending[key] = spec_args
+
+    pool = None
+    if pending and workers != 1:
+        if workers is None:
+            pool = _shared_batch_pool()
+        else:
+            cpus = os.cpu_count() or 1
+            pool = ProcessPoolExecutor(max_workers=min(workers, cpus, len(pending)))
+        futures = {key: pool.submit(_render_batch_spec, *spec_args)
+                   for key, spec_args in pending.items()}
+    try:
+        for key in keys:
+            if key not in results:
+                if pool is None:
+                    results[key] = generate_kolam(*pending[key])
+                else:
+                    svg_key, results[key] = futures[key].result()
+                    if svg_key is not None:
+                        # Keep the worker's render for later requests here
+                        _fingerprint_cache.put(key[0] + (False,), svg_key[0])
+                        _svg_cache.put(svg_key, results[key])
+            remaining[key] -= 1
+            # Drop each document once its last duplicate has been yielded
+            yield results[key] if remaining[key] else results.pop(key)
+    finally:
+        if pool is not None:
+            for future in futures.values():
+                future.cancel()
+            if workers is not None:
+                pool.shutdown()
+
+def generate_kolam_preview(grid_size=7, pattern='basic', output_size=150,
+                           show_grid=True, pixel_tolerance=DEFAULT_PIXEL_TOLERANCE):
+    """Generate a Kolam sampled for display at ``output_size`` pixels."""
+    canvas_size = clamp_grid_size(grid_size) * 40 + 2 * 20
+    tolerance = lod_tolerance(canvas_size, output_size, pixel_tolerance)
+    return generate_kolam(grid_size, pattern, show_grid, tolerance)
 
 def generate_kolam_with_analysis(grid_size=7, pattern='basic'):
     """Generate Kolam with mathematical analysis."""
@@ -91,10 +262,29 @@ def generate_kolam_with_analysis(grid_size=7, pattern='basic'):
     
     # Analyze the pattern with pattern type for accurate analysis
     analysis = classify_pattern(coords, grid_size, pattern)
+    count_loops = get_pattern(pattern).loops
+    if count_loops is not None:
+        analysis["loops"] = count_loops(clamp_grid_size(grid_size))
     
     return {
         "svg": svg_content,
         "analysis": analysis,
+        "fingerprint": kolam_fingerprint(grid_size, pattern),
         "grid_size": grid_size,
         "pattern": pattern
-    }
\ No newline at end of file
+    }
+
+def get_render_cache_stats():
+    """Return hit/miss/eviction counters for the render caches."""
+    return {
+        "geometry": _geometry_cache.stats(),
+        "fingerprint": _fingerprint_cache.stats(),
+        "svg": _svg_cache.stats(),
+        "shapes": shape_cache_stats()
+    }
+
+def clear_render_cache():
+    """Empty the render caches, e.g. after changing a pattern module."""
+    _geometry_cache.clear()
+    _fingerprint_cache.clear()
+    _svg_cache.clear()
\ No newline at end of file
@@ -0,0 +1,378 @@
+# kolam/geometry.py
+
+import numpy as np
+from typing import Callable, Dict, Hashable, List, Tuple
+from kolam.cache import LRUCache
+
+# Per-point drawing operations
+OP_MOVE = 0    # start a new subpath at this point
+OP_LINE = 1    # straight segment to this point
+OP_CTRL = 2    # control point of a quadratic curve; the next point is its end
+OP_QUAD = 3    # end point of a quadratic curve
+OP_CLOSE = 4   # close the subpath; the point repeats the subpath start
+
+# Element kinds
+ELEM_PATH = 0
+ELEM_LINE = 1
+ELEM_CIRCLE = 2
+ELEM_TEXT = 3
+
+# Grid dot appearance shared by every generator
+DOT_RADIUS = 3
+DOT_FILL = '#333'
+
+# Unit-scale shapes (petals, ring vertices) shared by every render and
+# variant that draws them, see :func:`memoized_shape`
+_shape_cache = LRUCache(maxsize=1024)
+
+
+class Geometry:
+    """Array-backed description of a Kolam drawing.
+
+    All vertices live in one ``points`` array with a matching ``ops`` array.
+    Element ``i`` owns ``points[offsets[i]:offsets[i + 1]]`` and is drawn
+    with ``style_table[styles[i]]``. Circles keep their radius in ``radii``
+    and text elements their content in ``texts``. The dot lattice is kept
+    as ``grid = (grid_size, dot_spacing, padding)`` rather than as elements.
+    """
+
+    __slots__ = ('width', 'height', 'background', 'grid', 'points', 'ops',
+                 'kinds', 'offsets', 'styles', 'radii', 'style_table', 'texts')
+
+    def __init__(self, points, ops, kinds, offsets, styles, radii,
+                 style_table, texts=None, width=0, height=0,
+                 background=None, grid=None):
+        self.points = points
+        self.ops = ops
+        self.kinds = kinds
+        self.offsets = offsets
+        self.styles = styles
+        self.radii = radii
+        self.style_table = style_table
+        self.texts = texts or {}
+        self.width = width
+        self.height = height
+        self.background = background
+        self.grid = grid
+        for array in (points, ops, kinds, offsets, styles, radii):
+            array.flags.writeable = False
+
+    def __len__(self) -> int:
+        return len(self.kinds)
+
+    def element_points(self, index: int) -> np.ndarray:
+        """Return the vertices owned by element ``index``."""
+        return self.points[self.offsets[index]:self.offsets[index + 1]]
+
+    def element_ops(self, index: int) -> np.ndarray:
+        """Return the per-point operations of element ``index``."""
+        return self.ops[self.offsets[index]:self.offsets[index + 1]]
+
+    def style(self, index: int) -> Tuple[Tuple[str, str], ...]:
+        """Return the (attribute, value) pairs used by element ``index``."""
+        return self.style_table[self.styles[index]]
+
+    def head(self, count: int) -> 'Geometry':
+        """Return a geometry holding only the first ``count`` elements."""
+        count = max(0, min(count, len(self)))
+        end = self.offsets[count]
+        return Geometry(
+            self.points[:end], self.ops[:end], self.kinds[:count],
+            self.offsets[:count + 1], self.styles[:count], self.radii[:count],
+            self.style_table,
+            {i: t for i, t in self.texts.items() if i < count},
+            self.width, self.height, self.background, self.grid
+        )
+
+    def head_segments(self, count: int) -> 'Geometry':
+        """Return a geometry drawing only the first ``count`` segments.
+
+        Segments are lines and whole quadratic curves, counted across
+        elements in drawing order; the element holding the last one is cut
+        short after it.
+        """
+        ends = np.flatnonzero((self.ops == OP_LINE) | (self.ops == OP_QUAD))
+        if count >= len(ends):
+            return self
+        if count <= 0:
+            return self.head(0)
+        end = ends[count - 1] + 1
+        elements = int(np.searchsorted(self.offsets, end))
+        head = self.head(elements)
+        offsets = self.offsets[:elements + 1].copy()
+        offsets[-1] = end
+        return Geometry(
+            self.points[:end], self.ops[:end], head.kinds, offsets, head.styles,
+            head.radii, self.style_table, head.texts,
+            self.width, self.height, self.background, self.grid
+        )
+
+    def on_canvas(self, width, height, background='white', grid=None) -> 'Geometry':
+        """Return the same elements placed on a canvas, sharing the arrays."""
+        return Geometry(
+            self.points, self.ops, self.kinds, self.offsets, self.styles,
+            self.radii, self.style_table, self.texts,
+            width, height, background, grid
+        )
+
+    def grid_points(self) -> np.ndarray:
+        """Return the (x, y) centres of the grid dots in drawing order."""
+        if not self.grid:
+            return np.empty((0, 2))
+        grid_size, dot_spacing, padding = self.grid
+        axis = np.arange(grid_size) * dot_spacing + padding
+        xs, ys = np.meshgrid(axis, axis)
+        return np.column_stack((xs.ravel(), ys.ravel()))
+
+
+class GeometryBuilder:
+    """Accumulate elements and freeze them into a :class:`Geometry`."""
+
+    def __init__(self):
+        self._points: List[np.ndarray] = []
+        self._ops: List[np.ndarray] = []
+        self._kinds: List[np.ndarray] = []
+        self._lengths: List[np.ndarray] = []
+        self._styles: List[np.ndarray] = []
+        self._radii: List[np.ndarray] = []
+        self._style_index: Dict[tuple, int] = {}
+        self._style_table: List[tuple] = []
+        self._texts: Dict[int, str] = {}
+        self._count = 0
+
+    def style(self, **attrs) -> int:
+        """Register a style and return its index; ``stroke_width`` -> ``stroke-width``."""
+        return self._register(tuple((name.replace('_', '-'), str(value))
+                                    for name, value in attrs.items()))
+
+    def _register(self, key: tuple) -> int:
+        index = self._style_index.get(key)
+        if index is None:
+            index = len(self._style_table)
+            self._style_index[key] = index
+            self._style_table.append(key)
+        return index
+
+    def _append(self, kind, points, ops, lengths, style, radii=None):
+        count = len(lengths)
+        self._points.append(np.asarray(points, dtype=np.float64).reshape(-1, 2))
+        self._ops.append(np.asarray(ops, dtype=np.uint8))
+        self._kinds.append(np.full(count, kind, dtype=np.uint8))
+        self._lengths.append(np.asarray(lengths, dtype=np.int64))
+        self._styles.append(np.broadcast_to(np.asarray(style, dtype=np.int32), (count,)))
+        self._radii.append(np.zeros(count) if radii is None
+                           else np.broadcast_to(np.asarray(radii, dtype=np.float64), (count,)))
+        first = self._count
+        self._count += count
+        return first
+
+    def path(self, points, ops, style, lengths=None) -> int:
+        """Add one path element from explicit points and per-point ops.
+
+        With ``lengths`` the run is split into one path per length instead;
+        ``style`` may then be per path.
+        """
+        ops = np.asarray(ops, dtype=np.uint8)
+        return self._append(ELEM_PATH, points, ops,
+                            [len(ops)] if lengths is None else lengths, style)
+
+    def paths(self, points, ops, styles) -> int:
+        """Add many paths sharing one op layout.
+
+        ``points`` has shape ``(paths, len(ops), 2)``; ``styles`` is one
+        style index or one per path.
+        """
+        points = np.asarray(points, dtype=np.float64)
+        count = len(points)
+        ops = np.tile(np.asarray(ops, dtype=np.uint8), count)
+        return self._append(ELEM_PATH, points, ops, np.full(count, points.shape[1]), styles)
+
+    def polyline(self, points, style: int, closed: bool = False) -> int:
+        """Add a path through ``points``, optionally closed back to the start."""
+        points = np.asarray(points, dtype=np.float64).reshape(-1, 2)
+        ops = np.full(len(points), OP_LINE, dtype=np.uint8)
+        ops[0] = OP_MOVE
+        if closed:
+            points = np.vstack((points, points[:1]))
+            ops = np.append(ops, OP_CLOSE)
+        return self._append(ELEM_PATH, points, ops, [len(ops)], style)
+
+    def lines(self, starts, ends, style) -> int:
+        """Add one ``<line>`` element per (start, end) pair; ``style`` may be per line."""
+        starts = np.asarray(starts, dtype=np.float64).reshape(-1, 2)
+        ends = np.asarray(ends, dtype=np.float64).reshape(-1, 2)
+        points = np.stack((starts, ends), axis=1).reshape(-1, 2)
+        ops = np.tile(np.array([OP_MOVE, OP_LINE], dtype=np.uint8), len(starts))
+        return self._append(ELEM_LINE, points, ops, np.full(len(starts), 2), style)
+
+    def line(self, x1, y1, x2, y2, style: int) -> int:
+        return self.lines([(x1, y1)], [(x2, y2)], style)
+
+    def circles(self, centers, radius, style) -> int:
+        """Add one circle per centre; ``radius`` and ``style`` may be per circle."""
+        centers = np.asarray(centers, dtype=np.float64).reshape(-1, 2)
+        count = len(centers)
+        return self._append(ELEM_CIRCLE, centers, np.full(count, OP_MOVE),
+                            np.ones(count, dtype=np.int64), style, radius)
+
+    def circle(self, cx, cy, r, style: int) -> int:
+        return self.circles([(cx, cy)], r, style)
+
+    def text(self, x, y, content: str, style: int) -> int:
+        index = self._append(ELEM_TEXT, [(x, y)], [OP_MOVE], [1], style)
+        self._texts[index] = content
+        return index
+
+    def extend(self, geometry: Geometry) -> None:
+        """Append every element of an existing geometry."""
+        if not len(geometry):
+            return
+        remap = np.array([self._register(entry) for entry in geometry.style_table],
+                         dtype=np.int32)
+        base = self._count
+        self._points.append(geometry.points)
+        self._ops.append(geometry.ops)
+        self._kinds.append(geometry.kinds)
+        self._lengths.append(np.diff(geometry.offsets))
+        self._styles.append(remap[geometry.styles])
+        self._radii.append(geometry.radii)
+        for index, content in geometry.texts.items():
+            self._texts[base + index] = content
+        self._count += len(geometry)
+
+    def build(self, width=0, height=0, background=None, grid=None) -> Geometry:
+        def concat(chunks, dtype, shape=(0,)):
+            return np.concatenate(chunks).astype(dtype, copy=False) if chunks else np.empty(shape, dtype)
+
+        lengths = concat(self._lengths, np.int64)
+        offsets = np.zeros(len(lengths) + 1, dtype=np.int64)
+        np.cumsum(lengths, out=offsets[1:])
+        return Geometry(
+            points=concat(self._points, np.float64, (0, 2)),
+            ops=concat(self._ops, np.uint8),
+            kinds=concat(self._kinds, np.uint8),
+            offsets=offsets,
+            styles=concat(self._styles, np.int32),
+            radii=concat(self._radii, np.float64),
+            style_table=tuple(self._style_table),
+            texts=dict(self._texts),
+            width=width,
+            height=height,
+            background=background,
+            grid=grid
+        )
+
+
+
+def polar_points(center_x: float, center_y: float, radii, angles) -> np.ndarray:
+    """Return ``(N, 2)`` points at the given radii and angles (radians)."""
+    radii = np.asarray(radii, dtype=np.float64)
+    angles = np.asarray(angles, dtype=np.float64)
+    return np.stack((center_x + radii * np.cos(angles),
+                     center_y + radii * np.sin(angles)), axis=-1)
+
+
+def rotated_copies(offsets, center_x: float, center_y: float, order: int, steps=None) -> np.ndarray:
+    """Replicate a fundamental domain around the centre by rotation.
+
+    ``offsets`` are ``(x, y)`` relative to the centre and are computed once;
+    copy ``k`` is turned by ``steps[k] * 360 / order`` degrees (``steps``
+    defaults to ``range(order)``). Returns ``(len(steps), len(offsets), 2)``.
+    Only one sine/cosine pair is evaluated per copy, and an offset ``(r, 0)``
+    lands exactly where :func:`polar_points` would put it.
+    """
+    offsets = np.asarray(offsets, dtype=np.float64).reshape(-1, 2)
+    steps = np.arange(order) if steps is None else np.asarray(steps)
+    angles = (steps * 360 / order) * (np.pi / 180)
+    cos, sin = np.cos(angles)[:, None], np.sin(angles)[:, None]
+    dx, dy = offsets[:, 0], offsets[:, 1]
+    return np.stack((center_x + (dx * cos - dy * sin),
+                     center_y + (dx * sin + dy * cos)), axis=-1)
+
+
+def memoized_shape(key: Hashable, factory: Callable[[], np.ndarray]) -> np.ndarray:
+    """Return the shape cached under ``key``, building it with ``factory`` on a miss.
+
+    Shapes are built at unit scale around the origin, so the trigonometry
+    runs once per distinct shape and each render or variant only places a
+    copy with ``centre + radius * shape``. The array is shared and read-only.
+    """
+    def build():
+        shape = np.asarray(factory(), dtype=np.float64)
+        shape.flags.writeable = False
+        return shape
+    return _shape_cache.get_or_compute(key, build)
+
+
+def shape_cache_stats() -> Dict[str, int]:
+    """Return hit/miss/eviction counters for the shape cache."""
+    return _shape_cache.stats()
+
+
+def flatten_quadratics(starts, controls, ends, steps: int = 16) -> np.ndarray:
+    """Sample quadratic Bézier curves; returns ``(curves, steps + 1, 2)`` points."""
+    t = np.linspace(0.0, 1.0, steps + 1)[None, :, None]
+    starts = np.asarray(starts, dtype=np.float64)[:, None, :]
+    controls = np.asarray(controls, dtype=np.float64)[:, None, :]
+    ends = np.asarray(ends, dtype=np.float64)[:, None, :]
+    return (1 - t) ** 2 * starts + 2 * (1 - t) * t * controls + t ** 2 * ends
+
+
+def merge_elements(geometry: Geometry) -> Geometry:
+    """Merge runs of consecutive same-style strokes into multi-subpath paths.
+
+    Lines and unfilled paths that follow each other with the same style
+    become one path element. Points and ops are shared unchanged, only the
+    element boundaries move, so drawing order and appearance are kept.
+    """
+    count = len(geometry)
+    if count < 2:
+        return geometry
+    unfilled = np.array([dict(style).get('fill') == 'none' for style in geometry.style_table],
+                        dtype=bool)
+    kinds = geometry.kinds
+    styles = geometry.styles
+    mergeable = (kinds == ELEM_LINE) | ((kinds == ELEM_PATH) & unfilled[styles])
+    joins = mergeable[1:] & mergeable[:-1] & (styles[1:] == styles[:-1])
+    if not joins.any():
+        return geometry
+
+    starts = np.concatenate(([0], np.flatnonzero(~joins) + 1))
+    sizes = np.diff(np.append(starts, count))
+    new_kinds = np.where(sizes > 1, ELEM_PATH, kinds[starts]).astype(np.uint8)
+    position = np.cumsum(np.concatenate(([1], ~joins))) - 1    # old element -> new element
+    return Geometry(
+        geometry.points, geometry.ops, new_kinds,
+        np.append(geometry.offsets[starts], geometry.offsets[-1]),
+        styles[starts], geometry.radii[starts], geometry.style_table,
+        {int(position[i]): text for i, text in geometry.texts.items()},
+        geometry.width, geometry.height, geometry.background, geometry.grid
+    )
+
+
+def element_lengths(geometry: Geometry, steps: int = 16) -> np.ndarray:
+    """Return the stroke length of every element.
+
+    Straight segments are measured exactly, quadratic curves from a
+    ``steps``-segment flattening, and circles by their circumference.
+    Text has no stroke and gets length 0.
+    """
+    points = geometry.points
+    ops = geometry.ops
+    lengths = np.zeros(len(points))
+    if len(points) > 1:
+        segments = np.linalg.norm(np.diff(points, axis=0), axis=1)
+        straight = np.flatnonzero((ops[1:] == OP_LINE) | (ops[1:] == OP_CLOSE)) + 1
+        lengths[straight] = segments[straight - 1]
+        curves = np.flatnonzero(ops == OP_QUAD)
+        if len(curves):
+            samples = flatten_quadratics(points[curves - 2], points[curves - 1], points[curves], steps)
+            lengths[curves] = np.linalg.norm(np.diff(samples, axis=1), axis=2).sum(axis=1)
+
+    if not len(geometry):
+        return np.zeros(0)
+    totals = np.add.reduceat(lengths, geometry.offsets[:-1]) if len(points) else np.zeros(len(geometry))
+    circles = geometry.kinds == ELEM_CIRCLE
+    totals[circles] = 2 * np.pi * geometry.radii[circles]
+    totals[geometry.kinds == ELEM_TEXT] = 0.0
+    return totals
@@ -2,7 +2,7 @@
 
 import cv2
 import numpy as np
-from typing import List, Tuple, Dict, Any
+from typing import List, Tuple, Dict, Any, Iterator
 import json
 from PIL import Image
 import io
@@ -364,8 +364,13 @@ def _check_radial_symmetry_image(points: np.ndarray, center: np.ndarray, toleran
 def generate_svg_from_detected_pattern(dots: List[Tuple[int, int]], 
                                      graph: Dict[str, Any]) -> str:
     """Generate SVG from detected pattern."""
+    return ''.join(iter_svg_from_detected_pattern(dots, graph))
+
+def iter_svg_from_detected_pattern(dots: List[Tuple[int, int]],
+                                   graph: Dict[str, Any]) -> Iterator[str]:
+    """Yield the SVG of a detected pattern one element at a time."""
     if not dots:
-        return ""
+        return
     
     # Calculate bounding box
     x_coords = [dot[0] for dot in dots]
@@ -377,8 +382,8 @@ def generate_svg_from_detected_pattern(dots: List[Tuple[int, int]],
     height = max_y - min_y + 40
     
     # Start SVG
-    svg = f'<svg width="{width}" height="{height}" xmlns="http://www.w3.org/2000/svg">'
-    svg += f'<rect width="100%" height="100%" fill="white"/>'
+    yield f'<svg width="{width}" height="{height}" xmlns="http://www.w3.org/2000/svg">'
+    yield f'<rect width="100%" height="100%" fill="white"/>'
     
     # Draw edges
     for edge in graph["edges"]:
@@ -390,16 +395,15 @@ def generate_svg_from_detected_pattern(dots: List[Tuple[int, int]],
         x2 = to_node["x"] - min_x + 20
         y2 = to_node["y"] - min_y + 20
         
-        svg += f'<line x1="{x1}" y1="{y1}" x2="{x2}" y2="{y2}" stroke="blue" stroke-width="2"/>'
+        yield f'<line x1="{x1}" y1="{y1}" x2="{x2}" y2="{y2}" stroke="blue" stroke-width="2"/>'
     
     # Draw nodes
     for node in graph["nodes"]:
         x = node["x"] - min_x + 20
         y = node["y"] - min_y + 20
-        svg += f'<circle cx="{x}" cy="{y}" r="3" fill="red"/>'
+        yield f'<circle cx="{x}" cy="{y}" r="3" fill="red"/>'
     
-    svg += '</svg>'
-    return svg
+    yield '</svg>'
 
 def enhance_image_for_detection(image: np.ndarray) -> np.ndarray:
     """Enhance image to improve dot detection."""
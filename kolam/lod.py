@@ -0,0 +1,89 @@
+# kolam/lod.py
+
+import math
+import numpy as np
+
+# Pixel tolerance used when a caller asks for LOD without choosing one
+DEFAULT_PIXEL_TOLERANCE = 0.5
+
+
+def lod_tolerance(canvas_size: float, output_size: float,
+                  pixel_tolerance: float = DEFAULT_PIXEL_TOLERANCE) -> float:
+    """Convert a tolerance in output pixels into canvas (SVG user) units.
+
+    A 600-unit canvas shown as a 150px thumbnail may deviate 4x further in
+    canvas units than the same canvas printed at 600px.
+    """
+    if output_size <= 0:
+        return pixel_tolerance
+    return pixel_tolerance * canvas_size / output_size
+
+
+def spiral_sample_angles(end_angle: float, growth: float, tolerance: float,
+                         min_segments: int = 8) -> np.ndarray:
+    """Sample angles (radians) along an Archimedean spiral ``r = growth * angle``.
+
+    Points are spaced so that no chord strays more than ``tolerance`` from
+    the curve: a chord of arc length ``s`` on a curve with radius of
+    curvature ``rho`` deviates by about ``s**2 / (8 * rho)``. Tight turns
+    near the center get dense samples, the wide outer turns sparse ones.
+    """
+    if end_angle <= 0 or growth <= 0:
+        return np.array([0.0])
+    theta = np.linspace(0.0, end_angle, 2048)
+    speed = growth * np.sqrt(theta ** 2 + 1)                              # ds/dtheta
+    curvature_radius = growth * (theta ** 2 + 1) ** 1.5 / (theta ** 2 + 2)
+    step = np.sqrt(8 * curvature_radius * tolerance) / speed              # dtheta per chord
+    density = 1.0 / step
+    # Cumulative number of chords needed up to each angle (trapezoid rule)
+    needed = np.concatenate(([0.0], np.cumsum((density[1:] + density[:-1]) / 2 * np.diff(theta))))
+    segments = max(int(math.ceil(needed[-1])), min_segments)
+    return np.interp(np.linspace(0.0, needed[-1], segments + 1), needed, theta)
+
+
+def quadratic_steps(starts, controls, ends, tolerance: float,
+                    min_steps: int = 1, max_steps: int = 64) -> np.ndarray:
+    """Return how many line segments each quadratic Bézier needs.
+
+    With ``n`` uniform segments the flattening error of a quadratic is at
+    most ``|P0 - 2 P1 + P2| / (4 n**2)``, so ``n`` follows from the
+    tolerance and the curve's (constant) second difference.
+    """
+    starts = np.asarray(starts, dtype=np.float64).reshape(-1, 2)
+    controls = np.asarray(controls, dtype=np.float64).reshape(-1, 2)
+    ends = np.asarray(ends, dtype=np.float64).reshape(-1, 2)
+    bend = np.linalg.norm(starts - 2 * controls + ends, axis=1)
+    steps = np.ceil(np.sqrt(bend / (4 * max(tolerance, 1e-9))))
+    return np.clip(steps, min_steps, max_steps).astype(np.int64)
+
+
+def cubic_steps(starts, controls1, controls2, ends, tolerance: float,
+                min_steps: int = 1, max_steps: int = 64) -> np.ndarray:
+    """Return how many line segments each cubic Bézier needs.
+
+    Like :func:`quadratic_steps`, from the largest second difference of the
+    control polygon: ``n`` segments stray at most ``3 M / (4 n**2)``.
+    """
+    starts = np.asarray(starts, dtype=np.float64).reshape(-1, 2)
+    controls1 = np.asarray(controls1, dtype=np.float64).reshape(-1, 2)
+    controls2 = np.asarray(controls2, dtype=np.float64).reshape(-1, 2)
+    ends = np.asarray(ends, dtype=np.float64).reshape(-1, 2)
+    bend = np.maximum(np.linalg.norm(starts - 2 * controls1 + controls2, axis=1),
+                      np.linalg.norm(controls1 - 2 * controls2 + ends, axis=1))
+    steps = np.ceil(np.sqrt(3 * bend / (4 * max(tolerance, 1e-9))))
+    return np.clip(steps, min_steps, max_steps).astype(np.int64)
+
+
+def arc_steps(radii, sweeps, tolerance: float,
+              min_steps: int = 1, max_steps: int = 64) -> np.ndarray:
+    """Return how many line segments each circular or elliptical arc needs.
+
+    A chord spanning angle ``a`` on radius ``r`` strays ``r (1 - cos(a / 2))``
+    from the arc; ``radii`` should be the larger radius of each ellipse.
+    """
+    radii = np.asarray(radii, dtype=np.float64)
+    sweeps = np.abs(np.asarray(sweeps, dtype=np.float64))
+    ratio = np.clip(1 - max(tolerance, 1e-9) / np.maximum(radii, 1e-9), -1.0, 1.0)
+    angle = np.maximum(2 * np.arccos(ratio), 1e-9)
+    steps = np.ceil(sweeps / angle)
+    return np.clip(steps, min_steps, max_steps).astype(np.int64)
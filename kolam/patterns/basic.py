@@ -1,91 +1,79 @@
 # kolam/patterns/basic.py
 
 import math
+import numpy as np
+from kolam.geometry import GeometryBuilder, Geometry, OP_MOVE, OP_LINE, OP_CLOSE, polar_points
+from kolam.lod import spiral_sample_angles
 
-def generate_basic_pattern(grid_size, dot_spacing, padding):
-    """Generate a basic square pattern with nested squares."""
-    pattern = ''
-    center = grid_size // 2
-    
-    for i in range(center):
-        x1 = (center - i) * dot_spacing + padding
-        y1 = (center - i) * dot_spacing + padding
-        x2 = (center + i) * dot_spacing + padding
-        y2 = (center - i) * dot_spacing + padding
-        x3 = (center + i) * dot_spacing + padding
-        y3 = (center + i) * dot_spacing + padding
-        x4 = (center - i) * dot_spacing + padding
-        y4 = (center + i) * dot_spacing + padding
+# A closed ring: move, three or seven lines, close back to the start
+_SQUARE_OPS = [OP_MOVE, OP_LINE, OP_LINE, OP_LINE, OP_CLOSE]
+_DIAMOND_OPS = [OP_MOVE] + [OP_LINE] * 7 + [OP_CLOSE]
 
-        path_color = f"hsl({(i * 30) % 360}, 70%, 50%)"
-        path_width = 2 + (center - i) / 2
+# Corners of ring ``i`` as multiples of ``i`` away from the center dot
+_SQUARE_CORNERS = np.array([(-1, -1), (1, -1), (1, 1), (-1, 1), (-1, -1)])
+_DIAMOND_CORNERS = np.array([(0, -1), (1, 0), (1, 0), (0, 1), (0, 1), (-1, 0), (-1, 0), (0, -1), (0, -1)])
 
-        pattern += f'''
-    <path d="M{x1},{y1} L{x2},{y2} L{x3},{y3} L{x4},{y4} Z" 
-          fill="none" stroke="{path_color}" stroke-width="{path_width}" 
-          stroke-linecap="round"/>
-    '''
-    return pattern
+def _rings(center, steps, corners, dot_spacing, padding) -> np.ndarray:
+    """Return ``(len(steps), len(corners), 2)`` ring points around the center dot."""
+    steps = np.asarray(steps)[:, None, None]
+    return (center + steps * corners[None, :, :]) * dot_spacing + padding
 
-def generate_diamond_pattern(grid_size, dot_spacing, padding):
-    """Generate a diamond pattern with diagonal connections."""
-    pattern = ''
+def generate_basic_pattern(grid_size, dot_spacing, padding) -> Geometry:
+    """Generate a basic square pattern with nested squares."""
+    builder = GeometryBuilder()
     center = grid_size // 2
-    
-    # Create diamond shape
-    for i in range(1, center + 1):
-        # Top to right
-        x1 = center * dot_spacing + padding
-        y1 = (center - i) * dot_spacing + padding
-        x2 = (center + i) * dot_spacing + padding
-        y2 = center * dot_spacing + padding
-        
-        # Right to bottom
-        x3 = (center + i) * dot_spacing + padding
-        y3 = center * dot_spacing + padding
-        x4 = center * dot_spacing + padding
-        y4 = (center + i) * dot_spacing + padding
-        
-        # Bottom to left
-        x5 = center * dot_spacing + padding
-        y5 = (center + i) * dot_spacing + padding
-        x6 = (center - i) * dot_spacing + padding
-        y6 = center * dot_spacing + padding
-        
-        # Left to top
-        x7 = (center - i) * dot_spacing + padding
-        y7 = center * dot_spacing + padding
-        x8 = center * dot_spacing + padding
-        y8 = (center - i) * dot_spacing + padding
+    rings = range(center)
+    styles = [
+        builder.style(fill="none", stroke=f"hsl({(i * 30) % 360}, 70%, 50%)",
+                      stroke_width=2 + (center - i) / 2, stroke_linecap="round")
+        for i in rings
+    ]
+    if styles:
+        builder.paths(_rings(center, rings, _SQUARE_CORNERS, dot_spacing, padding),
+                      _SQUARE_OPS, styles)
+    return builder.build()
 
-        path_color = f"hsl({(i * 45) % 360}, 70%, 50%)"
-        path_width = 2 + (center - i) / 3
+def generate_diamond_pattern(grid_size, dot_spacing, padding) -> Geometry:
+    """Generate a diamond pattern with diagonal connections."""
+    builder = GeometryBuilder()
+    center = grid_size // 2
+    rings = range(1, center + 1)
+    styles = [
+        builder.style(fill="none", stroke=f"hsl({(i * 45) % 360}, 70%, 50%)",
+                      stroke_width=2 + (center - i) / 3, stroke_linecap="round")
+        for i in rings
+    ]
+    if styles:
+        builder.paths(_rings(center, rings, _DIAMOND_CORNERS, dot_spacing, padding),
+                      _DIAMOND_OPS, styles)
+    return builder.build()
 
-        pattern += f'''
-    <path d="M{x1},{y1} L{x2},{y2} L{x3},{y3} L{x4},{y4} L{x5},{y5} L{x6},{y6} L{x7},{y7} L{x8},{y8} Z" 
-          fill="none" stroke="{path_color}" stroke-width="{path_width}" 
-          stroke-linecap="round"/>
-    '''
-    return pattern
+def generate_spiral_pattern(grid_size, dot_spacing, padding, tolerance=None) -> Geometry:
+    """Generate a spiral pattern.
 
-def generate_spiral_pattern(grid_size, dot_spacing, padding):
-    """Generate a spiral pattern."""
-    pattern = ''
+    By default points are 5 degrees apart. With ``tolerance`` (canvas units)
+    the spacing adapts to the curvature so no chord deviates further.
+    """
+    builder = GeometryBuilder()
     center = grid_size // 2
     center_x = center * dot_spacing + padding
     center_y = center * dot_spacing + padding
     
-    path = f"M{center_x},{center_y}"
     max_radius = (grid_size // 2) * dot_spacing * 0.8
     
-    for angle in range(0, 720, 5):  # Two full rotations
-        radius = (angle / 720) * max_radius
-        x = center_x + radius * math.cos(math.radians(angle))
-        y = center_y + radius * math.sin(math.radians(angle))
-        path += f" L{x},{y}"
+    if tolerance:
+        # Same curve as the fixed sampling below: r = max_radius * angle / 720 degrees
+        growth = max_radius / math.radians(720)
+        angles = spiral_sample_angles(math.radians(715), growth, tolerance)
+        radii = growth * angles
+    else:
+        degrees = np.arange(0, 720, 5)  # Two full rotations
+        angles = np.radians(degrees)
+        radii = (degrees / 720) * max_radius
+    points = polar_points(center_x, center_y, radii, angles)
+    points = np.vstack(([(center_x, center_y)], points))
     
-    pattern += f'''
-    <path d="{path}" fill="none" stroke="#8B4513" stroke-width="3" 
-          stroke-linecap="round"/>
-    '''
-    return pattern
+    style = builder.style(fill="none", stroke="#8B4513", stroke_width=3,
+                          stroke_linecap="round")
+    builder.polyline(points, style)
+    return builder.build()
@@ -1,101 +1,144 @@
 # kolam/patterns/flower.py
 
 import math
+import numpy as np
+from kolam.geometry import (GeometryBuilder, Geometry, OP_MOVE, OP_CTRL, OP_QUAD,
+                            rotated_copies, memoized_shape)
+from kolam.utils import hsl_colors
 
-def generate_flower_pattern(grid_size, dot_spacing, padding):
-    """Generate a flower pattern with petals and center."""
-    pattern = ''
+# Ops for "M start Q control end"
+_CURVE_OPS = (OP_MOVE, OP_CTRL, OP_QUAD)
+# Ops for "M start Q c1 mid Q c2 end"
+_LOOP_OPS = (OP_MOVE, OP_CTRL, OP_QUAD, OP_CTRL, OP_QUAD)
+
+def _flower_petals(petals: int, bulge: float, reach: float) -> np.ndarray:
+    """Every petal of a unit-radius flower: two curves from the centre per petal.
+
+    Petal 0 is the fundamental domain: the curves bow out through the
+    control point halfway between its outer points.
+    """
+    half = math.pi / petals
+    control = (bulge * math.cos(half), bulge * math.sin(half))
+    wedge = [(0, 0), control, (reach, 0),
+             (0, 0), control, (reach * math.cos(2 * half), reach * math.sin(2 * half))]
+    return rotated_copies(wedge, 0, 0, petals)
+
+def generate_flower_pattern(grid_size, dot_spacing, padding, petals=None, radius_ratio=0.8,
+                            bulge=1.2, reach=0.8, palette=(0, 45, 70, 50),
+                            stroke_width=2) -> Geometry:
+    """Generate a flower pattern with petals and center.
+
+    ``petals`` defaults to ``grid_size - 2`` (at most 8). The flower spans
+    ``radius_ratio`` of the half grid; petal curves bow out to ``bulge``
+    and end at ``reach`` times that radius. ``palette`` is
+    ``(hue, hue_step, saturation, lightness)``, one hue step per petal.
+    """
+    builder = GeometryBuilder()
     center = grid_size // 2
     center_x = center * dot_spacing + padding
     center_y = center * dot_spacing + padding
 
-    num_petals = min(grid_size - 2, 8)
-    radius = (grid_size // 2) * dot_spacing * 0.8
-
-    for i in range(num_petals):
-        angle1 = (i * 360 / num_petals) * (math.pi / 180)
-        angle2 = ((i + 1) * 360 / num_petals) * (math.pi / 180)
+    num_petals = petals or min(grid_size - 2, 8)
+    radius = (grid_size // 2) * dot_spacing * radius_ratio
+    shape = memoized_shape(('flower', num_petals, bulge, reach),
+                           lambda: _flower_petals(num_petals, bulge, reach))
+    petal_points = (center_x, center_y) + radius * shape
 
-        x1 = center_x + radius * 0.8 * math.cos(angle1)
-        y1 = center_y + radius * 0.8 * math.sin(angle1)
-        x2 = center_x + radius * 0.8 * math.cos(angle2)
-        y2 = center_y + radius * 0.8 * math.sin(angle2)
-        cx = center_x + radius * 1.2 * math.cos((angle1 + angle2) / 2)
-        cy = center_y + radius * 1.2 * math.sin((angle1 + angle2) / 2)
+    styles = [
+        builder.style(fill="none", stroke=color, stroke_width=stroke_width,
+                      stroke_linecap="round", stroke_linejoin="round")
+        for color in hsl_colors(range(num_petals), *palette)
+    ]
+    builder.paths(petal_points.reshape(-1, 3, 2), _CURVE_OPS, np.repeat(styles, 2))
+    return builder.build()
 
-        path_color = f"hsl({(i * 45) % 360}, 70%, 50%)"
+def _lotus_petals(petals: int, tip_ratio: float) -> np.ndarray:
+    """Every petal of a unit-radius lotus layer, each a loop out to its point and back."""
+    tip = (tip_ratio * math.cos(math.pi / petals), tip_ratio * math.sin(math.pi / petals))
+    return rotated_copies([(0, 0), (1, 0), tip, (1, 0), (0, 0)], 0, 0, petals)
 
-        pattern += f'''
-    <path d="M{center_x},{center_y} Q{cx},{cy} {x1},{y1}" 
-          fill="none" stroke="{path_color}" stroke-width="2" 
-          stroke-linecap="round" stroke-linejoin="round"/>
-    <path d="M{center_x},{center_y} Q{cx},{cy} {x2},{y2}" 
-          fill="none" stroke="{path_color}" stroke-width="2" 
-          stroke-linecap="round" stroke-linejoin="round"/>
-    '''
-    return pattern
+def generate_lotus_pattern(grid_size, dot_spacing, padding, petals=8, layers=3,
+                           radius_ratios=(0.6, 0.2), tip_ratio=0.7, palette=(0, 45, 70, 60),
+                           layer_shift=(30, -10), stroke_width=3, center_radius=8) -> Geometry:
+    """Generate a lotus pattern with layered petals.
 
-def generate_lotus_pattern(grid_size, dot_spacing, padding):
-    """Generate a lotus pattern with layered petals."""
-    pattern = ''
+    Layer ``k`` spans ``radius_ratios[0] + k * radius_ratios[1]`` of the
+    half grid. Its colors come from ``palette`` (see the flower pattern)
+    moved by ``k`` times ``layer_shift = (hue, lightness)``, and its
+    strokes are ``k`` units thinner than ``stroke_width`` (at least 1).
+    """
+    builder = GeometryBuilder()
     center = grid_size // 2
     center_x = center * dot_spacing + padding
     center_y = center * dot_spacing + padding
 
     # Outer petals
-    num_petals = 8
-    for layer in range(3):
-        radius = (grid_size // 2) * dot_spacing * (0.6 + layer * 0.2)
-        for i in range(num_petals):
-            angle = (i * 360 / num_petals) * (math.pi / 180)
-            x = center_x + radius * math.cos(angle)
-            y = center_y + radius * math.sin(angle)
-            
-            # Create petal shape
-            petal_path = f"M{center_x},{center_y} Q{x},{y} {center_x + radius * 0.7 * math.cos(angle + math.pi/8)},{center_y + radius * 0.7 * math.sin(angle + math.pi/8)} Q{x},{y} {center_x},{center_y}"
-            
-            path_color = f"hsl({(i * 45 + layer * 30) % 360}, 70%, {60 - layer * 10}%)"
-            
-            pattern += f'''
-    <path d="{petal_path}" 
-          fill="none" stroke="{path_color}" stroke-width="{3 - layer}" 
-          stroke-linecap="round" stroke-linejoin="round"/>
-    '''
+    hue, hue_step, saturation, lightness = palette
+    shape = memoized_shape(('lotus', petals, tip_ratio), lambda: _lotus_petals(petals, tip_ratio))
+    for layer in range(layers):
+        radius = (grid_size // 2) * dot_spacing * (radius_ratios[0] + layer * radius_ratios[1])
+        petal_points = (center_x, center_y) + radius * shape
+        
+        # Create petal shapes
+        colors = hsl_colors(range(petals), hue + layer * layer_shift[0], hue_step, saturation,
+                            lightness + layer * layer_shift[1])
+        styles = [
+            builder.style(fill="none", stroke=color, stroke_width=max(stroke_width - layer, 1),
+                          stroke_linecap="round", stroke_linejoin="round")
+            for color in colors
+        ]
+        builder.paths(petal_points, _LOOP_OPS, styles)
     
     # Center
-    pattern += f'<circle cx="{center_x}" cy="{center_y}" r="8" fill="#FFD700"/>'
+    builder.circle(center_x, center_y, center_radius, builder.style(fill="#FFD700"))
     
-    return pattern
+    return builder.build()
 
-def generate_rose_pattern(grid_size, dot_spacing, padding):
-    """Generate a rose pattern with spiral petals."""
-    pattern = ''
+def _rose_spiral(turns: int, petal_step: int) -> np.ndarray:
+    """Unit directions of a rose's petals: ``(petals, 4)`` of fraction of the radius,
+    angle in degrees, then the petal's two sides as ``(cos, sin)`` pairs."""
+    angles = np.arange(0, 360 * turns, petal_step)
+    petal_angles = np.radians(angles)
+    return np.column_stack((angles / (360 * turns), angles,
+                            np.cos(petal_angles + math.pi/4), np.sin(petal_angles + math.pi/4),
+                            np.cos(petal_angles - math.pi/4), np.sin(petal_angles - math.pi/4),
+                            np.cos(petal_angles), np.sin(petal_angles)))
+
+def generate_rose_pattern(grid_size, dot_spacing, padding, tolerance=None, turns=4, petal_step=20,
+                          radius_ratio=0.7, petal_ratio=0.3, palette=(0, 10.0, 80, 60),
+                          stroke_width=1.5) -> Geometry:
+    """Generate a rose pattern with spiral petals.
+
+    A petal every ``petal_step`` degrees over ``turns`` full rotations; the
+    spiral spans ``radius_ratio`` of the half grid and each petal is
+    ``petal_ratio`` of its distance from the centre. With ``tolerance``
+    (canvas units) petals smaller than it are skipped, since they would
+    not be visible at the target resolution.
+    """
+    builder = GeometryBuilder()
     center = grid_size // 2
     center_x = center * dot_spacing + padding
     center_y = center * dot_spacing + padding
     
     # Create spiral rose pattern
-    max_radius = (grid_size // 2) * dot_spacing * 0.7
-    for angle in range(0, 1440, 2):  # 4 full rotations
-        radius = (angle / 1440) * max_radius
-        x = center_x + radius * math.cos(math.radians(angle))
-        y = center_y + radius * math.sin(math.radians(angle))
-        
-        # Create petal-like curves
-        if angle % 20 == 0:
-            petal_angle = math.radians(angle)
-            petal_radius = radius * 0.3
-            x1 = x + petal_radius * math.cos(petal_angle + math.pi/4)
-            y1 = y + petal_radius * math.sin(petal_angle + math.pi/4)
-            x2 = x + petal_radius * math.cos(petal_angle - math.pi/4)
-            y2 = y + petal_radius * math.sin(petal_angle - math.pi/4)
-            
-            path_color = f"hsl({(angle * 0.5) % 360}, 80%, 60%)"
-            
-            pattern += f'''
-    <path d="M{x},{y} Q{x1},{y1} {x},{y} Q{x2},{y2} {x},{y}" 
-          fill="none" stroke="{path_color}" stroke-width="1.5" 
-          stroke-linecap="round"/>
-    '''
+    max_radius = (grid_size // 2) * dot_spacing * radius_ratio
+    spiral = memoized_shape(('rose', turns, petal_step), lambda: _rose_spiral(turns, petal_step))
+    radii = spiral[:, 0] * max_radius
+    centers = (center_x, center_y) + radii[:, None] * spiral[:, 6:8]
+    
+    # Create petal-like curves
+    petal_radii = radii * petal_ratio
+    steps = np.arange(len(spiral))
+    if tolerance:
+        steps = np.flatnonzero(petal_radii >= tolerance)
+        centers, petal_radii = centers[steps], petal_radii[steps]
+    side1 = centers + petal_radii[:, None] * spiral[steps, 2:4]
+    side2 = centers + petal_radii[:, None] * spiral[steps, 4:6]
+    
+    styles = [
+        builder.style(fill="none", stroke=color, stroke_width=stroke_width, stroke_linecap="round")
+        for color in hsl_colors(steps.tolist(), *palette)
+    ]
+    builder.paths(np.stack((centers, side1, centers, side2, centers), axis=1), _LOOP_OPS, styles)
     
-    return pattern
\ No newline at end of file
+    return builder.build()
@@ -0,0 +1,306 @@
+# kolam/patterns/pulli.py
+
+import numpy as np
+from kolam.geometry import GeometryBuilder, Geometry, OP_MOVE, OP_LINE, OP_CTRL, OP_QUAD
+
+# The line graph of a pulli kolam lives on the midpoints between adjacent
+# dots. Around every dot the stroke visits the midpoints on its four sides
+# clockwise, N -> E -> S -> W; a side without a neighbour is skipped by an
+# arc that bends around the outside of the dot. Every midpoint is shared
+# by two dots and has degree four, so the graph is Eulerian.
+_N = np.array((0.0, -0.5))
+_E = np.array((0.5, 0.0))
+_S = np.array((0.0, 0.5))
+_W = np.array((-0.5, 0.0))
+
+# The same sides as steps to the neighbouring dot, clockwise from N
+_SIDES = np.array(((0.0, -1.0), (1.0, 0.0), (0.0, 1.0), (-1.0, 0.0)))
+
+# Most dots trace_pulli accepts: its circuit is a Python loop over the
+# edges, about 0.5 s for a 200x200 mask. Full lattices take the closed form
+# in pulli_stroke, which has no limit.
+MAX_TRACE_DOTS = 200 * 200
+
+PULLI_STYLE = dict(fill="none", stroke="#B22222", stroke_width=2,
+                   stroke_linecap="round", stroke_linejoin="round")
+
+
+def _segments(*ends, controls=None):
+    """One straight step per end point, or an arc when ``controls`` are given.
+
+    ``ends`` are interleaved: with ends ``a`` and ``b`` the steps go
+    ``a[0], b[0], a[1], b[1], ...``.
+    """
+    ends = np.stack(ends, axis=1).reshape(-1, 2)
+    if controls is None:
+        controls = np.full_like(ends, np.nan)
+    return ends, np.asarray(controls, dtype=np.float64).reshape(-1, 2)
+
+
+def _row_steps(cols: int, top: bool, bottom: bool):
+    """Return the ``(ends, controls)`` of the stroke's pass through one row at y = 0.
+
+    The pass enters the first dot from its N side (or starts at its E side
+    on the top row), runs out along the top of the row and back along its
+    bottom, and leaves the first dot on its S side (or, on the bottom row,
+    rounds it and returns to its N side). Controls are NaN for straight steps.
+    """
+    xs = np.arange(cols, dtype=np.float64)
+    dots = np.column_stack((xs, np.zeros(cols)))
+    first, inner, last = dots[:1], dots[1:-1], dots[-1:]
+    back = inner[::-1]
+    steps = []
+    if not top:
+        steps.append(_segments(first + _E))                                # N -> E
+
+    # Out along the row: W -> E over the top of every dot but the last
+    if top:
+        steps.append(_segments(inner + _E, controls=inner + 2 * _N))
+    else:
+        steps.append(_segments(inner + _N, inner + _E))
+
+    # Round the last dot of the row, back to its W side
+    if top:
+        steps.append(_segments(last + _S, controls=last + 2 * _N + 2 * _E))
+        steps.append(_segments(last + _W))
+    elif bottom:
+        steps.append(_segments(last + _N))
+        steps.append(_segments(last + _W, controls=last + 2 * _E + 2 * _S))
+    else:
+        steps.append(_segments(last + _N))
+        steps.append(_segments(last + _S, controls=last + 2 * _E))
+        steps.append(_segments(last + _W))
+
+    # Back along the row: E -> W under every dot but the last
+    if bottom:
+        steps.append(_segments(back + _W, controls=back + 2 * _S))
+    else:
+        steps.append(_segments(back + _S, back + _W))
+
+    # Down to the next row, or round the bottom-left dot
+    if bottom:
+        steps.append(_segments(first + _N, controls=first + 2 * _S + 2 * _W))
+    else:
+        steps.append(_segments(first + _S))                                # E -> S
+
+    return (np.concatenate([ends for ends, _ in steps]),
+            np.concatenate([controls for _, controls in steps]))
+
+
+def pulli_stroke(rows: int, cols: int, dot_spacing: float, padding: float):
+    """Return ``(points, ops)`` of one closed stroke through the whole kolam.
+
+    The line graph splits into one closed loop around each dot. Hierholzer's
+    algorithm joins closed trails by splicing one into another where they
+    share a vertex; here the splices follow a comb-shaped spanning tree of
+    the dots (down the first column, then along every row), so the circuit
+    is known in closed form and is laid out with NumPy in time linear in
+    the number of dots. The stroke runs out along the top of each row and
+    back along its bottom, descends the first column and finally climbs
+    back up its outside edge to the start.
+
+    This is a fast path for full lattices: it walks the same edges of
+    :func:`pulli_graph` as :func:`trace_pulli`, which traces any
+    configuration and draws lattices with fewer than two rows or columns.
+    """
+    if rows < 2 or cols < 2:
+        return trace_pulli(np.ones((max(rows, 0), max(cols, 0)), dtype=bool), dot_spacing, padding)
+    # Every row between the first and the last takes the same path, shifted down
+    top = _row_steps(cols, top=True, bottom=False)
+    middle = _row_steps(cols, top=False, bottom=False)
+    bottom = _row_steps(cols, top=False, bottom=True)
+    shifts = np.zeros((rows - 2, 1, 2))
+    shifts[:, 0, 1] = np.arange(1, rows - 1)
+    ends = [top[0], (middle[0] + shifts).reshape(-1, 2), bottom[0] + (0, rows - 1)]
+    controls = [top[1], (middle[1] + shifts).reshape(-1, 2), bottom[1] + (0, rows - 1)]
+
+    # Up the outside of the first column, S -> N around the W side of each dot
+    left = np.column_stack((np.zeros(rows - 1), np.arange(rows - 2, -1, -1, dtype=np.float64)))
+    climb = _segments(left[:-1] + _N, controls=left[:-1] + 2 * _W)
+    home = _segments(left[-1:] + _E, controls=left[-1:] + 2 * _W + 2 * _N)
+    ends = np.concatenate(ends + [climb[0], home[0]])
+    controls = np.concatenate(controls + [climb[1], home[1]])
+    points, ops = _stroke_points(_E, ends, controls)
+    return points * dot_spacing + padding, ops
+
+
+def _stroke_points(start, ends, controls):
+    """Lay out ``(points, ops)`` of a stroke from ``start`` through every step.
+
+    Steps with a NaN control are lines, the others quadratic arcs.
+    """
+    curved = ~np.isnan(controls[:, 0])
+    # One point per straight step, a control and an end point per arc
+    sizes = 1 + curved
+    starts = 1 + np.concatenate(([0], np.cumsum(sizes)[:-1]))
+    points = np.empty((1 + sizes.sum(), 2))
+    ops = np.empty(len(points), dtype=np.uint8)
+    points[0] = start
+    ops[0] = OP_MOVE
+    points[starts[curved]] = controls[curved]
+    ops[starts[curved]] = OP_CTRL
+    points[starts + curved] = ends
+    ops[starts + curved] = np.where(curved, OP_QUAD, OP_LINE)
+    return points, ops
+
+
+def pulli_graph(dots):
+    """Build the line graph of a pulli kolam on the dots set in a boolean mask.
+
+    Vertices are the midpoints between adjacent dots. Around every dot
+    the stroke runs clockwise from each side facing a neighbour to the
+    next one, and that run is an edge. Skipping one or two sides bends it
+    round the outside of the dot with one arc; a dot with a single
+    neighbour skips three sides and rounds itself with two arcs through
+    the far side.
+
+    Returns ``(vertices, heads, tails, controls, middles)``: the position
+    of every vertex in dot units, the vertices each edge runs from and
+    to, its ``(first, second)`` arc controls and the point between its two
+    arcs. Single-arc edges repeat their control; lines and single-arc
+    edges have NaN middles, lines NaN controls too.
+    """
+    dots = np.asarray(dots, dtype=bool)
+    rows, cols = dots.shape
+    padded = np.pad(dots, 1)
+    steps = _SIDES.astype(np.int64)
+    facing = np.stack([padded[1 + dy:1 + dy + rows, 1 + dx:1 + dx + cols]
+                       for dx, dy in steps.tolist()], axis=-1) & dots[..., None]
+    ys, xs = np.nonzero(dots)
+    facing = facing[ys, xs]
+    # Every side facing a neighbour starts one edge, running to the next
+    # facing side clockwise, ``skips`` + 1 quarter turns on
+    dot, side = np.nonzero(facing)
+    skips = np.full(len(dot), 3)
+    for turn in (3, 2, 1):
+        skips = np.where(facing[dot, (side + turn) % 4], turn - 1, skips)
+    centers = np.column_stack((xs[dot], ys[dot])).astype(np.float64)
+
+    def midpoint(sides):
+        return centers + _SIDES[sides % 4] / 2
+
+    # Vertices are numbered by their position on the half-unit lattice
+    heads_at = midpoint(side)
+    keys = np.rint(2 * heads_at).astype(np.int64) @ np.array((1, 2 * cols + 1))
+    order, vertex_of = np.unique(keys, return_index=True, return_inverse=True)[1:]
+    vertices = heads_at[order]
+    tails_at = midpoint(side + skips + 1)
+    tail_keys = np.rint(2 * tails_at).astype(np.int64) @ np.array((1, 2 * cols + 1))
+    tails = np.searchsorted(keys[order], tail_keys)
+
+    first = centers + _SIDES[(side + 1) % 4]
+    controls = np.full((len(dot), 2, 2), np.nan)
+    middles = np.full((len(dot), 2), np.nan)
+    one = skips == 1
+    controls[one] = first[one, None]
+    two = skips == 2
+    controls[two] = (first + _SIDES[(side + 2) % 4])[two, None]
+    three = skips == 3
+    controls[three, 0] = first[three]
+    controls[three, 1] = (centers + _SIDES[(side + 3) % 4])[three]
+    middles[three] = midpoint(side + 2)[three]
+    return vertices, vertex_of.reshape(-1), tails, controls, middles
+
+
+def _has_neighbour(dots: np.ndarray) -> np.ndarray:
+    """Mark the lattice points next to a dot."""
+    near = np.zeros_like(dots)
+    near[1:] |= dots[:-1]
+    near[:-1] |= dots[1:]
+    near[:, 1:] |= dots[:, :-1]
+    near[:, :-1] |= dots[:, 1:]
+    return near
+
+
+def _euler_circuit(heads, tails, vertex_count: int, start: int = 0):
+    """Walk every edge once, by iterative Hierholzer, from vertex ``start``.
+
+    Returns the edges in walking order and whether each is walked tail to
+    head. Raises ValueError when some edge cannot be reached.
+    """
+    edge_count = len(heads)
+    # Adjacency in CSR form: the edges at vertex v are incident[first[v]:first[v + 1]]
+    ends = np.concatenate((heads, tails))
+    order = np.argsort(ends, kind='stable')
+    incident = (order % edge_count).tolist()
+    first = np.searchsorted(ends[order], np.arange(vertex_count + 1)).tolist()
+    heads_list, tails_list = heads.tolist(), tails.tolist()
+
+    cursor = first[:-1]
+    used = bytearray(edge_count)
+    stack = [(start, -1, False)]
+    circuit = []
+    while stack:
+        vertex = stack[-1][0]
+        position, stop = cursor[vertex], first[vertex + 1]
+        while position < stop and used[incident[position]]:
+            position += 1
+        cursor[vertex] = position
+        if position == stop:
+            circuit.append(stack.pop())
+            continue
+        edge = incident[position]
+        used[edge] = 1
+        backwards = heads_list[edge] != vertex
+        stack.append((heads_list[edge] if backwards else tails_list[edge], edge, backwards))
+    if len(circuit) != edge_count + 1:
+        raise ValueError("the dots of a pulli kolam must be connected")
+    circuit.reverse()
+    edges = np.array([edge for _, edge, _ in circuit[1:]], dtype=np.int64)
+    backwards = np.array([flag for _, _, flag in circuit[1:]], dtype=bool)
+    return edges, backwards
+
+
+def trace_pulli(dots, dot_spacing: float = 1.0, padding: float = 0.0):
+    """Return ``(points, ops)`` of one closed stroke through any connected pulli kolam.
+
+    ``dots`` is a boolean mask of the lattice points holding a dot. The
+    stroke is an Euler circuit of :func:`pulli_graph`, found in time
+    linear in the number of edges. A lone dot is rounded by one loop; an
+    empty mask gives an empty stroke. Masks with more than
+    ``MAX_TRACE_DOTS`` dots are rejected, which keeps a trace under about
+    half a second.
+    """
+    dots = np.asarray(dots, dtype=bool)
+    if np.count_nonzero(dots) > MAX_TRACE_DOTS:
+        raise ValueError(f"pulli masks are limited to {MAX_TRACE_DOTS} dots")
+    if not dots.any():
+        return np.empty((0, 2)), np.empty(0, dtype=np.uint8)
+    vertices, heads, tails, controls, middles = pulli_graph(dots)
+    if np.count_nonzero(dots) > 1 and not _has_neighbour(dots)[dots].all():
+        raise ValueError("the dots of a pulli kolam must be connected")
+    if not len(heads):
+        # A lone dot: over its E side to the bottom and back round the W side
+        y, x = np.argwhere(dots)[0]
+        center = np.array((x, y), dtype=np.float64)
+        ends = center + np.array((_S, _N))
+        points, ops = _stroke_points(center + _N, ends, center + _SIDES[[1, 3]])
+        return points * dot_spacing + padding, ops
+
+    edges, backwards = _euler_circuit(heads, tails, len(vertices))
+    # Walked tail to head, an edge takes its arcs in the other order
+    controls = controls[edges]
+    controls[backwards] = controls[backwards, ::-1]
+    middles = middles[edges]
+    ends = vertices[np.where(backwards, heads[edges], tails[edges])]
+    split = ~np.isnan(middles[:, 0])
+    # One step per edge, two for edges with a middle point
+    repeats = 1 + split
+    owners = np.repeat(np.arange(len(edges)), repeats)
+    second = np.zeros(len(owners), dtype=bool)
+    second[np.cumsum(repeats)[split] - 1] = True
+    step_ends = ends[owners]
+    step_ends[np.flatnonzero(second) - 1] = middles[split]
+    step_controls = controls[owners, second.astype(np.int64)]
+    start = vertices[heads[edges[0]] if not backwards[0] else tails[edges[0]]]
+    points, ops = _stroke_points(start, step_ends, step_controls)
+    return points * dot_spacing + padding, ops
+
+
+def generate_pulli_pattern(grid_size, dot_spacing, padding) -> Geometry:
+    """Generate a pulli kolam drawn as a single continuous line around the dots."""
+    builder = GeometryBuilder()
+    points, ops = pulli_stroke(grid_size, grid_size, dot_spacing, padding)
+    if len(ops):
+        builder.path(points, ops, builder.style(**PULLI_STYLE))
+    return builder.build()
@@ -0,0 +1,256 @@
+# kolam/patterns/sikku.py
+
+import numpy as np
+from kolam.geometry import GeometryBuilder, Geometry, OP_MOVE, OP_LINE, OP_CTRL, OP_QUAD
+
+# A sikku kolam is a set of mirror curves: a ray leaves the midpoint of a
+# cell edge at 45 degrees, weaves between the dots and bounces off mirrors
+# until it closes. Every dot sits in its own cell; what the ray meets at
+# the midpoint of an edge between two cells is one of:
+MIRROR_NONE = 0    # nothing, the ray crosses straight into the next cell
+MIRROR_ON = 1      # a mirror lying on the edge, the ray turns back around the dot
+MIRROR_ACROSS = 2  # a mirror across the edge, the ray crosses but turns along it
+# The outline of the lattice always acts as a mirror on the edge.
+
+# Sides of a cell, clockwise from the left, as offsets from its dot. Inside
+# a cell the ray runs along the four segments joining adjacent sides, so
+# segment k joins side k to side k + 1.
+_SIDES = np.array(((-0.5, 0.0), (0.0, -0.5), (0.5, 0.0), (0.0, 0.5)))
+_LEFT, _TOP, _RIGHT, _BOTTOM = range(4)
+
+SIKKU_STYLE = dict(fill="none", stroke="#1E3A8A", stroke_width=2,
+                   stroke_linecap="round", stroke_linejoin="round")
+
+
+def _edge_mirrors(rows: int, cols: int, vertical, horizontal):
+    """Return the mirrors of every vertical and horizontal edge, outline included."""
+    vertical_edges = np.full((rows, cols + 1), MIRROR_ON, dtype=np.uint8)
+    horizontal_edges = np.full((rows + 1, cols), MIRROR_ON, dtype=np.uint8)
+    if vertical is not None:
+        vertical_edges[:, 1:-1] = vertical
+    else:
+        vertical_edges[:, 1:-1] = MIRROR_NONE
+    if horizontal is not None:
+        horizontal_edges[1:-1] = horizontal
+    else:
+        horizontal_edges[1:-1] = MIRROR_NONE
+    return vertical_edges, horizontal_edges
+
+
+def _states(rows: int, cols: int):
+    """Return the cell of every state and the side of that cell it arrives at.
+
+    A state is one segment of one cell run in one direction, numbered
+    ``8 * cell + 2 * segment + direction`` (direction 0 is clockwise around
+    the dot).
+    """
+    states = np.arange(8 * rows * cols)
+    cell, segment, direction = states // 8, (states // 2) % 4, states % 2
+    return cell, segment, direction, (segment + 1 - direction) % 4
+
+
+def _arrival_edges(cell, side, cols: int, vertical_edges, horizontal_edges):
+    """Look up the value of the edge every state arrives at."""
+    row, col = cell // cols, cell % cols
+    values = np.empty(len(cell), dtype=vertical_edges.dtype)
+    for face, edges, edge_row, edge_col in (
+            (_LEFT, vertical_edges, row, col),
+            (_RIGHT, vertical_edges, row, col + 1),
+            (_TOP, horizontal_edges, row, col),
+            (_BOTTOM, horizontal_edges, row + 1, col)):
+        at = side == face
+        values[at] = edges[edge_row[at], edge_col[at]]
+    return values
+
+
+def _successors(rows: int, cols: int, vertical=None, horizontal=None):
+    """Return where the ray goes next from every state, and how it gets there.
+
+    Returns the successor of every state (see :func:`_states`), the side of
+    its cell the state arrives at and whether the ray turns there.
+    """
+    cell, _, direction, side = _states(rows, cols)
+    mirror = _arrival_edges(cell, side, cols, *_edge_mirrors(rows, cols, vertical, horizontal))
+    neighbour = cell + np.array((-1, -cols, 1, cols))[side]
+
+    # Clockwise rays keep circling on a mirror on the edge; crossing straight
+    # reverses the sense around the next dot, a mirror across keeps it
+    clockwise = direction == 0
+    bounce = mirror == MIRROR_ON
+    next_cell = np.where(bounce, cell, neighbour)
+    next_segment = np.select(
+        (bounce, mirror == MIRROR_NONE),
+        (np.where(clockwise, side, side - 1), np.where(clockwise, side + 1, side + 2)),
+        np.where(clockwise, side + 2, side + 1)) % 4
+    next_direction = np.where(mirror == MIRROR_NONE, 1 - direction, direction)
+    successor = 8 * next_cell + 2 * next_segment + next_direction
+    return successor, side, mirror != MIRROR_NONE
+
+
+def _cycle_labels(successor: np.ndarray, longest: int = None) -> np.ndarray:
+    """Label every state with the smallest state on its cycle, by pointer doubling.
+
+    ``longest`` bounds the cycle length; by default any cycle may run
+    through every state.
+    """
+    labels = np.arange(len(successor))
+    jump = successor
+    span = 1
+    while span < (longest or len(successor)):
+        labels = np.minimum(labels, labels[jump])
+        jump = jump[jump]
+        span *= 2
+    return labels
+
+
+def _cycle_ranks(successor: np.ndarray, heads: np.ndarray) -> np.ndarray:
+    """Return how many steps each state is from the last state of its cycle."""
+    indices = np.arange(len(successor))
+    tails = heads[successor]
+    steps = np.where(tails, 0, 1)
+    jump = np.where(tails, indices, successor)
+    span = 1
+    while span < len(successor):
+        steps = steps + steps[jump]
+        jump = jump[jump]
+        span *= 2
+    return steps
+
+
+def count_loops(rows: int, cols: int, vertical=None, horizontal=None) -> int:
+    """Return how many closed curves a mirror configuration draws.
+
+    ``vertical`` holds the mirrors on the ``rows x (cols - 1)`` edges
+    between horizontally adjacent dots and ``horizontal`` those on the
+    ``(rows - 1) x cols`` edges between vertically adjacent ones; left out,
+    they are empty. Without mirrors a lattice draws ``gcd(rows, cols)`` loops.
+    """
+    successor, _, _ = _successors(rows, cols, vertical, horizontal)
+    labels = _cycle_labels(successor)
+    # Every curve is a pair of cycles, one in each direction
+    return int(np.count_nonzero(labels == np.arange(len(labels)))) // 2
+
+
+def count_loops_many(rows: int, cols: int, mirrors) -> np.ndarray:
+    """Like :func:`count_loops`, for many configurations at once.
+
+    ``mirrors`` has one row per configuration: the inner vertical edges
+    row by row, then the inner horizontal edges row by row. All the
+    lattices are traced together as one permutation.
+    """
+    mirrors = np.asarray(mirrors, dtype=np.uint8)
+    vertical_edges = np.full((rows, cols + 1), -1)
+    horizontal_edges = np.full((rows + 1, cols), -1)
+    vertical_edges[:, 1:-1] = np.arange(rows * (cols - 1)).reshape(rows, cols - 1)
+    horizontal_edges[1:-1] = rows * (cols - 1) + np.arange((rows - 1) * cols).reshape(rows - 1, cols)
+    cell, _, _, side = _states(rows, cols)
+    edges = _arrival_edges(cell, side, cols, vertical_edges, horizontal_edges)
+    # The successor of each state under each kind of mirror at its edge;
+    # states arriving at the outline (edge -1) bounce whatever the kind
+    tables = np.stack([
+        _successors(rows, cols, np.full((rows, cols - 1), kind), np.full((rows - 1, cols), kind))[0]
+        for kind in (MIRROR_NONE, MIRROR_ON, MIRROR_ACROSS)])
+    inner = edges >= 0
+    size = len(cell)
+    kinds = np.full((len(mirrors), size), MIRROR_ON, dtype=np.uint8)
+    kinds[:, inner] = mirrors[:, edges[inner]]
+    successor = tables[kinds, np.arange(size)] + size * np.arange(len(mirrors))[:, None]
+    labels = _cycle_labels(successor.ravel(), size).reshape(len(mirrors), size)
+    heads = labels == np.arange(labels.size).reshape(labels.shape)
+    return np.count_nonzero(heads, axis=1) // 2
+
+
+def trace_mirror_curves(rows: int, cols: int, vertical=None, horizontal=None):
+    """Trace every mirror curve of a configuration (see :func:`count_loops`).
+
+    Returns ``(states, sides, turns, lengths)``: the states of all curves
+    in drawing order, one direction per curve, the side each arrives at,
+    whether the ray turns there, and how many states each curve has.
+    Tracing runs on flat arrays with pointer doubling, so it takes
+    ``O(n log n)`` NumPy work and no Python loop over cells.
+    """
+    successor, sides, turns = _successors(rows, cols, vertical, horizontal)
+    labels = _cycle_labels(successor)
+    # Keep the direction whose cycle starts at the smaller state
+    kept = np.flatnonzero(labels < labels[np.arange(len(labels)) ^ 1])
+    renumber = np.full(len(successor), -1)
+    renumber[kept] = np.arange(len(kept))
+    successor = renumber[successor[kept]]
+    labels = labels[kept]
+    steps = _cycle_ranks(successor, labels == kept)
+
+    order = np.lexsort((-steps, labels))
+    labels = labels[order]
+    starts = np.flatnonzero(np.concatenate(([True], labels[1:] != labels[:-1])))
+    lengths = np.diff(np.append(starts, len(labels)))
+    states = kept[order]
+    return states, sides[states], turns[states], lengths
+
+
+def mirror_curve_paths(rows: int, cols: int, dot_spacing: float, padding: float,
+                       vertical=None, horizontal=None):
+    """Return ``(points, ops, lengths)`` with one closed path per mirror curve.
+
+    The path runs through the middle of every segment; where the ray turns
+    it rounds the corner with a quadratic curve through the edge midpoint,
+    and where it crosses straight it stays a line.
+    """
+    states, sides, turns, lengths = trace_mirror_curves(rows, cols, vertical, horizontal)
+    cell, segment = states // 8, (states // 2) % 4
+    dots = np.column_stack((cell % cols, cell // cols)).astype(np.float64)
+    middles = dots + (_SIDES[segment] + _SIDES[(segment + 1) % 4]) / 2
+    corners = dots + _SIDES[sides]
+
+    # Each curve starts in the middle of its first segment and its last
+    # step ends there again
+    firsts = np.concatenate(([0], np.cumsum(lengths)[:-1]))
+    following = np.arange(1, len(states) + 1)
+    following[firsts + lengths - 1] = firsts
+
+    # One move per curve, then a line per straight step and a control and
+    # an end point per turn
+    sizes = 1 + turns
+    curve_sizes = np.add.reduceat(sizes, firsts) + 1
+    offsets = np.cumsum(sizes) - sizes + 1 + np.repeat(np.arange(len(lengths)), lengths)
+    points = np.empty((curve_sizes.sum(), 2))
+    ops = np.empty(len(points), dtype=np.uint8)
+    moves = offsets[firsts] - 1
+    points[moves] = middles[firsts]
+    ops[moves] = OP_MOVE
+    points[offsets[turns]] = corners[turns]
+    ops[offsets[turns]] = OP_CTRL
+    points[offsets + turns] = middles[following]
+    ops[offsets + turns] = np.where(turns, OP_QUAD, OP_LINE)
+    return points * dot_spacing + padding, ops, curve_sizes
+
+
+def sikku_mirrors(rows: int, cols: int):
+    """Return the ``(vertical, horizontal)`` mirrors of the built-in sikku pattern.
+
+    Counting square rings of edges out from the centre, every edge on an
+    odd ring carries a mirror across it, which keeps the kolam symmetric
+    under the dihedral group of the lattice.
+    """
+    def mirrors(edge_rows, edge_cols):
+        rings = np.floor(np.maximum(np.abs(edge_rows - (rows - 1) / 2),
+                                    np.abs(edge_cols - (cols - 1) / 2))).astype(np.int64)
+        return np.where(rings % 2 == 1, MIRROR_ACROSS, MIRROR_NONE).astype(np.uint8)
+
+    row, col = np.mgrid[0:rows, 0:cols - 1]
+    vertical = mirrors(row, col + 0.5)
+    row, col = np.mgrid[0:rows - 1, 0:cols]
+    return vertical, mirrors(row + 0.5, col)
+
+
+def sikku_loop_count(grid_size: int) -> int:
+    """Return how many loops the built-in sikku pattern draws at ``grid_size``."""
+    return count_loops(grid_size, grid_size, *sikku_mirrors(grid_size, grid_size))
+
+
+def generate_sikku_pattern(grid_size, dot_spacing, padding) -> Geometry:
+    """Generate a sikku kolam: mirror curves weaving through the dots."""
+    builder = GeometryBuilder()
+    points, ops, lengths = mirror_curve_paths(grid_size, grid_size, dot_spacing, padding,
+                                              *sikku_mirrors(grid_size, grid_size))
+    builder.path(points, ops, builder.style(**SIKKU_STYLE), lengths)
+    return builder.build()
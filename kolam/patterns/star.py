@@ -1,142 +1,160 @@
 # kolam/patterns/star.py
 
-import math
+import numpy as np
+from kolam.geometry import GeometryBuilder, Geometry, rotated_copies, memoized_shape
+from kolam.utils import hsl_colors
 
-def generate_star_pattern(grid_size, dot_spacing, padding):
-    """Generate a star pattern with multiple points."""
-    pattern = ''
+def _star_vertices(points: int, inner_ratio: float) -> np.ndarray:
+    """Outline of a unit star: outer vertices on even steps, inner ones on odd steps."""
+    order = points * 2
+    outer = rotated_copies([(1, 0)], 0, 0, order, np.arange(0, order, 2))
+    inner = rotated_copies([(inner_ratio, 0)], 0, 0, order, np.arange(1, order, 2))
+    return np.concatenate((outer, inner), axis=1)
+
+def _polygon_vertices(sides: int) -> np.ndarray:
+    """Vertices of a unit polygon, the first repeated at the end to close it."""
+    # Each side starts where the previous one ends, so every vertex is
+    # rotated into place once; step ``sides`` closes the polygon
+    return rotated_copies([(1, 0)], 0, 0, sides, np.arange(sides + 1))[:, 0]
+
+def generate_star_pattern(grid_size, dot_spacing, padding, points=None, outer_ratio=0.9,
+                          inner_ratio=0.4, tip_ratio=1.1, colors=("#4B0082", "#CD5C5C"),
+                          stroke_width=2, tip_radius=3) -> Geometry:
+    """Generate a star pattern with multiple points.
+
+    ``points`` defaults to twice the grid size (at most 16). The outer
+    vertices lie at ``outer_ratio`` of the half grid, the inner ones at
+    ``inner_ratio`` of that and the tip dots at ``tip_ratio``; ``colors``
+    are the outline and tip colors.
+    """
+    builder = GeometryBuilder()
     center = grid_size // 2
     center_x = center * dot_spacing + padding
     center_y = center * dot_spacing + padding
 
-    num_points = min(grid_size * 2, 16)
-    outer_radius = (grid_size // 2) * dot_spacing * 0.9
-    inner_radius = outer_radius * 0.4
-
-    path = f"M"
-    for i in range(num_points * 2):
-        angle = (i * 360 / (num_points * 2)) * (math.pi / 180)
-        radius = outer_radius if i % 2 == 0 else inner_radius
-        x = center_x + radius * math.cos(angle)
-        y = center_y + radius * math.sin(angle)
-        path += f"{x},{y} "
-        if i == 0:
-            path += "L"
-    path += "Z"
-
-    pattern += f'''
-    <path d="{path}" fill="none" stroke="#4B0082" stroke-width="2" stroke-linejoin="round"/>
-    '''
-
-    for i in range(num_points):
-        angle = (i * 360 / num_points) * (math.pi / 180)
-        x = center_x + outer_radius * 1.1 * math.cos(angle)
-        y = center_y + outer_radius * 1.1 * math.sin(angle)
-        pattern += f'<circle cx="{x}" cy="{y}" r="3" fill="#CD5C5C"/>\n'
-
-    return pattern
-
-def generate_sunburst_pattern(grid_size, dot_spacing, padding):
-    """Generate a sunburst pattern with radiating lines."""
-    pattern = ''
+    num_points = points or min(grid_size * 2, 16)
+    outer_radius = (grid_size // 2) * dot_spacing * outer_ratio
+
+    # One outer and one inner vertex, turned into every point of the star
+    shape = memoized_shape(('star', num_points, inner_ratio),
+                           lambda: _star_vertices(num_points, inner_ratio))
+    star = (center_x, center_y) + outer_radius * shape
+
+    outline, tip = colors
+    style = builder.style(fill="none", stroke=outline, stroke_width=stroke_width,
+                          stroke_linejoin="round")
+    builder.polyline(star, style, closed=True)
+
+    tips = (center_x, center_y) + outer_radius * tip_ratio * shape[:, :1]
+    builder.circles(tips, tip_radius, builder.style(fill=tip))
+
+    return builder.build()
+
+def generate_sunburst_pattern(grid_size, dot_spacing, padding, rays=None, radius_ratio=0.8,
+                              palette=(0, 15, 80, 50), stroke_width=2,
+                              center_radius=6) -> Geometry:
+    """Generate a sunburst pattern with radiating lines.
+
+    ``rays`` defaults to twice the grid size (at most 24) and they reach
+    ``radius_ratio`` of the half grid. ``palette`` is ``(hue, hue_step,
+    saturation, lightness)``, one hue step per ray.
+    """
+    builder = GeometryBuilder()
     center = grid_size // 2
     center_x = center * dot_spacing + padding
     center_y = center * dot_spacing + padding
 
-    num_rays = min(grid_size * 2, 24)
-    radius = (grid_size // 2) * dot_spacing * 0.8
+    num_rays = rays or min(grid_size * 2, 24)
+    radius = (grid_size // 2) * dot_spacing * radius_ratio
 
-    for i in range(num_rays):
-        angle = (i * 360 / num_rays) * (math.pi / 180)
-        x = center_x + radius * math.cos(angle)
-        y = center_y + radius * math.sin(angle)
-        
-        path_color = f"hsl({(i * 15) % 360}, 80%, 50%)"
-        
-        pattern += f'''
-    <line x1="{center_x}" y1="{center_y}" x2="{x}" y2="{y}" 
-          stroke="{path_color}" stroke-width="2" stroke-linecap="round"/>
-    '''
+    shape = memoized_shape(('rays', num_rays), lambda: rotated_copies([(1, 0)], 0, 0, num_rays))
+    ends = (center_x, center_y) + radius * shape[:, 0]
+    styles = [
+        builder.style(stroke=color, stroke_width=stroke_width, stroke_linecap="round")
+        for color in hsl_colors(range(num_rays), *palette)
+    ]
+    builder.lines(np.tile((center_x, center_y), (num_rays, 1)), ends, styles)
     
     # Add center circle
-    pattern += f'<circle cx="{center_x}" cy="{center_y}" r="6" fill="#FFD700"/>'
+    builder.circle(center_x, center_y, center_radius, builder.style(fill="#FFD700"))
     
-    return pattern
+    return builder.build()
 
-def generate_mandala_pattern(grid_size, dot_spacing, padding):
-    """Generate a mandala pattern with concentric circles and geometric shapes."""
-    pattern = ''
+def generate_mandala_pattern(grid_size, dot_spacing, padding, ring_ratio=0.8, shape_ratio=0.6,
+                             base_sides=6, palette=(0, 30, 60, 50),
+                             shape_palette=(45, 30, 70, 60), stroke_width=1) -> Geometry:
+    """Generate a mandala pattern with concentric circles and geometric shapes.
+
+    Ring ``i`` has radius ``i * ring_ratio`` dot spacings and polygon ``i``
+    has ``base_sides + i`` sides at ``i * shape_ratio`` dot spacings.
+    ``palette`` colors the rings, one hue step per ring; ``shape_palette``
+    is ``(polygon_hue_step, side_hue_step, saturation, lightness)``.
+    Polygons are drawn half again as thick as the rings.
+    """
+    builder = GeometryBuilder()
     center = grid_size // 2
     center_x = center * dot_spacing + padding
     center_y = center * dot_spacing + padding
 
     # Concentric circles
-    for i in range(1, center + 1):
-        radius = i * dot_spacing * 0.8
-        pattern += f'''
-    <circle cx="{center_x}" cy="{center_y}" r="{radius}" 
-            fill="none" stroke="hsl({i * 30 % 360}, 60%, 50%)" stroke-width="1"/>
-    '''
+    rings = np.arange(1, center + 1)
+    ring_styles = [
+        builder.style(fill="none", stroke=color, stroke_width=stroke_width)
+        for color in hsl_colors(rings.tolist(), *palette)
+    ]
+    centers = np.tile((center_x, center_y), (len(rings), 1))
+    builder.circles(centers, rings * dot_spacing * ring_ratio, ring_styles)
     
     # Geometric shapes
+    polygon_step, side_step, saturation, lightness = shape_palette
     for i in range(3, center + 1, 2):
-        radius = i * dot_spacing * 0.6
-        num_sides = 6 + i
-        for j in range(num_sides):
-            angle1 = (j * 360 / num_sides) * (math.pi / 180)
-            angle2 = ((j + 1) * 360 / num_sides) * (math.pi / 180)
-            
-            x1 = center_x + radius * math.cos(angle1)
-            y1 = center_y + radius * math.sin(angle1)
-            x2 = center_x + radius * math.cos(angle2)
-            y2 = center_y + radius * math.sin(angle2)
-            
-            path_color = f"hsl({(i * 45 + j * 30) % 360}, 70%, 60%)"
-            
-            pattern += f'''
-    <line x1="{x1}" y1="{y1}" x2="{x2}" y2="{y2}" 
-          stroke="{path_color}" stroke-width="1.5"/>
-    '''
+        radius = i * dot_spacing * shape_ratio
+        num_sides = base_sides + i
+        j = np.arange(num_sides)
+        shape = memoized_shape(('polygon', num_sides), lambda: _polygon_vertices(num_sides))
+        vertices = (center_x, center_y) + radius * shape
+        
+        # Hues repeat, so register each distinct style once
+        hues, side_hue = np.unique((i * polygon_step + j * side_step) % 360, return_inverse=True)
+        hue_styles = np.array([
+            builder.style(stroke=color, stroke_width=stroke_width * 1.5)
+            for color in hsl_colors(hues.tolist(), 0, 1, saturation, lightness)
+        ])
+        line_styles = hue_styles[side_hue]
+        builder.lines(vertices[:-1], vertices[1:], line_styles)
     
-    return pattern
+    return builder.build()
 
-def generate_compass_pattern(grid_size, dot_spacing, padding):
+def generate_compass_pattern(grid_size, dot_spacing, padding) -> Geometry:
     """Generate a compass pattern with cardinal directions."""
-    pattern = ''
+    builder = GeometryBuilder()
     center = grid_size // 2
     center_x = center * dot_spacing + padding
     center_y = center * dot_spacing + padding
 
-    # Cardinal directions
+    # Cardinal directions, a quarter turn apart
     directions = [
-        (0, "North", "#FF0000"),
-        (90, "East", "#00FF00"),
-        (180, "South", "#0000FF"),
-        (270, "West", "#FFFF00")
+        ("North", "#FF0000"),
+        ("East", "#00FF00"),
+        ("South", "#0000FF"),
+        ("West", "#FFFF00")
     ]
     
     radius = (grid_size // 2) * dot_spacing * 0.7
+    ends = rotated_copies([(radius, 0)], center_x, center_y, len(directions))[:, 0]
     
-    for angle, direction, color in directions:
-        x = center_x + radius * math.cos(math.radians(angle))
-        y = center_y + radius * math.sin(math.radians(angle))
-        
+    for (x, y), (direction, color) in zip(ends.tolist(), directions):
         # Main direction line
-        pattern += f'''
-    <line x1="{center_x}" y1="{center_y}" x2="{x}" y2="{y}" 
-          stroke="{color}" stroke-width="3" stroke-linecap="round"/>
-    '''
+        builder.line(center_x, center_y, x, y,
+                     builder.style(stroke=color, stroke_width=3, stroke_linecap="round"))
         
         # Direction marker
-        pattern += f'''
-    <circle cx="{x}" cy="{y}" r="4" fill="{color}"/>
-    <text x="{x + 10}" y="{y + 5}" font-size="12" fill="{color}">{direction}</text>
-    '''
+        builder.circle(x, y, 4, builder.style(fill=color))
+        builder.text(x + 10, y + 5, direction, builder.style(font_size=12, fill=color))
     
     # Center compass rose
-    pattern += f'''
-    <circle cx="{center_x}" cy="{center_y}" r="8" fill="#FFFFFF" stroke="#000000" stroke-width="2"/>
-    <text x="{center_x - 5}" y="{center_y + 3}" font-size="10" fill="#000000">N</text>
-    '''
+    builder.circle(center_x, center_y, 8,
+                   builder.style(fill="#FFFFFF", stroke="#000000", stroke_width=2))
+    builder.text(center_x - 5, center_y + 3, "N", builder.style(font_size=10, fill="#000000"))
     
-    return pattern
+    return builder.build()
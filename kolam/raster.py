@@ -0,0 +1,488 @@
+# kolam/raster.py
+
+import math
+import re
+from functools import lru_cache
+from typing import Optional, Tuple
+import numpy as np
+from kolam.geometry import (Geometry, OP_MOVE, OP_CTRL, OP_QUAD, ELEM_PATH, ELEM_LINE,
+                            ELEM_CIRCLE, ELEM_TEXT, DOT_RADIUS, DOT_FILL)
+from kolam.lod import quadratic_steps, cubic_steps, arc_steps
+
+# Segments per quadratic curve when no tolerance is given, as in the SVG rasterizer
+CURVE_STEPS = 20
+
+# SVG user units are CSS pixels, 96 to the inch
+CSS_DPI = 96
+
+# Supersampled canvases are drawn in horizontal bands of at most this many
+# pixels, however large the output
+MAX_BAND_PIXELS = 1 << 24
+
+# Largest image (in output pixels) and supersampling factor a render may use
+MAX_RASTER_PIXELS = 1 << 26
+MAX_SUPERSAMPLE = 8
+
+# Filters to shrink a supersampled canvas with; box averages each k x k
+# block in integer arithmetic, so its output is exact and reproducible
+RESAMPLE_FILTERS = ('box', 'lanczos')
+
+# Extra output rows drawn above and below each band and then dropped: one
+# absorbs Pillow rounding where shapes cross the band edge, the Lanczos
+# kernel reaches 3 rows each way
+_BAND_MARGINS = {'box': 1, 'lanczos': 4}
+
+_NAMED_COLORS = {
+    'black': (0, 0, 0),
+    'white': (255, 255, 255),
+    'red': (255, 0, 0),
+    'green': (0, 128, 0),
+    'blue': (0, 0, 255),
+    'yellow': (255, 255, 0),
+    'orange': (255, 165, 0),
+    'purple': (128, 0, 128),
+}
+
+
+def parse_color(color_str: str) -> Optional[Tuple[int, int, int]]:
+    """Parse an SVG color (``hsl()``, hex or a basic name) to an RGB tuple; ``none`` is None."""
+    if not color_str or color_str == 'none':
+        return None
+
+    # Handle hsl colors
+    if color_str.startswith('hsl('):
+        match = re.match(r'hsl\(([\d.]+),\s*([\d.]+)%,\s*([\d.]+)%\)', color_str)
+        if match:
+            h, s, l = map(float, match.groups())
+            # Convert HSL to RGB
+            h = h / 360.0
+            s = s / 100.0
+            l = l / 100.0
+
+            if s == 0:
+                r = g = b = l
+            else:
+                def hue_to_rgb(p, q, t):
+                    if t < 0: t += 1
+                    if t > 1: t -= 1
+                    if t < 1/6: return p + (q - p) * 6 * t
+                    if t < 1/2: return q
+                    if t < 2/3: return p + (q - p) * (2/3 - t) * 6
+                    return p
+
+                q = l * (1 + s) if l < 0.5 else l + s - l * s
+                p = 2 * l - q
+                r = hue_to_rgb(p, q, h + 1/3)
+                g = hue_to_rgb(p, q, h)
+                b = hue_to_rgb(p, q, h - 1/3)
+
+            return (int(r * 255), int(g * 255), int(b * 255))
+
+    # Handle hex colors
+    if color_str.startswith('#'):
+        hex_color = color_str.lstrip('#')
+        if len(hex_color) == 3:
+            hex_color = ''.join(c * 2 for c in hex_color)
+        return tuple(int(hex_color[i:i+2], 16) for i in (0, 2, 4))
+
+    return _NAMED_COLORS.get(color_str.lower(), (0, 0, 0))
+
+
+def _sample_steps(counts: np.ndarray):
+    """Split curves into ``counts`` segments each.
+
+    Returns ``(owners, t)``: for every sample the curve it belongs to and
+    its parameter, ``1 / n`` through ``1`` (each curve's start is the end
+    of whatever came before it).
+    """
+    owners = np.repeat(np.arange(len(counts)), counts)
+    firsts = np.cumsum(counts) - counts
+    return owners, (np.arange(len(owners)) - firsts[owners] + 1) / counts[owners]
+
+
+def _quadratic_samples(starts, controls, ends, counts) -> np.ndarray:
+    owners, t = _sample_steps(counts)
+    t = t[:, None]
+    return (1 - t) ** 2 * starts[owners] + 2 * (1 - t) * t * controls[owners] + t ** 2 * ends[owners]
+
+
+def _cubic_samples(starts, controls1, controls2, ends, counts) -> np.ndarray:
+    owners, t = _sample_steps(counts)
+    t = t[:, None]
+    return ((1 - t) ** 3 * starts[owners] + 3 * (1 - t) ** 2 * t * controls1[owners]
+            + 3 * (1 - t) * t ** 2 * controls2[owners] + t ** 3 * ends[owners])
+
+
+def arc_centers(starts, params):
+    """Convert SVG endpoint arcs to centre form, for many arcs at once.
+
+    ``params`` rows are the ``A`` command's ``rx ry rotation large-arc
+    sweep x y``. Returns ``(centers, radii, rotation, theta, sweep)``
+    (radians), with radii scaled up where they cannot reach the end point,
+    following the SVG implementation notes (F.6.5 and F.6.6).
+    """
+    starts = np.asarray(starts, dtype=np.float64).reshape(-1, 2)
+    params = np.asarray(params, dtype=np.float64).reshape(-1, 7)
+    radii = np.abs(params[:, 0:2])
+    phi = np.radians(params[:, 2])
+    large, sweep = params[:, 3] != 0, params[:, 4] != 0
+    ends = params[:, 5:7]
+    cos, sin = np.cos(phi)[:, None], np.sin(phi)[:, None]
+
+    half = (starts - ends) / 2
+    prime = np.column_stack((cos[:, 0] * half[:, 0] + sin[:, 0] * half[:, 1],
+                             -sin[:, 0] * half[:, 0] + cos[:, 0] * half[:, 1]))
+    scale = np.sqrt(np.maximum(((prime / np.maximum(radii, 1e-12)) ** 2).sum(axis=1), 1.0))
+    radii = radii * scale[:, None]
+    rx, ry = radii[:, 0], radii[:, 1]
+    px, py = prime[:, 0], prime[:, 1]
+    spread = (rx * py) ** 2 + (ry * px) ** 2
+    coef = np.sqrt(np.maximum((rx * ry) ** 2 - spread, 0) / np.maximum(spread, 1e-12))
+    coef = np.where(large == sweep, -coef, coef)
+    center_prime = np.column_stack((coef * rx * py / ry, -coef * ry * px / rx))
+    centers = (np.column_stack((cos[:, 0] * center_prime[:, 0] - sin[:, 0] * center_prime[:, 1],
+                                sin[:, 0] * center_prime[:, 0] + cos[:, 0] * center_prime[:, 1]))
+               + (starts + ends) / 2)
+
+    u = (prime - center_prime) / radii
+    v = (-prime - center_prime) / radii
+    theta = np.arctan2(u[:, 1], u[:, 0])
+    delta = np.arctan2(u[:, 0] * v[:, 1] - u[:, 1] * v[:, 0], (u * v).sum(axis=1))
+    delta = np.where(~sweep & (delta > 0), delta - 2 * np.pi, delta)
+    delta = np.where(sweep & (delta < 0), delta + 2 * np.pi, delta)
+    return centers, radii, phi, theta, delta
+
+
+def _arc_samples(centers, radii, phi, theta, delta, counts) -> np.ndarray:
+    owners, t = _sample_steps(counts)
+    angle = theta[owners] + t * delta[owners]
+    rx, ry = radii[owners, 0], radii[owners, 1]
+    cos, sin = np.cos(phi[owners]), np.sin(phi[owners])
+    return np.column_stack((centers[owners, 0] + rx * cos * np.cos(angle) - ry * sin * np.sin(angle),
+                            centers[owners, 1] + rx * sin * np.cos(angle) + ry * cos * np.sin(angle)))
+
+
+def flatten_points(points, ops, tolerance: float = None, steps: int = CURVE_STEPS):
+    """Replace every quadratic curve by line segments, for all curves at once.
+
+    Returns ``(flat, sources)``: the polyline vertices and, for each one,
+    the index of the point it came from. A curve's samples come from its
+    end point; its control point drops out. Curves get ``steps`` segments,
+    or with a ``tolerance`` (canvas units) as many as keep them within it
+    (see ``kolam.lod.quadratic_steps``).
+    """
+    points = np.asarray(points, dtype=np.float64).reshape(-1, 2)
+    ops = np.asarray(ops, dtype=np.uint8)
+    counts = np.where(ops == OP_CTRL, 0, 1)
+    curves = np.flatnonzero(ops == OP_QUAD)
+    starts, controls, ends = points[curves - 2], points[curves - 1], points[curves]
+    if tolerance:
+        counts[curves] = quadratic_steps(starts, controls, ends, tolerance)
+    else:
+        counts[curves] = steps
+    sources = np.repeat(np.arange(len(points)), counts)
+    flat = points[sources]
+    # Samples of each curve are consecutive and the curves are in order
+    flat[ops[sources] == OP_QUAD] = _quadratic_samples(starts, controls, ends, counts[curves])
+    return flat, sources
+
+
+# Values each path command takes, and its index in flatten_commands' tables
+_COMMAND_SIZES = {'M': 2, 'L': 2, 'Q': 4, 'C': 6, 'A': 7, 'Z': 0}
+_MOVE, _LINE, _QUADRATIC, _CUBIC, _ARC = range(5)
+_COMMAND_CODES = {'M': _MOVE, 'L': _LINE, 'Z': _LINE, 'Q': _QUADRATIC, 'C': _CUBIC, 'A': _ARC}
+
+
+def flatten_paths(paths, tolerance: float = None, steps: int = CURVE_STEPS):
+    """Flatten many paths of absolute commands into polylines, for all curves at once.
+
+    Each path is a list of ``(name, coords)`` pairs using ``M``, ``L``,
+    ``Q``, ``C``, ``A`` and ``Z`` with absolute coordinates; others are
+    skipped. Every quadratic, cubic and arc of every path is sampled in one
+    NumPy pass per kind, with ``steps`` segments each or, with a
+    ``tolerance``, as many as keep it within that distance (see
+    ``kolam.lod``). Returns ``(flat, moves, bounds)``: the vertices, the
+    index where each subpath starts and, for path ``i``, its vertices
+    ``flat[bounds[i]:bounds[i + 1]]``.
+    """
+    codes, starts, rows, path_firsts = [], [], [], []
+    for commands in paths:
+        path_firsts.append(len(codes))
+        current = subpath = (0.0, 0.0)
+        for name, coords in commands:
+            if _COMMAND_SIZES.get(name) != len(coords):
+                continue
+            end = subpath if name == 'Z' else (coords[-2], coords[-1])
+            code = _COMMAND_CODES[name]
+            # Zero radii or a zero-length arc are drawn as a straight line
+            if code == _ARC and (coords[0] == 0 or coords[1] == 0 or end == current):
+                code = _LINE
+            codes.append(code)
+            starts.append(current)
+            # One row per command: its other values, padded, then the end point
+            controls = coords[:-2]
+            rows.append(controls + [0.0] * (5 - len(controls)) + [end[0], end[1]])
+            current = end
+            if code == _MOVE:
+                subpath = end
+    path_firsts.append(len(codes))
+    if not codes:
+        return np.empty((0, 2)), np.empty(0, dtype=np.int64), np.zeros(len(path_firsts), dtype=np.int64)
+
+    codes = np.array(codes)
+    starts = np.array(starts, dtype=np.float64)
+    rows = np.array(rows, dtype=np.float64)
+    ends = rows[:, 5:7]
+    counts = np.ones(len(codes), dtype=np.int64)
+    curves = {}
+    for code in (_QUADRATIC, _CUBIC, _ARC):
+        index = np.flatnonzero(codes == code)
+        if len(index):
+            curves[code] = index
+            counts[index] = steps
+
+    arc = arc_centers(starts[curves[_ARC]], rows[curves[_ARC]]) if _ARC in curves else None
+    if tolerance:
+        for code, index in curves.items():
+            if code == _QUADRATIC:
+                counts[index] = quadratic_steps(starts[index], rows[index, 0:2], ends[index], tolerance)
+            elif code == _CUBIC:
+                counts[index] = cubic_steps(starts[index], rows[index, 0:2], rows[index, 2:4],
+                                            ends[index], tolerance)
+            else:
+                counts[index] = arc_steps(arc[1].max(axis=1), arc[4], tolerance)
+
+    firsts = np.cumsum(counts) - counts
+    flat = np.repeat(ends, counts, axis=0)
+    if curves:
+        kinds = np.repeat(codes, counts)
+        for code, index in curves.items():
+            if code == _QUADRATIC:
+                samples = _quadratic_samples(starts[index], rows[index, 0:2], ends[index],
+                                             counts[index])
+            elif code == _CUBIC:
+                samples = _cubic_samples(starts[index], rows[index, 0:2], rows[index, 2:4],
+                                         ends[index], counts[index])
+            else:
+                samples = _arc_samples(*arc, counts[index])
+            # Samples of each curve are consecutive and the curves are in order
+            flat[kinds == code] = samples
+        # Land exactly on every end point
+        flat[firsts + counts - 1] = ends
+    bounds = np.append(firsts, len(flat))[path_firsts]
+    return flat, firsts[codes == _MOVE], bounds
+
+
+def flatten_commands(commands, tolerance: float = None, steps: int = CURVE_STEPS):
+    """Flatten one path, see :func:`flatten_paths`; returns ``(flat, moves)``."""
+    flat, moves, _ = flatten_paths([commands], tolerance, steps)
+    return flat, moves
+
+
+def draw_subpaths(draw, coords, moves, end: int, fill, width: int, joint=None) -> None:
+    """Draw each subpath as one joined polyline.
+
+    ``coords`` is the flat ``[x0, y0, x1, y1, ...]`` list of the vertices,
+    ``moves`` the vertex index where each subpath starts and ``end`` the
+    index after the last one.
+    """
+    for start, stop in zip(moves, list(moves[1:]) + [end]):
+        if stop - start > 1:
+            draw.line(coords[2 * start:2 * stop], fill=fill, width=width, joint=joint)
+
+
+def _stroke(style) -> Tuple[Optional[tuple], float]:
+    return parse_color(style.get('stroke', 'none')), float(style.get('stroke-width', '1'))
+
+
+@lru_cache(maxsize=16)
+def _load_font(size: float):
+    from PIL import ImageFont
+    try:
+        return ImageFont.load_default(size=size)
+    except TypeError:
+        # Pillow < 10.1 has a single bitmap size
+        return ImageFont.load_default()
+
+
+class ScaledDraw:
+    """Draw in canvas units onto one band of a scaled, supersampled canvas.
+
+    Wraps an ``ImageDraw``: coordinates are scaled by ``factor`` and moved
+    up by ``top`` rows, and stroke widths are scaled and rounded half up,
+    so fractional widths survive supersampling. With ``snap`` coordinates
+    are rounded to whole pixels: Pillow truncates negative ones toward
+    zero, so only whole pixels draw the same in every band.
+    """
+
+    def __init__(self, draw, factor: float = 1.0, top: int = 0, shift: float = 0.0,
+                 snap: bool = False):
+        self.draw = draw
+        self.factor = factor
+        # Centres each output pixel on the block of samples it averages
+        self.offset = (shift, shift - top)
+        self.snap = snap
+
+    def points(self, values) -> list:
+        """Map a flat ``[x0, y0, x1, y1, ...]`` sequence to pixel coordinates."""
+        factor, (dx, dy) = self.factor, self.offset
+        mapped = [value * factor + (dy if i % 2 else dx) for i, value in enumerate(values)]
+        return [math.floor(value + 0.5) for value in mapped] if self.snap else mapped
+
+    def array(self, flat: np.ndarray) -> list:
+        """Map an ``(n, 2)`` array of points to a flat list of pixel coordinates."""
+        mapped = flat * self.factor + self.offset
+        if self.snap:
+            mapped = np.floor(mapped + 0.5).astype(np.int64)
+        return mapped.ravel().tolist()
+
+    def width(self, width: float) -> int:
+        if width <= 0:
+            return 0
+        return max(1, int(width * self.factor + 0.5))
+
+    def line(self, xy, fill=None, width: float = 1, joint=None) -> None:
+        self.draw.line(self.points(xy), fill=fill, width=self.width(width), joint=joint)
+
+    def ellipse(self, box, fill=None, outline=None, width: float = 1) -> None:
+        self.draw.ellipse(self.points(box), fill=fill, outline=outline, width=self.width(width))
+
+    def rectangle(self, box, fill=None, outline=None, width: float = 1) -> None:
+        self.draw.rectangle(self.points(box), fill=fill, outline=outline, width=self.width(width))
+
+    def text(self, xy, text: str, fill=None, size: float = 16, anchor: str = None) -> None:
+        self.draw.text(tuple(self.points(xy)), text, fill=fill,
+                       font=_load_font(size * self.factor), anchor=anchor)
+
+
+def check_raster_options(scale: float, supersample: int, resample: str) -> None:
+    """Raise ValueError unless :func:`render_canvas` can use these options."""
+    if not scale > 0:
+        raise ValueError(f"Scale must be positive, got {scale!r}")
+    if int(supersample) != supersample or not 1 <= supersample <= MAX_SUPERSAMPLE:
+        raise ValueError(f"Supersample must be an integer from 1 to {MAX_SUPERSAMPLE}, "
+                         f"got {supersample!r}")
+    if resample not in RESAMPLE_FILTERS:
+        raise ValueError(f"Unknown resample filter {resample!r}, use one of {RESAMPLE_FILTERS}")
+
+
+def render_canvas(width: float, height: float, paint, scale: float = 1.0,
+                  supersample: int = 1, resample: str = 'box'):
+    """Paint a ``width x height`` canvas into a new Pillow RGB image.
+
+    The image is ``scale`` times the canvas size. With ``supersample`` k
+    the canvas is drawn at k times that and shrunk with the ``resample``
+    filter (see :data:`RESAMPLE_FILTERS`), which anti-aliases every edge.
+    To bound memory the supersampled canvas is drawn in horizontal bands
+    of at most :data:`MAX_BAND_PIXELS`; ``paint(draw)`` is called once per
+    band with a :class:`ScaledDraw` and should draw the whole canvas,
+    leaving Pillow to clip it. Output only depends on the arguments and
+    the band size, so renders can be compared against golden images;
+    canvases up to the band size (all but print-size exports) are drawn
+    in one band.
+    """
+    try:
+        from PIL import Image, ImageDraw
+    except ImportError as e:
+        raise ImportError(f"Please install Pillow: pip install Pillow. Error: {e}")
+
+    check_raster_options(scale, supersample, resample)
+    k = int(supersample)
+    out_width = max(1, int(width * scale + 0.5))
+    out_height = max(1, int(height * scale + 0.5))
+    if out_width * out_height > MAX_RASTER_PIXELS:
+        raise ValueError(f"A {out_width}x{out_height} image is larger than "
+                         f"{MAX_RASTER_PIXELS} pixels")
+
+    img = Image.new('RGB', (out_width, out_height), color='white')
+    if k == 1:
+        paint(ScaledDraw(ImageDraw.Draw(img), scale))
+        return img
+
+    margin = _BAND_MARGINS[resample]
+    rows = max(1, MAX_BAND_PIXELS // (out_width * k * k) - 2 * margin)
+    for top in range(0, out_height, rows):
+        # Draw the band with its margin, shrink it, then keep the band's rows
+        first = max(0, top - margin)
+        last = min(out_height, top + rows + margin)
+        band = Image.new('RGB', (out_width * k, (last - first) * k), color='white')
+        paint(ScaledDraw(ImageDraw.Draw(band), scale * k, first * k, (k - 1) / 2, snap=True))
+        if resample == 'box':
+            band = band.reduce(k)
+        else:
+            band = band.resize((out_width, last - first), getattr(Image, 'Resampling', Image).LANCZOS)
+        img.paste(band.crop((0, top - first, out_width, min(top + rows, out_height) - first)),
+                  (0, top))
+    return img
+
+
+def render_geometry(geometry: Geometry, tolerance: float = None, scale: float = 1.0,
+                    supersample: int = 1, resample: str = 'box'):
+    """Draw a geometry into a new Pillow RGB image, ``scale`` times its canvas size.
+
+    The image comes straight from the arrays, with no SVG in between: all
+    curves are flattened in one pass (see :func:`flatten_points`) and each
+    subpath is drawn with a single ``draw.line`` call. ``tolerance`` is in
+    output pixels. Styles follow SVG defaults: no stroke unless one is
+    given, black circle fill, width 1. See :func:`render_canvas` for
+    ``supersample`` and ``resample``.
+    """
+    width = float(geometry.width or 400)
+    height = float(geometry.height or 400)
+    background = parse_color(geometry.background) if geometry.background else None
+    dot_color = parse_color(DOT_FILL)
+    dots = geometry.grid_points().tolist()
+
+    if len(geometry):
+        flat, sources = flatten_points(geometry.points, geometry.ops,
+                                       tolerance / scale if tolerance else None)
+        # Flat index where each element and each subpath starts
+        element_starts = np.searchsorted(sources, geometry.offsets).tolist()
+        moves = np.flatnonzero(geometry.ops[sources] == OP_MOVE)
+        styles = [dict(style) for style in geometry.style_table]
+        kinds = geometry.kinds.tolist()
+        style_ids = geometry.styles.tolist()
+        radii = geometry.radii.tolist()
+        centers = geometry.points[geometry.offsets[:-1]].tolist()
+    else:
+        kinds = []
+
+    def paint(draw):
+        if background:
+            draw.rectangle([0, 0, width, height], fill=background)
+        for cx, cy in dots:
+            draw.ellipse([cx - DOT_RADIUS, cy - DOT_RADIUS, cx + DOT_RADIUS, cy + DOT_RADIUS],
+                         fill=dot_color)
+        if not kinds:
+            return
+
+        coords = draw.array(flat)
+        for index, kind in enumerate(kinds):
+            style = styles[style_ids[index]]
+            if kind in (ELEM_PATH, ELEM_LINE):
+                stroke_color, stroke_width = _stroke(style)
+                if not stroke_color:
+                    continue
+                first, last = element_starts[index], element_starts[index + 1]
+                joint = 'curve' if style.get('stroke-linejoin') == 'round' else None
+                bounds = moves[np.searchsorted(moves, first):np.searchsorted(moves, last)].tolist()
+                draw_subpaths(draw.draw, coords, bounds, last, stroke_color,
+                              draw.width(stroke_width), joint)
+            elif kind == ELEM_CIRCLE:
+                cx, cy = centers[index]
+                r = radii[index]
+                fill_color = parse_color(style.get('fill', 'black'))
+                stroke_color, stroke_width = _stroke(style)
+                if fill_color:
+                    draw.ellipse([cx - r, cy - r, cx + r, cy + r], fill=fill_color)
+                if stroke_color:
+                    draw.ellipse([cx - r, cy - r, cx + r, cy + r], outline=stroke_color,
+                                 width=stroke_width)
+            elif kind == ELEM_TEXT:
+                fill_color = parse_color(style.get('fill', 'black'))
+                if fill_color:
+                    # SVG places text by its baseline
+                    draw.text(centers[index], geometry.texts.get(index, ''), fill=fill_color,
+                              size=float(style.get('font-size', '16')), anchor='ls')
+
+    return render_canvas(width, height, paint, scale, supersample, resample)
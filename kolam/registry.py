@@ -0,0 +1,322 @@
+# kolam/registry.py
+
+import importlib
+import threading
+import time
+from typing import Any, Callable, Dict, List, Optional, Tuple
+
+DEFAULT_PATTERN = 'basic'
+
+_NO_SYMMETRY = {"horizontal": False, "vertical": False, "diagonal": False, "radial": False}
+_NO_REPETITION = {"has_repetition": False, "motif_size": 0, "description": "No repetition detected"}
+_NO_ATTRIBUTES = {
+    "looped_traversal": False,
+    "grid_repetition": False,
+    "rotational_symmetry": False,
+    "bilateral_symmetry": False,
+    "diagonal_symmetry": False
+}
+
+
+def _resolve(ref):
+    """Turn a ``'module:attribute'`` reference into the object it names."""
+    if ref is None or callable(ref):
+        return ref
+    module, _, attribute = ref.partition(':')
+    return getattr(importlib.import_module(module), attribute)
+
+
+class PatternSpec:
+    """Everything the app knows about one pattern type.
+
+    ``generator``, ``timeline``, ``clean_animator`` and ``loops`` may be
+    given as ``'module:function'`` strings; the module is imported the first
+    time the function is needed. ``loops`` maps a grid size to the number of
+    closed loops the pattern draws, for patterns that know it. ``cost`` is
+    ``(fixed, per_ring)``: a rough point count of
+    ``fixed + per_ring * (grid_size // 2)``. ``parameters`` maps the
+    generator's keyword parameters to the ``(low, high)`` range variants
+    draw them from (see ``kolam.variation``); integer bounds draw integers
+    and a tuple of ranges draws a tuple. ``max_large_grid_size`` caps the
+    grid of patterns too slow to draw at every large-grid size.
+    ``centre_dots`` centres the dot lattice on the canvas, for patterns
+    traced around the dots that reach past them on every side.
+    """
+
+    def __init__(self, name: str, generator, timeline=None, clean_animator=None, loops=None,
+                 category: str = "Other Patterns",
+                 description: str = "Traditional Kolam pattern",
+                 symmetry: Dict[str, bool] = None,
+                 repetition: Dict[str, Any] = None,
+                 attributes: Dict[str, bool] = None,
+                 cost: Tuple[float, float] = (0, 10),
+                 supports_tolerance: bool = False,
+                 parameters: Dict[str, tuple] = None,
+                 max_large_grid_size: int = None,
+                 centre_dots: bool = False):
+        self.name = name
+        self.category = category
+        self.description = description
+        self.symmetry = symmetry or dict(_NO_SYMMETRY)
+        self.repetition = repetition or dict(_NO_REPETITION)
+        self.attributes = attributes or dict(_NO_ATTRIBUTES)
+        self.cost = cost
+        self.supports_tolerance = supports_tolerance
+        self.parameters = parameters or {}
+        self.max_large_grid_size = max_large_grid_size
+        self.centre_dots = centre_dots
+        self._refs = {"generator": generator, "timeline": timeline,
+                      "clean_animator": clean_animator, "loops": loops}
+        self._resolved = {}
+        self.calls = 0
+        self.seconds = 0.0
+
+    def _get(self, role: str):
+        if role not in self._resolved:
+            self._resolved[role] = _resolve(self._refs[role])
+        return self._resolved[role]
+
+    @property
+    def generator(self) -> Callable:
+        return self._get("generator")
+
+    @property
+    def timeline(self) -> Optional[Callable]:
+        return self._get("timeline")
+
+    @property
+    def clean_animator(self) -> Optional[Callable]:
+        return self._get("clean_animator")
+
+    @property
+    def loops(self) -> Optional[Callable]:
+        return self._get("loops")
+
+    def generate(self, grid_size: int, dot_spacing: float, padding: float, tolerance=None,
+                 **params):
+        """Build the pattern geometry, counting calls and time spent.
+
+        ``params`` are passed on to the generator as keyword arguments.
+        """
+        start = time.perf_counter()
+        if self.supports_tolerance:
+            geometry = self.generator(grid_size, dot_spacing, padding, tolerance, **params)
+        else:
+            geometry = self.generator(grid_size, dot_spacing, padding, **params)
+        with _lock:
+            self.calls += 1
+            self.seconds += time.perf_counter() - start
+        return geometry
+
+    def lattice_padding(self, dot_spacing: float, padding: float) -> float:
+        """Return where the first dot sits on a canvas of ``grid_size * dot_spacing + 2 * padding``.
+
+        The canvas leaves room for one dot spacing more than the lattice
+        spans; ``centre_dots`` patterns split it between both sides.
+        """
+        return padding + dot_spacing / 2 if self.centre_dots else padding
+
+    def estimate_cost(self, grid_size: int) -> float:
+        """Rough number of path points the pattern produces at ``grid_size``."""
+        fixed, per_ring = self.cost
+        return fixed + per_ring * (grid_size // 2)
+
+
+_lock = threading.Lock()
+_registry: Dict[str, PatternSpec] = {}
+
+
+def register_pattern(name: str, generator, **options) -> PatternSpec:
+    """Register (or replace) a pattern type and return its spec."""
+    spec = PatternSpec(name, generator, **options)
+    with _lock:
+        _registry[name] = spec
+    return spec
+
+
+def is_registered(name: str) -> bool:
+    return name in _registry
+
+
+def get_pattern(name: str) -> PatternSpec:
+    """Return the spec for ``name``, falling back to the basic pattern."""
+    spec = _registry.get(name)
+    return spec if spec is not None else _registry[DEFAULT_PATTERN]
+
+
+def pattern_names() -> List[str]:
+    """Return registered pattern names in registration order."""
+    return list(_registry)
+
+
+def get_pattern_stats() -> Dict[str, Dict[str, float]]:
+    """Return how often each pattern was generated and the time it took."""
+    with _lock:
+        return {name: {"calls": spec.calls, "seconds": spec.seconds}
+                for name, spec in _registry.items()}
+
+
+# Built-in patterns
+register_pattern(
+    'basic', 'kolam.patterns.basic:generate_basic_pattern',
+    timeline='kolam.animation:_animate_basic_pattern',
+    clean_animator='kolam.animated_generator:_animate_basic_pattern_clean',
+    category="Basic Patterns",
+    description="Nested squares with geometric symmetry",
+    symmetry={"horizontal": True, "vertical": True, "diagonal": True, "radial": False},
+    repetition={"has_repetition": True, "motif_size": 1, "description": "Nested square repetition"},
+    attributes={"looped_traversal": True, "grid_repetition": True, "rotational_symmetry": False,
+                "bilateral_symmetry": True, "diagonal_symmetry": True},
+    cost=(0, 5)
+)
+register_pattern(
+    'diamond', 'kolam.patterns.basic:generate_diamond_pattern',
+    timeline='kolam.animation:_animate_diamond_pattern',
+    clean_animator='kolam.animated_generator:_animate_diamond_pattern_clean',
+    category="Basic Patterns",
+    description="Diamond shapes with diagonal connections",
+    symmetry={"horizontal": True, "vertical": True, "diagonal": True, "radial": False},
+    repetition={"has_repetition": True, "motif_size": 1, "description": "Diamond shape repetition"},
+    attributes={"looped_traversal": True, "grid_repetition": True, "rotational_symmetry": False,
+                "bilateral_symmetry": True, "diagonal_symmetry": True},
+    cost=(0, 9)
+)
+register_pattern(
+    'spiral', 'kolam.patterns.basic:generate_spiral_pattern',
+    timeline='kolam.animation:_animate_spiral_pattern',
+    clean_animator='kolam.animated_generator:_animate_spiral_pattern_clean',
+    category="Basic Patterns",
+    description="Spiral patterns with continuous curves",
+    symmetry={"horizontal": False, "vertical": False, "diagonal": False, "radial": True},
+    repetition={"has_repetition": False, "motif_size": 0, "description": "Continuous spiral pattern"},
+    attributes={"looped_traversal": False, "grid_repetition": False, "rotational_symmetry": True,
+                "bilateral_symmetry": False, "diagonal_symmetry": False},
+    cost=(145, 0),
+    supports_tolerance=True
+)
+register_pattern(
+    'flower', 'kolam.patterns.flower:generate_flower_pattern',
+    timeline='kolam.animation:_animate_flower_pattern',
+    clean_animator='kolam.animated_generator:_animate_flower_pattern_clean',
+    category="Flower Patterns",
+    description="Flower patterns with petal arrangements",
+    symmetry={"horizontal": True, "vertical": True, "diagonal": False, "radial": True},
+    repetition={"has_repetition": True, "motif_size": 6, "description": "Petal repetition"},
+    attributes={"looped_traversal": False, "grid_repetition": True, "rotational_symmetry": True,
+                "bilateral_symmetry": True, "diagonal_symmetry": False},
+    cost=(0, 8),
+    parameters={"petals": (4, 12), "radius_ratio": (0.6, 0.95), "bulge": (1.0, 1.5),
+                "reach": (0.6, 0.9), "palette": ((0, 359), (15, 90), (50, 90), (40, 60)),
+                "stroke_width": (1.0, 3.0)}
+)
+register_pattern(
+    'lotus', 'kolam.patterns.flower:generate_lotus_pattern',
+    clean_animator='kolam.animated_generator:_animate_lotus_pattern_clean',
+    category="Flower Patterns",
+    description="Layered lotus patterns with multiple petals",
+    symmetry={"horizontal": True, "vertical": True, "diagonal": False, "radial": True},
+    repetition={"has_repetition": True, "motif_size": 8, "description": "Layered petal repetition"},
+    attributes={"looped_traversal": False, "grid_repetition": True, "rotational_symmetry": True,
+                "bilateral_symmetry": True, "diagonal_symmetry": False},
+    cost=(121, 0),
+    parameters={"petals": (5, 12), "layers": (2, 4), "radius_ratios": ((0.4, 0.7), (0.1, 0.25)),
+                "tip_ratio": (0.5, 0.9), "palette": ((0, 359), (15, 90), (50, 90), (50, 70)),
+                "layer_shift": ((0, 60), (-15, 0)), "stroke_width": (2.0, 4.0)}
+)
+register_pattern(
+    'rose', 'kolam.patterns.flower:generate_rose_pattern',
+    clean_animator='kolam.animated_generator:_animate_rose_pattern_clean',
+    category="Flower Patterns",
+    description="Spiral rose patterns with intricate curves",
+    symmetry={"horizontal": False, "vertical": False, "diagonal": False, "radial": True},
+    repetition={"has_repetition": False, "motif_size": 0, "description": "Continuous spiral rose"},
+    attributes={"looped_traversal": False, "grid_repetition": False, "rotational_symmetry": True,
+                "bilateral_symmetry": False, "diagonal_symmetry": False},
+    cost=(360, 0),
+    supports_tolerance=True,
+    parameters={"turns": (2, 6), "petal_step": (10, 30), "radius_ratio": (0.5, 0.9),
+                "petal_ratio": (0.2, 0.4), "palette": ((0, 359), (5.0, 20.0), (60, 90), (50, 70)),
+                "stroke_width": (1.0, 2.5)}
+)
+register_pattern(
+    'star', 'kolam.patterns.star:generate_star_pattern',
+    timeline='kolam.animation:_animate_star_pattern',
+    clean_animator='kolam.animated_generator:_animate_star_pattern_clean',
+    category="Star Patterns",
+    description="Multi-pointed star patterns",
+    symmetry={"horizontal": True, "vertical": True, "diagonal": True, "radial": True},
+    repetition={"has_repetition": True, "motif_size": 2, "description": "Star point repetition"},
+    attributes={"looped_traversal": True, "grid_repetition": True, "rotational_symmetry": True,
+                "bilateral_symmetry": True, "diagonal_symmetry": True},
+    cost=(7, 6),
+    parameters={"points": (5, 16), "outer_ratio": (0.7, 0.95), "inner_ratio": (0.3, 0.7),
+                "tip_ratio": (1.0, 1.2), "stroke_width": (1.0, 3.0), "tip_radius": (2.0, 5.0)}
+)
+register_pattern(
+    'sunburst', 'kolam.patterns.star:generate_sunburst_pattern',
+    clean_animator='kolam.animated_generator:_animate_sunburst_pattern_clean',
+    category="Star Patterns",
+    description="Radiating lines from center",
+    symmetry={"horizontal": True, "vertical": True, "diagonal": True, "radial": True},
+    repetition={"has_repetition": True, "motif_size": 1, "description": "Ray repetition"},
+    attributes={"looped_traversal": False, "grid_repetition": True, "rotational_symmetry": True,
+                "bilateral_symmetry": True, "diagonal_symmetry": True},
+    cost=(1, 7),
+    parameters={"rays": (8, 36), "radius_ratio": (0.6, 0.95),
+                "palette": ((0, 359), (5, 45), (60, 90), (40, 60)), "stroke_width": (1.0, 3.0),
+                "center_radius": (3.0, 10.0)}
+)
+register_pattern(
+    'mandala', 'kolam.patterns.star:generate_mandala_pattern',
+    clean_animator='kolam.animated_generator:_animate_mandala_pattern_clean',
+    category="Star Patterns",
+    description="Concentric circles with geometric shapes",
+    symmetry={"horizontal": True, "vertical": True, "diagonal": True, "radial": True},
+    repetition={"has_repetition": True, "motif_size": 1, "description": "Concentric repetition"},
+    attributes={"looped_traversal": False, "grid_repetition": True, "rotational_symmetry": True,
+                "bilateral_symmetry": True, "diagonal_symmetry": True},
+    cost=(1, 10),
+    parameters={"ring_ratio": (0.5, 1.0), "shape_ratio": (0.4, 0.9), "base_sides": (3, 8),
+                "palette": ((0, 359), (10, 60), (40, 80), (40, 60)),
+                "shape_palette": ((0, 90), (10, 60), (50, 90), (50, 70)), "stroke_width": (0.5, 2.0)}
+)
+register_pattern(
+    'compass', 'kolam.patterns.star:generate_compass_pattern',
+    clean_animator='kolam.animated_generator:_animate_compass_pattern_clean',
+    category="Star Patterns",
+    description="Compass patterns with cardinal directions",
+    symmetry={"horizontal": True, "vertical": True, "diagonal": True, "radial": False},
+    repetition={"has_repetition": True, "motif_size": 4, "description": "Directional repetition"},
+    attributes={"looped_traversal": False, "grid_repetition": True, "rotational_symmetry": False,
+                "bilateral_symmetry": True, "diagonal_symmetry": True},
+    cost=(18, 0)
+)
+register_pattern(
+    'pulli', 'kolam.patterns.pulli:generate_pulli_pattern',
+    timeline='kolam.animation:_animate_pulli_pattern',
+    clean_animator='kolam.animated_generator:_animate_pulli_pattern_clean',
+    category="Traditional Patterns",
+    description="Pulli kolam drawn as one continuous line around the dots",
+    symmetry={"horizontal": True, "vertical": True, "diagonal": True, "radial": False},
+    repetition={"has_repetition": True, "motif_size": 1, "description": "Loop around every dot"},
+    attributes={"looped_traversal": True, "grid_repetition": True, "rotational_symmetry": False,
+                "bilateral_symmetry": True, "diagonal_symmetry": True},
+    cost=(0, 120),
+    max_large_grid_size=301,
+    centre_dots=True
+)
+register_pattern(
+    'sikku', 'kolam.patterns.sikku:generate_sikku_pattern',
+    timeline='kolam.animation:_animate_sikku_pattern',
+    clean_animator='kolam.animated_generator:_animate_sikku_pattern_clean',
+    loops='kolam.patterns.sikku:sikku_loop_count',
+    category="Traditional Patterns",
+    description="Sikku kolam of mirror curves weaving through the dots",
+    symmetry={"horizontal": True, "vertical": True, "diagonal": True, "radial": False},
+    repetition={"has_repetition": True, "motif_size": 2, "description": "Mirror rings around the centre"},
+    attributes={"looped_traversal": True, "grid_repetition": True, "rotational_symmetry": False,
+                "bilateral_symmetry": True, "diagonal_symmetry": True},
+    cost=(0, 100),
+    max_large_grid_size=301,
+    centre_dots=True
+)
@@ -0,0 +1,394 @@
+# kolam/svg.py
+
+import zlib
+from collections import Counter
+from typing import Callable, Dict, Iterable, Iterator, List, Tuple
+from xml.sax.saxutils import escape
+import numpy as np
+from kolam.geometry import (
+    Geometry,
+    OP_MOVE,
+    OP_LINE,
+    OP_CTRL,
+    OP_QUAD,
+    OP_CLOSE,
+    ELEM_PATH,
+    ELEM_LINE,
+    ELEM_CIRCLE,
+    ELEM_TEXT,
+    DOT_RADIUS,
+    DOT_FILL
+)
+
+SVG_NS = "http://www.w3.org/2000/svg"
+SVG_CLOSE = '</svg>'
+
+# How grid dots are written: 'pattern' (one tiled dot) or 'circles' (one per dot)
+DOT_MODES = ('pattern', 'circles')
+DEFAULT_DOT_MODE = 'pattern'
+DOT_PATTERN_ID = 'kolam-dot-grid'
+
+# Characters per chunk when streaming; small elements are batched up to this
+STREAM_CHUNK_SIZE = 16384
+
+# Elements whose numbers are formatted together; bounds the work done
+# before the first element of a large document is yielded
+_ELEMENT_BATCH = 1024
+
+# Decimal places used by the compact output mode; None writes exact coordinates
+COMPACT_PRECISION = 2
+
+# Command letter written before each point, indexed by its op code
+_OP_PREFIXES = np.array(('M', 'L', 'Q', '', 'Z'), dtype=object)
+
+
+def format_number(value) -> str:
+    """Format a coordinate with the shortest round-trip repr, dropping '.0'."""
+    text = repr(float(value))
+    return text[:-2] if text.endswith('.0') else text
+
+
+def format_numbers(values) -> List[str]:
+    """Format a whole array of coordinates at once, like :func:`format_number`."""
+    texts, inverse = _number_table(values)
+    return texts[inverse].tolist()
+
+
+def _number_table(values):
+    """Return the distinct texts of ``values`` as an object array, and each value's index into it."""
+    # Unique on the raw bits keeps -0.0 apart from 0.0, as repr() does
+    values = np.ascontiguousarray(values, dtype=np.float64).ravel()
+    distinct, inverse = np.unique(values.view(np.int64), return_inverse=True)
+    texts = map(repr, distinct.view(np.float64).tolist())
+    texts = [text[:-2] if text.endswith('.0') else text for text in texts]
+    return np.array(texts, dtype=object), inverse.ravel()
+
+
+def format_path_data(points, ops) -> str:
+    """Turn a point/op run into SVG path data."""
+    texts, inverse = _number_table(points)
+    tokens = (_OP_PREFIXES[ops] + texts[inverse[0::2]]) + (',' + texts[inverse[1::2]])
+    tokens[ops == OP_CLOSE] = 'Z'
+    return ' '.join(tokens.tolist())
+
+
+def format_compact(value, precision: int) -> str:
+    """Format a coordinate rounded to ``precision`` places in its shortest form.
+
+    Trailing zeros and the leading zero are dropped: ``0.50`` -> ``.5``,
+    ``-0.25`` -> ``-.25``, ``3.00`` -> ``3``.
+    """
+    text = f"{value:.{precision}f}"
+    if '.' in text:
+        text = text.rstrip('0').rstrip('.')
+    if text.startswith('0.'):
+        text = text[1:]
+    elif text.startswith('-0.'):
+        text = '-' + text[2:]
+    return '0' if text in ('-0', '') else text
+
+
+def _compact_table(values, precision: int):
+    """Return the distinct compact texts of ``values`` and each value's index into them."""
+    values = np.asarray(values, dtype=np.float64).ravel()
+    if precision > 4:
+        # repr() switches to exponent notation below 1e-4
+        return [format_compact(value, precision) for value in values.tolist()], np.arange(len(values))
+    # Kolam coordinates repeat heavily, so each distinct value is formatted
+    # once; adding 0.0 turns -0.0 into 0.0
+    distinct, inverse = np.unique(np.round(values, precision) + 0.0, return_inverse=True)
+    texts = []
+    for text in map(repr, distinct.tolist()):
+        if text.endswith('.0'):
+            text = text[:-2]
+        if text.startswith('0.'):
+            text = text[1:]
+        elif text.startswith('-0.'):
+            text = '-' + text[2:]
+        texts.append(text)
+    return texts, inverse.ravel()
+
+
+def format_compact_numbers(values, precision: int) -> List[str]:
+    """Format a whole array at once, like :func:`format_compact`."""
+    texts, inverse = _compact_table(values, precision)
+    return np.array(texts, dtype=object)[inverse].tolist()
+
+
+# What is written before a number in compact path data, by code: nothing,
+# a separating space, or the letter of the command the number starts
+_PREFIXES = np.array(('', ' ', 'M', 'm', 'l', 'h', 'v', 'q', 'z'), dtype=object)
+_M, _m, _l, _h, _v, _q, _z = range(2, 9)
+# The letter a command may leave out after each letter: a coordinate pair
+# following a move is an implicit line, and nothing repeats M or z
+_REPEATS = np.array((0, 0, 0, _l, _l, _h, _v, _q, 0))
+
+
+def format_compact_path_data(points, ops, precision: int = COMPACT_PRECISION) -> str:
+    """Turn a point/op run into compact SVG path data.
+
+    Coordinates are rounded to ``precision`` places first and every command
+    after the first move is written relative to the current point, so
+    rounding errors never accumulate along the path. Axis-aligned lines
+    become ``h``/``v`` and repeated commands drop their letter. Letters and
+    separators are worked out for the whole run with NumPy, so a single
+    path of a million points formats in well under a second.
+    """
+    ops = np.asarray(ops)
+    if not len(ops):
+        return ''
+    rounded = np.round(points, precision)
+    # Relative commands are measured from the current point: the previous
+    # point, except that both points of a curve are measured from its start
+    reference = np.zeros_like(rounded)
+    reference[1:] = rounded[:-1]
+    curve_ends = np.flatnonzero(ops == OP_QUAD)
+    reference[curve_ends] = rounded[curve_ends - 2]
+    deltas = rounded - reference
+    texts, inverse = _compact_table(deltas, precision)
+    values = np.round(deltas, precision).ravel()
+
+    zero = (values == 0).reshape(-1, 2)
+    lines = ops == OP_LINE
+    across = lines & zero[:, 1] & ~zero[:, 0]
+    upright = lines & zero[:, 0] & ~zero[:, 1]
+    closes = ops == OP_CLOSE
+    letters = np.full(len(ops), _l)
+    letters[ops == OP_MOVE] = _m
+    letters[ops == OP_CTRL] = _q
+    letters[across] = _h
+    letters[upright] = _v
+    letters[closes] = _z
+    if ops[0] == OP_MOVE:
+        letters[0] = _M
+    # A curve's end point continues its command, and a command repeating
+    # the previous one drops its letter
+    commands = np.flatnonzero(ops != OP_QUAD)
+    named = letters[commands]
+    shown = commands[np.concatenate(([True], named[1:] != _REPEATS[named[:-1]]))]
+
+    # h keeps only its x, v only its y; z keeps an empty x to carry its letter
+    kept = np.ones((len(ops), 2), dtype=bool)
+    kept[across, 1] = False
+    kept[upright, 0] = False
+    kept[closes, 1] = False
+    inverse[2 * np.flatnonzero(closes)] = len(texts)
+    texts.append('')
+    kept = np.flatnonzero(kept.ravel())
+
+    # A space is only needed when the next number could be read as part of
+    # the previous one: not before a minus sign, and not before .5 when
+    # the previous number already has a decimal point
+    numbers = values[kept]
+    fraction = numbers != np.floor(numbers)
+    joined = np.zeros(len(kept), dtype=bool)
+    joined[1:] = fraction[:-1] & (numbers[1:] > 0) & (numbers[1:] < 1)
+    prefixes = np.where((numbers < 0) | joined, 0, 1)
+    prefixes[np.searchsorted(kept, 2 * shown + upright[shown])] = letters[shown]
+    texts = np.array(texts, dtype=object)
+    return ''.join((_PREFIXES[prefixes] + texts[inverse[kept]]).tolist())
+
+
+def _style_attrs(style) -> str:
+    return ''.join(f' {name}="{value}"' for name, value in style)
+
+
+# Properties that need a unit inside a style sheet
+_CSS_LENGTHS = ('stroke-width', 'font-size')
+
+
+def _css_rule(name: str, style) -> str:
+    declarations = ';'.join(
+        f"{prop}:{value}px" if prop in _CSS_LENGTHS and value.replace('.', '', 1).isdigit()
+        else f"{prop}:{value}"
+        for prop, value in style
+    )
+    return f".{name}{{{declarations}}}"
+
+
+def style_classes(geometry: Geometry) -> Tuple[str, List[str]]:
+    """Move style attributes shared by several elements into CSS classes.
+
+    Returns the ``<style>`` element (empty when no class pays off) and, per
+    entry of ``geometry.style_table``, the attribute markup to write on its
+    elements: a ``class`` plus whatever is unique to that style. Class
+    names are derived from their content, so documents inlined into the
+    same page never define one name differently.
+    """
+    table = geometry.style_table
+    uses = np.bincount(geometry.styles, minlength=len(table)).tolist()
+    pair_uses = Counter()
+    for style, count in zip(table, uses):
+        for pair in style:
+            pair_uses[pair] += count
+
+    shared = [tuple(pair for pair in style if pair_uses[pair] > 1) for style in table]
+    shared_uses = Counter()
+    for part, count in zip(shared, uses):
+        shared_uses[part] += count
+
+    names: Dict[tuple, str] = {}
+    attrs = []
+    for style, part in zip(table, shared):
+        name = names.get(part)
+        if name is None and part:
+            candidate = f"k{zlib.crc32(repr(part).encode()):08x}"
+            inline = len(_style_attrs(part)) * shared_uses[part]
+            classed = (len(candidate) + 9) * shared_uses[part] + len(_css_rule(candidate, part))
+            if inline > classed:
+                name = names[part] = candidate
+        if name is None:
+            attrs.append(_style_attrs(style))
+        else:
+            attrs.append(f' class="{name}"' + _style_attrs(p for p in style if p not in part))
+    if not names:
+        return '', attrs
+    rules = ''.join(_css_rule(name, part) for part, name in names.items())
+    return f'<style>{rules}</style>\n', attrs
+
+
+def dot_grid_markup(grid_size: int, dot_spacing: float, padding: float,
+                    dot_mode: str = DEFAULT_DOT_MODE) -> str:
+    """Return the markup for a lattice of grid dots.
+
+    ``'pattern'`` defines a single dot in a ``<pattern>`` tile and fills one
+    rectangle with it, so size and DOM node count do not depend on the grid.
+    ``'circles'`` writes one ``<circle>`` per dot.
+    """
+    if grid_size <= 0:
+        return ''
+    if dot_mode == 'pattern':
+        origin = format_number(padding - dot_spacing / 2)
+        half = format_number(dot_spacing / 2)
+        spacing = format_number(dot_spacing)
+        extent = format_number(grid_size * dot_spacing)
+        return (f'<defs><pattern id="{DOT_PATTERN_ID}" x="{origin}" y="{origin}" '
+                f'width="{spacing}" height="{spacing}" patternUnits="userSpaceOnUse">'
+                f'<circle cx="{half}" cy="{half}" r="{DOT_RADIUS}" fill="{DOT_FILL}"/>'
+                f'</pattern></defs>\n'
+                f'<rect class="grid" x="{origin}" y="{origin}" width="{extent}" height="{extent}" '
+                f'fill="url(#{DOT_PATTERN_ID})"/>\n')
+    axis = [format_number(i * dot_spacing + padding) for i in range(grid_size)]
+    return ''.join(f'<circle cx="{cx}" cy="{cy}" r="{DOT_RADIUS}" fill="{DOT_FILL}"/>\n'
+                   for cy in axis for cx in axis)
+
+
+def iter_svg_open(geometry: Geometry, dot_mode: str = DEFAULT_DOT_MODE,
+                  classes: bool = False) -> Iterator[str]:
+    """Yield the opening tag, style sheet, background and grid dots of a document."""
+    yield f'<svg width="{format_number(geometry.width)}" height="{format_number(geometry.height)}" xmlns="{SVG_NS}">\n'
+    if classes:
+        yield style_classes(geometry)[0]
+    if geometry.background:
+        yield f'<rect width="100%" height="100%" fill="{geometry.background}"/>\n'
+    if geometry.grid:
+        yield dot_grid_markup(*geometry.grid, dot_mode=dot_mode)
+
+
+def iter_svg_elements(geometry: Geometry, start: int = 0, stop: int = None,
+                      decorate: Callable[[int], Tuple[str, str]] = None,
+                      precision: int = None, classes: bool = False) -> Iterator[str]:
+    """Yield the markup of elements ``start`` to ``stop`` of ``geometry``.
+
+    ``decorate(index)`` may return ``(extra_attrs, children)`` to add
+    attributes and child elements (e.g. ``<animate>``) to an element.
+    With a ``precision`` coordinates are rounded and paths written in
+    compact relative form (see :func:`format_compact_path_data`). With
+    ``classes`` shared style attributes refer to the rules written by
+    :func:`iter_svg_open`.
+    """
+    if stop is None:
+        stop = len(geometry)
+    if precision is None:
+        numbers, path_data = format_numbers, format_path_data
+    else:
+        def numbers(values):
+            return format_compact_numbers(values, precision)
+
+        def path_data(points, ops):
+            return format_compact_path_data(points, ops, precision)
+    if classes:
+        styles = style_classes(geometry)[1]
+    else:
+        styles = [_style_attrs(style) for style in geometry.style_table]
+    kinds = geometry.kinds.tolist()
+    style_ids = geometry.styles.tolist()
+    offsets = geometry.offsets.tolist()
+    for block in range(start, stop, _ELEMENT_BATCH):
+        block_stop = min(block + _ELEMENT_BATCH, stop)
+        # Lines, circles and text take their numbers from one batch per block
+        base = offsets[block]
+        coords = radii = None
+        if (geometry.kinds[block:block_stop] != ELEM_PATH).any():
+            coords = numbers(geometry.points[base:offsets[block_stop]])
+            radii = numbers(geometry.radii[block:block_stop])
+        for index in range(block, block_stop):
+            kind = kinds[index]
+            attrs = styles[style_ids[index]]
+            first = offsets[index]
+            content = ''
+            if kind == ELEM_PATH:
+                tag = 'path'
+                last = offsets[index + 1]
+                shape = f' d="{path_data(geometry.points[first:last], geometry.ops[first:last])}"'
+            elif kind == ELEM_LINE:
+                tag = 'line'
+                x1, y1, x2, y2 = coords[2 * (first - base):2 * (first - base) + 4]
+                shape = f' x1="{x1}" y1="{y1}" x2="{x2}" y2="{y2}"'
+            elif kind == ELEM_CIRCLE:
+                tag = 'circle'
+                cx, cy = coords[2 * (first - base):2 * (first - base) + 2]
+                shape = f' cx="{cx}" cy="{cy}" r="{radii[index - block]}"'
+            elif kind == ELEM_TEXT:
+                tag = 'text'
+                x, y = coords[2 * (first - base):2 * (first - base) + 2]
+                shape = f' x="{x}" y="{y}"'
+                content = escape(geometry.texts.get(index, ''))
+            else:
+                continue
+
+            if decorate is not None:
+                extra, children = decorate(index)
+                attrs += extra
+                content += children
+            if content:
+                yield f'<{tag}{shape}{attrs}>{content}</{tag}>\n'
+            else:
+                yield f'<{tag}{shape}{attrs}/>\n'
+
+
+def iter_svg(geometry: Geometry, dot_mode: str = DEFAULT_DOT_MODE,
+             precision: int = None, classes: bool = False) -> Iterator[str]:
+    """Yield the SVG document for ``geometry`` one element at a time."""
+    yield from iter_svg_open(geometry, dot_mode, classes)
+    yield from iter_svg_elements(geometry, precision=precision, classes=classes)
+    yield SVG_CLOSE
+
+
+def geometry_to_svg(geometry: Geometry, dot_mode: str = DEFAULT_DOT_MODE,
+                    precision: int = None, classes: bool = False) -> str:
+    """Serialize a geometry into a complete SVG document.
+
+    ``precision=None`` writes exact coordinates; an integer number of
+    decimal places selects the compact encoding. ``classes`` moves shared
+    style attributes into a style sheet (see :func:`style_classes`).
+    """
+    return ''.join(iter_svg(geometry, dot_mode, precision, classes))
+
+
+def iter_chunks(parts: Iterable[str], chunk_size: int = STREAM_CHUNK_SIZE) -> Iterator[str]:
+    """Batch small markup pieces into chunks of about ``chunk_size`` characters.
+
+    Pieces are never split, so a single large path is sent as one chunk.
+    """
+    buffer: List[str] = []
+    size = 0
+    for part in parts:
+        buffer.append(part)
+        size += len(part)
+        if size >= chunk_size:
+            yield ''.join(buffer)
+            buffer = []
+            size = 0
+    if buffer:
+        yield ''.join(buffer)
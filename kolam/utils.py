@@ -1,16 +1,22 @@
 # kolam/utils.py
 
+from kolam.registry import get_pattern, is_registered, pattern_names
+
 def validate_pattern(pattern):
-    """Ensure the pattern is one of the supported types."""
-    valid_patterns = [
-        'basic', 'diamond', 'spiral',
-        'flower', 'lotus', 'rose',
-        'star', 'sunburst', 'mandala', 'compass'
-    ]
-    return pattern if pattern in valid_patterns else 'basic'
+    """Ensure the pattern is one of the registered types."""
+    return pattern if is_registered(pattern) else 'basic'
+
+
+# Largest grid of the interactive UI, and of the opt-in large-grid mode
+# used by wall-art and dataset jobs (see "Large Grids" in the README)
+MAX_GRID_SIZE = 15
+MAX_LARGE_GRID_SIZE = 1001
 
+# Most specs a single /batch_generate request may ask for
+MAX_BATCH_SPECS = 64
 
-def clamp_grid_size(size, min_size=3, max_size=15):
+
+def clamp_grid_size(size, min_size=3, max_size=MAX_GRID_SIZE):
     """Clamp grid size to a reasonable range."""
     try:
         size = int(size)
@@ -19,6 +25,20 @@ def clamp_grid_size(size, min_size=3, max_size=15):
     return max(min(size, max_size), min_size)
 
 
+def clamp_large_grid_size(size):
+    """Clamp grid size to the range of large-grid mode."""
+    return clamp_grid_size(size, max_size=MAX_LARGE_GRID_SIZE)
+
+
+def check_large_grid_size(size, pattern):
+    """Clamp a large-grid size, rejecting grids above the pattern's own limit."""
+    size = clamp_large_grid_size(size)
+    limit = get_pattern(validate_pattern(pattern)).max_large_grid_size
+    if limit is not None and size > limit:
+        raise ValueError(f"Large {validate_pattern(pattern)} grids are limited to {limit}x{limit} dots")
+    return size
+
+
 def generate_grid_coordinates(grid_size):
     """Generate (x, y) coordinates for a square grid."""
     spacing = 40
@@ -32,6 +52,11 @@ def generate_grid_coordinates(grid_size):
     return coords
 
 
+def hsl_colors(indices, hue=0, hue_step=45, saturation=70, lightness=50):
+    """Return one ``hsl()`` color per index, turning the hue ``hue_step`` degrees per step."""
+    return [f"hsl({(hue + i * hue_step) % 360}, {saturation}%, {lightness}%)" for i in indices]
+
+
 def wrap_svg(content, width=400, height=400):
     """Wrap SVG content in a full SVG tag."""
     return f"""<svg width="{width}" height="{height}" xmlns="http://www.w3.org/2000/svg">
@@ -41,28 +66,17 @@ def wrap_svg(content, width=400, height=400):
 
 def get_pattern_categories():
     """Get organized pattern categories."""
-    return {
-        "Basic Patterns": ["basic", "diamond", "spiral"],
-        "Flower Patterns": ["flower", "lotus", "rose"],
-        "Star Patterns": ["star", "sunburst", "mandala", "compass"]
-    }
+    categories = {}
+    for name in pattern_names():
+        categories.setdefault(get_pattern(name).category, []).append(name)
+    return categories
 
 
 def get_pattern_description(pattern):
     """Get description for a pattern type."""
-    descriptions = {
-        "basic": "Nested squares with geometric symmetry",
-        "diamond": "Diamond shapes with diagonal connections",
-        "spiral": "Spiral patterns with continuous curves",
-        "flower": "Flower patterns with petal arrangements",
-        "lotus": "Layered lotus patterns with multiple petals",
-        "rose": "Spiral rose patterns with intricate curves",
-        "star": "Multi-pointed star patterns",
-        "sunburst": "Radiating lines from center",
-        "mandala": "Concentric circles with geometric shapes",
-        "compass": "Compass patterns with cardinal directions"
-    }
-    return descriptions.get(pattern, "Traditional Kolam pattern")
+    if not is_registered(pattern):
+        return "Traditional Kolam pattern"
+    return get_pattern(pattern).description
 
 
 def get_symmetry_explanation(symmetry_type):
@@ -0,0 +1,87 @@
+# kolam/variation.py
+
+from typing import Any, Dict
+import numpy as np
+from kolam.utils import validate_pattern, clamp_grid_size
+from kolam.svg import geometry_to_svg, DEFAULT_DOT_MODE
+from kolam.generator import _build_kolam_geometry
+from kolam.registry import get_pattern
+
+# Decimals kept on drawn float parameters, so variants print short numbers
+# and nearby seeds share memoized shapes
+PARAMETER_DECIMALS = 2
+
+
+def _is_range(bounds) -> bool:
+    return len(bounds) == 2 and not isinstance(bounds[0], (tuple, list))
+
+
+def _draw(rng: np.random.Generator, bounds):
+    """Draw one value (or a tuple of values) from a parameter range."""
+    if not _is_range(bounds):
+        return tuple(_draw(rng, inner) for inner in bounds)
+    low, high = bounds
+    if isinstance(low, int) and isinstance(high, int):
+        return int(rng.integers(low, high + 1))
+    return round(float(rng.uniform(low, high)), PARAMETER_DECIMALS)
+
+
+def _clamp(value, bounds):
+    """Clamp a value given by the caller into its parameter range."""
+    if not _is_range(bounds):
+        if not isinstance(value, (tuple, list)) or len(value) != len(bounds):
+            raise ValueError(f"Expected {len(bounds)} values, got {value!r}")
+        return tuple(_clamp(item, inner) for item, inner in zip(value, bounds))
+    low, high = bounds
+    if isinstance(low, int) and isinstance(high, int):
+        return int(min(max(int(value), low), high))
+    return float(min(max(float(value), low), high))
+
+
+def variant_parameters(pattern: str, seed=None, **params) -> Dict[str, Any]:
+    """Return the generator parameters of one variant of ``pattern``.
+
+    With a ``seed`` every parameter the pattern registers is drawn from its
+    range, in registration order, so the same seed always gives the same
+    variant. ``params`` override drawn values and are clamped to their
+    ranges. Patterns without parameters have no variants and return ``{}``.
+    """
+    spec = get_pattern(validate_pattern(pattern))
+    unknown = set(params) - set(spec.parameters)
+    if unknown:
+        raise ValueError(f"Unknown {spec.name} parameter(s): {', '.join(sorted(unknown))}")
+
+    values = {}
+    if seed is not None:
+        rng = np.random.default_rng(seed)
+        values = {name: _draw(rng, bounds) for name, bounds in spec.parameters.items()}
+    values.update((name, _clamp(value, spec.parameters[name])) for name, value in params.items())
+    return values
+
+
+def _build_variant(grid_size, pattern, seed, show_grid, params):
+    values = variant_parameters(pattern, seed, **params)
+    geometry = _build_kolam_geometry(validate_pattern(pattern), clamp_grid_size(grid_size),
+                                     bool(show_grid), **values)
+    return geometry, values
+
+
+def build_variant_geometry(grid_size=7, pattern='flower', seed=None, show_grid=True, **params):
+    """Build the geometry of a variant, see :func:`variant_parameters`.
+
+    Variants are not kept in the render caches, which are sized for the
+    default patterns; the unit shapes they place are memoized instead
+    (see ``kolam.geometry.memoized_shape``).
+    """
+    return _build_variant(grid_size, pattern, seed, show_grid, params)[0]
+
+
+def generate_variant(grid_size=7, pattern='flower', seed=None, show_grid=True,
+                     dot_mode=DEFAULT_DOT_MODE, precision=None, **params):
+    """Generate the SVG of a pattern variant.
+
+    Returns ``(svg, parameters)``, where ``parameters`` are the values the
+    generator was called with.
+    """
+    geometry, values = _build_variant(grid_size, pattern, seed, show_grid, params)
+    return geometry_to_svg(geometry, dot_mode, precision), values
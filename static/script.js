@@ -232,13 +232,14 @@ function generateAnimation() {
         },
         body: JSON.stringify({
             pattern: pattern,
-            grid_size: parseInt(gridSize),
-            frame_count: 30
+            grid_size: parseInt(gridSize)
         })
     })
     .then(response => response.json())
     .then(data => {
-        animationFrames = data.frames;
+        // Frames for the player are fetched the first time it plays
+        animationFrames = [];
+        currentFrame = 0;
         animationDisplay.innerHTML = data.animated_svg;
         
         // Enable animation controls
@@ -255,8 +256,47 @@ function generateAnimation() {
     });
 }
 
+function expandAnimationFrames(animation) {
+    // Frames arrive delta-encoded: each one only adds markup to the previous
+    const frames = [];
+    let body = '';
+    animation.deltas.forEach(delta => {
+        body += delta;
+        frames.push(animation.base + body + animation.end);
+    });
+    return frames;
+}
+
+function loadAnimationFrames() {
+    const pattern = document.getElementById('pattern').value;
+    const gridSize = document.getElementById('grid-size').value;
+    
+    return fetch('/animate', {
+        method: 'POST',
+        headers: {
+            'Content-Type': 'application/json',
+        },
+        body: JSON.stringify({
+            pattern: pattern,
+            grid_size: parseInt(gridSize),
+            frame_count: 30,
+            mode: 'frames',
+            delta: true
+        })
+    })
+    .then(response => response.json())
+    .then(data => {
+        animationFrames = expandAnimationFrames(data.animation);
+    });
+}
+
 function playAnimation() {
-    if (animationFrames.length === 0) return;
+    if (animationFrames.length === 0) {
+        loadAnimationFrames().then(() => {
+            if (animationFrames.length > 0) playAnimation();
+        });
+        return;
+    }
     
     isAnimating = true;
     document.getElementById('play-btn').disabled = true;
@@ -315,6 +355,9 @@ function exportPattern(formatType) {
     const gridSize = document.getElementById('grid-size').value;
     const pattern = document.getElementById('pattern').value;
     
+    // Single formats come back as the file itself, in one request
+    const download = formatType !== 'all';
+
     // Send the clean SVG to the backend
     fetch('/export', {
         method: 'POST',
@@ -324,15 +367,25 @@ function exportPattern(formatType) {
             format: formatType,
             filename: 'kolam',
             grid_size: parseInt(gridSize),
-            pattern: pattern
+            pattern: pattern,
+            download: download
         })
     })
-    .then(res => res.json())
+    .then(res => {
+        const contentType = res.headers.get('Content-Type') || '';
+        if (download && res.ok && !contentType.startsWith('application/json')) {
+            return res.blob().then(blob => {
+                saveBlob(blob, `kolam.${formatType}`);
+                return { success: true };
+            });
+        }
+        return res.json();
+    })
     .then(data => {
         if (data.success) {
             if (formatType === 'all' && data.files) {
                 data.files.forEach(file => downloadFile(file));
-            } else {
+            } else if (data.filepath) {
                 downloadFile(data.filepath);
             }
         } else {
@@ -348,6 +401,18 @@ function exportAllFormats() {
     exportPattern('all');
 }
 
+function saveBlob(blob, filename) {
+    const url = URL.createObjectURL(blob);
+    const link = document.createElement('a');
+    link.href = url;
+    link.download = filename;
+    document.body.appendChild(link);
+    link.click();
+    link.remove();
+    // Let the download start before the URL goes away
+    setTimeout(() => URL.revokeObjectURL(url), 0);
+}
+
 function downloadFile(filepath) {
     const filename = filepath.split('/').pop();
     window.open(`/download/${filename}`, '_blank');
@@ -534,7 +599,7 @@ function batchExport() {
     const gridSize = document.getElementById('grid-size').value;
     
     // Generate multiple patterns
-    const patternTypes = ['basic', 'diamond', 'spiral', 'flower', 'lotus', 'rose', 'star', 'sunburst', 'mandala', 'compass'];
+    const patternTypes = ['basic', 'diamond', 'spiral', 'flower', 'lotus', 'rose', 'star', 'sunburst', 'mandala', 'compass', 'pulli', 'sikku'];
     
     showLoadingMessage('Generating patterns for batch export...');
     
@@ -50,6 +50,328 @@ def test_pattern_generation():
         print(f"❌ Pattern generation error: {e}")
         return False
 
+def test_render_cache():
+    """Test that repeated renders are served from the cache."""
+    try:
+        from kolam.generator import generate_kolam, clear_render_cache, get_render_cache_stats
+        
+        clear_render_cache()
+        first = generate_kolam(grid_size=7, pattern='rose')
+        second = generate_kolam(grid_size='7', pattern='rose')
+        assert first is second, "Equivalent requests should share one cached SVG"
+        
+        stats = get_render_cache_stats()['svg']
+        assert stats['hits'] == 1 and stats['misses'] == 1
+        print("✅ Render cache hits on repeated requests")
+        
+        return True
+    except Exception as e:
+        print(f"❌ Render cache error: {e}")
+        return False
+
+def test_animation_deltas():
+    """Test that animation frames are delta-encoded and rebuild correctly."""
+    try:
+        from kolam.animation import generate_animation_deltas, generate_animation_frames, animation_frame
+        
+        animation = generate_animation_deltas('', 9, 'flower', 30)
+        frames = generate_animation_frames('', 9, 'flower', 30)
+        assert len(animation['deltas']) == len(frames) == 30
+        assert 'fill="url(#kolam-dot-grid)"' in animation['base']
+        assert all('fill="#333"' not in delta for delta in animation['deltas'])
+        assert animation_frame(animation, 29) == frames[-1]
+        print("✅ Delta-encoded animation frames work")
+        
+        from app import app
+        with app.test_client() as client:
+            stroke = client.post('/animate', json={'pattern': 'flower', 'grid_size': 9}).get_json()
+            assert list(stroke) == ['animated_svg']
+            body = {'pattern': 'flower', 'grid_size': 9, 'mode': 'frames'}
+            full = client.post('/animate', json=body).get_json()
+            assert len(full['frames']) == 30 and 'animation' not in full
+            delta = client.post('/animate', json=dict(body, delta=True)).get_json()
+            assert len(delta['animation']['deltas']) == 30 and 'frames' not in delta
+            assert animation_frame(delta['animation'], 29) == full['frames'][-1]
+        print("✅ /animate keeps full frames and sends deltas on request")
+        
+        return True
+    except Exception as e:
+        print(f"❌ Animation delta error: {e}")
+        return False
+
+def test_stroke_animation():
+    """Test the declarative stroke-drawing animation mode."""
+    try:
+        from kolam.animation import generate_stroke_animation
+        from kolam.generator import generate_kolam
+        
+        animated = generate_stroke_animation(9, 'lotus')
+        assert '<script' not in animated
+        assert animated.count('attributeName="stroke-dashoffset"') == 24
+        # The pattern is emitted once, so the size stays close to the static SVG
+        assert len(animated) < 2 * len(generate_kolam(9, 'lotus'))
+        # Each stroke keeps its own element and start time when optimized
+        optimized = generate_stroke_animation(9, 'lotus', optimize=True)
+        assert optimized.count('<path') == optimized.count('attributeName="stroke-dashoffset"') == 24
+        print("✅ Stroke animation mode works")
+        
+        return True
+    except Exception as e:
+        print(f"❌ Stroke animation error: {e}")
+        return False
+
+def test_small_grids():
+    """Test that tiny and negative grid sizes are clamped like /generate."""
+    try:
+        from app import app
+        from kolam.animated_generator import generate_clean_animation_frames
+        from kolam.patterns.pulli import generate_pulli_pattern
+        
+        with app.test_client() as client:
+            for pattern in ('pulli', 'sikku'):
+                for grid_size in (0, 1, -3):
+                    for mode in ('stroke', 'frames'):
+                        response = client.post('/animate', json={
+                            'pattern': pattern, 'grid_size': grid_size, 'mode': mode})
+                        assert response.status_code == 200
+                    assert len(generate_clean_animation_frames(grid_size, pattern, 5)) == 5
+        print("✅ Animations clamp grid sizes 0 and 1")
+        
+        # The generator itself draws a single dot as one loop around it
+        assert len(generate_pulli_pattern(1, 40, 20).kinds) == 1
+        assert len(generate_pulli_pattern(0, 40, 20).kinds) == 0
+        print("✅ A one-dot pulli kolam is a single loop")
+        
+        return True
+    except Exception as e:
+        print(f"❌ Small grid error: {e}")
+        return False
+
+def test_streaming():
+    """Test chunked SVG streaming from the generator and the routes."""
+    try:
+        from app import app
+        from kolam.generator import iter_kolam, generate_kolam
+        
+        chunks = list(iter_kolam(15, 'rose', chunk_size=4096))
+        assert len(chunks) > 1
+        assert ''.join(chunks) == generate_kolam(15, 'rose')
+        print("✅ SVG is written in chunks")
+        
+        with app.test_client() as client:
+            response = client.get('/generate?grid_size=9&pattern=spiral&stream=true')
+            assert response.is_streamed and response.mimetype == 'image/svg+xml'
+            assert response.get_data(as_text=True).endswith('</svg>')
+            response = client.post('/export', json={'pattern': 'star', 'grid_size': 9,
+                                                    'format': 'svg', 'filename': 'kolam',
+                                                    'stream': True})
+            assert response.is_streamed
+            assert 'attachment' in response.headers['Content-Disposition']
+            assert response.get_data(as_text=True).startswith('<svg')
+            response = client.post('/export', json={'pattern': 'star', 'grid_size': 9,
+                                                    'format': 'svg', 'stream': True,
+                                                    'filename': 'kol"am\r\nX-Injected: 1'})
+            assert response.status_code == 200 and 'X-Injected' not in response.headers
+            assert response.headers['Content-Disposition'] == 'attachment; filename=kolam_X-Injected_1.svg'
+        print("✅ /generate and /export stream SVG")
+        
+        return True
+    except Exception as e:
+        print(f"❌ Streaming error: {e}")
+        return False
+
+def test_export_download():
+    """Test /export sending the rendered file back in one response."""
+    try:
+        import os
+        from io import BytesIO
+        from PIL import Image
+        from app import app
+        
+        before = set(os.listdir('exports'))
+        with app.test_client() as client:
+            for format_type, mimetype in (('svg', 'image/svg+xml'), ('png', 'image/png'),
+                                          ('jpg', 'image/jpeg')):
+                response = client.post('/export', json={'pattern': 'rose', 'grid_size': 7,
+                                                        'format': format_type,
+                                                        'filename': 'kolam', 'download': True})
+                assert response.status_code == 200 and response.mimetype == mimetype
+                assert response.headers['Content-Disposition'] == \
+                    f'attachment; filename=kolam.{format_type}'
+                body = response.get_data()
+                assert int(response.headers['Content-Length']) == len(body)
+                if format_type == 'svg':
+                    assert body.startswith(b'<svg')
+                else:
+                    with Image.open(BytesIO(body)) as image:
+                        assert image.size == (320, 320)
+            # The download name is sanitised like the streamed one
+            response = client.post('/export', json={'pattern': 'rose', 'format': 'svg',
+                                                    'filename': '../evil"\r\nname',
+                                                    'download': True})
+            assert response.headers['Content-Disposition'] == 'attachment; filename=evil_name.svg'
+            response = client.post('/export', json={'pattern': 'rose', 'format': 'png',
+                                                    'download': True, 'dpi': 192})
+            with Image.open(BytesIO(response.get_data())) as image:
+                assert image.size == (640, 640)
+        assert set(os.listdir('exports')) == before
+        print("✅ /export downloads SVG, PNG and JPG without touching exports/")
+        
+        return True
+    except Exception as e:
+        print(f"❌ Export download error: {e}")
+        return False
+
+def test_large_grid():
+    """Test large-grid mode beyond the interactive grid limit."""
+    try:
+        from app import app
+        from kolam.generator import iter_kolam
+        from kolam.utils import (clamp_grid_size, clamp_large_grid_size, check_large_grid_size,
+                                 MAX_LARGE_GRID_SIZE)
+        
+        assert clamp_grid_size(500) == 15
+        assert clamp_large_grid_size(5000) == MAX_LARGE_GRID_SIZE
+        assert check_large_grid_size(301, 'sikku') == 301
+        try:
+            check_large_grid_size(302, 'sikku')
+            raise AssertionError("sikku was drawn above its large-grid limit")
+        except ValueError:
+            pass
+        
+        small = ''.join(iter_kolam(101, 'basic', large=True))
+        large = ''.join(iter_kolam(1001, 'basic', large=True))
+        assert 'width="40080"' in large and large.endswith('</svg>')
+        # Dots are one tiled pattern whatever the grid size
+        assert large.count('<circle') == small.count('<circle') == 1
+        print("✅ 1001x1001 grid streams with a constant-size dot grid")
+        
+        with app.test_client() as client:
+            response = client.get('/generate?grid_size=301&pattern=diamond&large=true')
+            assert response.is_streamed
+            assert 'width="12080"' in response.get_data(as_text=True)
+            for pattern in ('sikku', 'pulli'):
+                response = client.get(f'/generate?grid_size=1001&pattern={pattern}&large=true')
+                assert response.status_code == 400 and not response.get_json()['success']
+        print("✅ /generate serves large grids")
+        
+        return True
+    except Exception as e:
+        print(f"❌ Large grid error: {e}")
+        return False
+
+def test_batch_generation():
+    """Test batch generation across a process pool."""
+    try:
+        import json
+        from app import app
+        from kolam.generator import generate_many, generate_kolam
+        from kolam.utils import MAX_BATCH_SPECS
+        
+        specs = [{'pattern': 'star', 'grid_size': 9}, {'pattern': 'rose'},
+                 {'pattern': 'star', 'grid_size': 9}, {'pattern': 'mandala', 'grid_size': 40}]
+        results = list(generate_many(specs, workers=2))
+        assert results == [generate_kolam(9, 'star'), generate_kolam(7, 'rose'),
+                           generate_kolam(9, 'star'), generate_kolam(15, 'mandala')]
+        assert results == list(generate_many(specs, workers=1))
+        for workers in (0, -2, 1.5):
+            try:
+                list(generate_many(specs, workers=workers))
+                raise AssertionError(f"workers={workers!r} was accepted")
+            except ValueError as e:
+                assert 'workers must be a positive integer' in str(e)
+        print("✅ generate_many keeps spec order across workers")
+        
+        with app.test_client() as client:
+            response = client.post('/batch_generate', json={'specs': specs})
+            assert response.is_streamed
+            rows = [json.loads(line) for line in response.get_data(as_text=True).splitlines()]
+            assert [row['index'] for row in rows] == [0, 1, 2, 3]
+            assert [row['svg'] for row in rows] == results
+            response = client.post('/batch_generate', json={'specs': [{'colour': 'red'}]})
+            assert response.status_code == 400
+            response = client.post('/batch_generate', json={'specs': [{}] * (MAX_BATCH_SPECS + 1)})
+            assert response.status_code == 400
+            response = client.post('/batch_generate', json={'specs': [{'grid_size': 501, 'large': True}]})
+            assert response.status_code == 400
+            # Requests reuse one module-level worker pool
+            from kolam import generator
+            pools = []
+            for spec in ({'pattern': 'lotus', 'grid_size': 11}, {'pattern': 'spiral', 'grid_size': 13}):
+                response = client.post('/batch_generate', json={'specs': [spec, spec]})
+                assert len(response.get_data(as_text=True).splitlines()) == 2
+                pools.append(generator._batch_pool)
+            assert pools[0] is not None and pools[0] is pools[1]
+        print("✅ /batch_generate streams results as JSON lines")
+        
+        return True
+    except Exception as e:
+        print(f"❌ Batch generation error: {e}")
+        return False
+
+def test_fingerprints():
+    """Test geometry fingerprints and the exports and shares keyed by them."""
+    try:
+        import tempfile
+        from app import app
+        from kolam import exporter
+        from kolam.generator import (kolam_fingerprint, generate_kolam,
+                                     generate_kolam_with_analysis, build_kolam_geometry)
+        from kolam.geometry import Geometry
+        from kolam.fingerprint import geometry_fingerprint
+        
+        assert kolam_fingerprint(9, 'star') == kolam_fingerprint('9', 'star')
+        assert kolam_fingerprint(9, 'star') != kolam_fingerprint(9, 'star', show_grid=False)
+        assert generate_kolam_with_analysis(9, 'star')['fingerprint'] == kolam_fingerprint(9, 'star')
+        # A mirrored spiral differs, but not up to the symmetries of the grid
+        spiral = build_kolam_geometry(9, 'spiral')
+        points = spiral.points.copy()
+        points[:, 0] = spiral.width - points[:, 0]
+        mirrored = Geometry(points, spiral.ops, spiral.kinds, spiral.offsets, spiral.styles,
+                            spiral.radii, spiral.style_table, spiral.texts, spiral.width,
+                            spiral.height, spiral.background, spiral.grid)
+        assert geometry_fingerprint(mirrored) != geometry_fingerprint(spiral)
+        assert geometry_fingerprint(mirrored, symmetric=True) == geometry_fingerprint(spiral, symmetric=True)
+        print("✅ Renders have a stable fingerprint")
+        
+        with tempfile.TemporaryDirectory() as output_dir:
+            share_dir, exporter.SHARE_DIR = exporter.SHARE_DIR, os.path.join(output_dir, 'shared')
+            try:
+                svg = generate_kolam(5, 'basic')
+                first = exporter.export_pattern_with_metadata(svg, {}, 'kolam', output_dir)
+                second = exporter.export_pattern_with_metadata(svg.replace('\n', '\n\n'), {}, 'kolam', output_dir)
+                assert first['png'] == second['png']
+                assert len([name for name in os.listdir(output_dir) if name.endswith('.png')]) == 2
+                # With a geometry the drawing is named after its geometry fingerprint
+                geometry = build_kolam_geometry(5, 'basic')
+                metadata = {'analysis': generate_kolam_with_analysis(5, 'basic')['analysis']}
+                third = exporter.export_pattern_with_metadata(svg, metadata, 'kolam',
+                                                              output_dir, geometry=geometry)
+                assert third['png'] == f"kolam_{geometry_fingerprint(geometry)[:16]}.png"
+                print("✅ Exports of the same drawing are deduplicated")
+                
+                link = exporter.create_shareable_link({'svg': svg})
+                assert link == exporter.create_shareable_link({'svg': svg, 'analysis': None})
+                analysed = exporter.create_shareable_link({'svg': svg, 'analysis': {'loops': 1}})
+                assert analysed != link
+                assert exporter.load_shared_pattern(analysed.rsplit('/', 1)[1])['analysis'] == {'loops': 1}
+                assert exporter.create_shareable_link({'svg': svg}, geometry=geometry) != link
+                # The QR code of a full export holds a link the app resolves
+                shared = exporter.load_shared_pattern(third['shareable_link'].rsplit('/', 1)[1])
+                assert shared['metadata'] == metadata
+                with app.test_client() as client:
+                    for url in (link, third['shareable_link']):
+                        response = client.get(url.replace('http://localhost:5000', ''))
+                        assert response.status_code == 200
+            finally:
+                exporter.SHARE_DIR = share_dir
+            print("✅ Shared links point to one stored copy")
+        
+        return True
+    except Exception as e:
+        print(f"❌ Fingerprint error: {e}")
+        return False
+
 def test_analysis():
     """Test pattern analysis functionality."""
     try:
@@ -88,6 +410,13 @@ def test_utils():
         assert len(description) > 0
         print("✅ Pattern descriptions work")
         
+        # Radial symmetry and the rotational symmetry attribute say the same thing
+        from kolam.registry import get_pattern, pattern_names
+        for name in pattern_names():
+            spec = get_pattern(name)
+            assert spec.attributes['rotational_symmetry'] == spec.symmetry['radial'], name
+        print("✅ Pattern symmetry and attributes agree")
+        
         return True
     except Exception as e:
         print(f"❌ Utils error: {e}")
@@ -121,6 +450,15 @@ def main():
     tests = [
         ("Import Tests", test_imports),
         ("Pattern Generation", test_pattern_generation),
+        ("Render Cache", test_render_cache),
+        ("Animation Deltas", test_animation_deltas),
+        ("Stroke Animation", test_stroke_animation),
+        ("Small Grids", test_small_grids),
+        ("Streaming", test_streaming),
+        ("Export Download", test_export_download),
+        ("Large Grids", test_large_grid),
+        ("Batch Generation", test_batch_generation),
+        ("Fingerprints", test_fingerprints),
         ("Analysis", test_analysis),
         ("Utils", test_utils),
         ("Flask App", test_flask_app)
@@ -60,6 +60,13 @@ def test_animated_generation():
         assert '</svg>' in animated_svg
         print("✅ Animated generation works")
         
+        # The direct final-frame path must match the last full frame
+        from kolam.animated_generator import generate_clean_animation_frames, generate_final_frame
+        for pattern in ['basic', 'lotus', 'rose', 'compass']:
+            frames = generate_clean_animation_frames(7, pattern)
+            assert generate_final_frame(7, pattern) == frames[-1]
+        print("✅ Final frame matches full frame sequence")
+        
         return True
         
     except Exception as e:
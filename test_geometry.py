@@ -0,0 +1,668 @@
+#!/usr/bin/env python3
+"""
+Test script to verify the geometry IR and its SVG serializer.
+"""
+
+import sys
+import os
+
+# Add the current directory to Python path
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+PATTERNS = ['basic', 'diamond', 'spiral', 'flower', 'lotus',
+            'rose', 'star', 'sunburst', 'mandala', 'compass', 'pulli', 'sikku']
+
+def test_geometry_build():
+    """Test that every pattern builds a geometry with consistent arrays."""
+    try:
+        import numpy as np
+        from kolam.generator import build_kolam_geometry
+        from kolam.geometry import flatten_quadratics, OP_CTRL
+        from kolam.registry import get_pattern
+        
+        for pattern in PATTERNS:
+            geometry = build_kolam_geometry(grid_size=7, pattern=pattern)
+            assert len(geometry) > 0, f"{pattern} produced no elements"
+            assert geometry.offsets[-1] == len(geometry.points)
+            assert len(geometry.ops) == len(geometry.points)
+            assert geometry.grid == (7, 40, get_pattern(pattern).lattice_padding(40, 20))
+        print("✅ All patterns build consistent geometry")
+        
+        # Strokes traced around the dots sit in the middle of the canvas
+        for pattern in ('pulli', 'sikku'):
+            geometry = build_kolam_geometry(grid_size=7, pattern=pattern)
+            controls = np.flatnonzero(geometry.ops == OP_CTRL)
+            curves = flatten_quadratics(geometry.points[controls - 1], geometry.points[controls],
+                                        geometry.points[controls + 1]).reshape(-1, 2)
+            low, high = curves.min(axis=0), curves.max(axis=0)
+            assert np.allclose(low, geometry.width - high) and (low > 0).all()
+        print("✅ Lattice patterns are centred and fully on the canvas")
+        
+        # Geometry arrays are shared, so they must be read-only
+        geometry = build_kolam_geometry(grid_size=5, pattern='basic')
+        assert not geometry.points.flags.writeable
+        print("✅ Geometry arrays are read-only")
+        
+        return True
+    except Exception as e:
+        print(f"❌ Geometry build error: {e}")
+        return False
+
+def test_svg_serialization():
+    """Test that the serializer writes grid dots and pattern elements."""
+    try:
+        from kolam.generator import build_kolam_geometry
+        from kolam.svg import geometry_to_svg
+        
+        geometry = build_kolam_geometry(grid_size=5, pattern='basic')
+        svg = geometry_to_svg(geometry, dot_mode='circles')
+        assert svg.startswith('<svg width="240" height="240"')
+        assert svg.count('fill="#333"') == 25
+        assert svg.count('<path') == len(geometry)
+        print("✅ SVG serialization works")
+        
+        # The default dot pattern does not grow with the grid
+        small = geometry_to_svg(build_kolam_geometry(grid_size=5, pattern='diamond'))
+        large = geometry_to_svg(build_kolam_geometry(grid_size=25, pattern='diamond'))
+        assert small.count('fill="#333"') == large.count('fill="#333"') == 1
+        assert 'fill="url(#kolam-dot-grid)"' in large
+        print("✅ Grid dots are written as one pattern")
+        
+        svg = geometry_to_svg(build_kolam_geometry(grid_size=5, pattern='compass'))
+        assert '>North</text>' in svg
+        print("✅ Text elements are serialized")
+        
+        return True
+    except Exception as e:
+        print(f"❌ Serialization error: {e}")
+        return False
+
+def test_compact_encoding():
+    """Test the rounded, relative path encoding."""
+    try:
+        import numpy as np
+        import tempfile
+        from PIL import Image, ImageChops
+        from kolam.generator import build_kolam_geometry
+        from kolam.svg import geometry_to_svg, format_compact, format_compact_path_data
+        from kolam.exporter import convert_svg_to_png
+        
+        assert [format_compact(v, 2) for v in (0.5, -0.25, 3.0, 139.99999999999997)] == ['.5', '-.25', '3', '140']
+        points = np.array([(0, 0), (10, 0), (10, 10), (0, 0), (20.5, 20.25), (25, 30), (30, 20.5)])
+        ops = np.array([0, 1, 1, 4, 0, 2, 3])
+        assert format_compact_path_data(points, ops, 2) == 'M0 0h10v10zm20.5 20.25q4.5 9.75 9.5.25'
+        print("✅ Paths use relative, shortest-form commands")
+        
+        geometry = build_kolam_geometry(grid_size=15, pattern='spiral', show_grid=False)
+        exact = geometry_to_svg(geometry)
+        compact = geometry_to_svg(geometry, precision=2)
+        assert len(compact) * 2.5 < len(exact)
+        print(f"✅ Spiral SVG shrinks from {len(exact)} to {len(compact)} bytes")
+        
+        # The exporter reads the compact form back to the same picture
+        geometry = build_kolam_geometry(grid_size=7, pattern='star', show_grid=False)
+        with tempfile.TemporaryDirectory() as folder:
+            convert_svg_to_png(geometry_to_svg(geometry), 'exact.png', folder)
+            convert_svg_to_png(geometry_to_svg(geometry, precision=2), 'compact.png', folder)
+            with Image.open(os.path.join(folder, 'exact.png')) as a, \
+                 Image.open(os.path.join(folder, 'compact.png')) as b:
+                assert ImageChops.difference(a, b).getbbox() is None
+        print("✅ Compact paths render identically")
+        
+        return True
+    except Exception as e:
+        print(f"❌ Compact encoding error: {e}")
+        return False
+
+def test_merged_styles():
+    """Test merging same-style strokes and sharing styles through classes."""
+    try:
+        import tempfile
+        import xml.etree.ElementTree as ET
+        from PIL import Image, ImageChops
+        from kolam.generator import build_kolam_geometry
+        from kolam.geometry import merge_elements, element_lengths
+        from kolam.svg import geometry_to_svg
+        from kolam.exporter import convert_svg_to_png
+        
+        geometry = build_kolam_geometry(grid_size=15, pattern='flower', show_grid=False)
+        merged = merge_elements(geometry)
+        assert len(merged) == 8 and len(geometry) == 16
+        assert abs(element_lengths(merged).sum() - element_lengths(geometry).sum()) < 1e-6
+        print("✅ Same-style petal curves merge into one path each")
+        
+        geometry = build_kolam_geometry(grid_size=7, pattern='lotus', show_grid=False)
+        plain = geometry_to_svg(geometry)
+        classed = geometry_to_svg(merge_elements(geometry), classes=True)
+        assert '<style>' in classed and 'stroke-linejoin="round"' not in classed
+        assert len(classed) < len(plain)
+        ET.fromstring(classed)
+        print("✅ Shared styles move into classes")
+        
+        with tempfile.TemporaryDirectory() as folder:
+            convert_svg_to_png(plain, 'plain.png', folder)
+            convert_svg_to_png(classed, 'classed.png', folder)
+            with Image.open(os.path.join(folder, 'plain.png')) as a, \
+                 Image.open(os.path.join(folder, 'classed.png')) as b:
+                assert ImageChops.difference(a, b).getbbox() is None
+        print("✅ Class styles render identically")
+        
+        return True
+    except Exception as e:
+        print(f"❌ Merged styles error: {e}")
+        return False
+
+def test_level_of_detail():
+    """Test that curve sampling follows the LOD tolerance."""
+    try:
+        from kolam.generator import build_kolam_geometry
+        from kolam.lod import quadratic_steps
+        
+        full = build_kolam_geometry(grid_size=15, pattern='spiral')
+        assert len(full.points) == 145, "Default sampling must stay at 5 degrees"
+        
+        preview = build_kolam_geometry(grid_size=15, pattern='spiral', tolerance=2.0)
+        fine = build_kolam_geometry(grid_size=15, pattern='spiral', tolerance=0.05)
+        assert len(preview.points) < len(full.points) < len(fine.points)
+        print("✅ Spiral sampling adapts to tolerance")
+        
+        # A straight "curve" needs one segment, a sharp one many
+        steps = quadratic_steps([(0, 0), (0, 0)], [(5, 0), (50, 200)], [(10, 0), (100, 0)], 0.25)
+        assert steps[0] == 1 and steps[1] > 10
+        print("✅ Curve flattening steps follow curvature")
+        
+        return True
+    except Exception as e:
+        print(f"❌ Level of detail error: {e}")
+        return False
+
+def test_pattern_registry():
+    """Test that every pattern is dispatched through the registry."""
+    try:
+        from kolam.registry import pattern_names, register_pattern
+        from kolam.utils import validate_pattern
+        from kolam.analyzer import analyze_symmetry_from_pattern
+        from kolam.animation import generate_animation_deltas
+        
+        assert pattern_names() == PATTERNS
+        assert validate_pattern('unknown') == 'basic'
+        assert analyze_symmetry_from_pattern('mandala', 7)["radial"] is True
+        print("✅ Registry lists every pattern with its metadata")
+        
+        # Patterns without a dedicated timeline still animate themselves
+        lotus = generate_animation_deltas('', 7, 'lotus', 10)
+        basic = generate_animation_deltas('', 7, 'basic', 10)
+        assert lotus['deltas'][-1] and lotus['deltas'] != basic['deltas']
+        print("✅ Every pattern can be animated")
+        
+        # A new pattern plugs in with a single registration
+        spec = register_pattern('custom', 'kolam.patterns.basic:generate_basic_pattern',
+                                clean_animator='kolam.animated_generator:_animate_basic_pattern_clean')
+        try:
+            assert validate_pattern('custom') == 'custom'
+            assert len(spec.generate(5, 40, 20)) == 2
+            assert spec.calls == 1
+        finally:
+            from kolam import registry
+            del registry._registry['custom']
+        print("✅ New patterns register in one place")
+        
+        return True
+    except Exception as e:
+        print(f"❌ Registry error: {e}")
+        return False
+
+def test_rotated_copies():
+    """Test replicating a fundamental domain by rotation."""
+    try:
+        import numpy as np
+        from kolam.geometry import rotated_copies, polar_points
+        from kolam.generator import build_kolam_geometry
+        
+        angles = (np.arange(12) * 360 / 12) * (np.pi / 180)
+        copies = rotated_copies([(50, 0)], 100, 100, 12)[:, 0]
+        assert np.array_equal(copies, polar_points(100, 100, 50, angles))
+        print("✅ Seeds on the x axis rotate exactly onto polar points")
+        
+        # Every petal of the flower is a turned copy of the first one
+        geometry = build_kolam_geometry(grid_size=9, pattern='flower')
+        petals = geometry.points.reshape(7, 6, 2)
+        assert np.allclose(rotated_copies(petals[0] - 180, 180, 180, 7), petals)
+        print("✅ Patterns are built from one fundamental domain")
+        
+        return True
+    except Exception as e:
+        print(f"❌ Rotated copies error: {e}")
+        return False
+
+def test_pulli_stroke():
+    """Test that the pulli kolam is one stroke using every edge once."""
+    try:
+        import time
+        import numpy as np
+        from kolam.geometry import OP_MOVE, OP_CTRL
+        from kolam.patterns.pulli import pulli_stroke, trace_pulli
+        from kolam.animation import generate_animation_frames
+        
+        def stroke_steps(points, ops):
+            assert np.count_nonzero(ops == OP_MOVE) == 1
+            assert np.allclose(points[0], points[-1])
+            # Each step is a line or an arc between two midpoints; arcs are told
+            # apart from lines by their control point
+            ends = [tuple(point) for point in np.rint(2 * points).astype(int).tolist()]
+            steps, start = set(), ends[0]
+            for index in np.flatnonzero(ops != OP_CTRL)[1:].tolist():
+                control = ends[index - 1] if ops[index - 1] == OP_CTRL else None
+                steps.add((frozenset((start, ends[index])), control))
+                start = ends[index]
+            assert len(steps) == np.count_nonzero(ops != OP_CTRL) - 1
+            return steps
+        
+        for size in (2, 3, 7):
+            steps = stroke_steps(*pulli_stroke(size, size, 1, 0))
+            # One step per side of a dot that faces a neighbour
+            assert len(steps) == 4 * size * (size - 1)
+        print("✅ One closed stroke visits every edge exactly once")
+        
+        for rows, cols in ((2, 2), (3, 5), (7, 7)):
+            traced = trace_pulli(np.ones((rows, cols), dtype=bool))
+            assert stroke_steps(*traced) == stroke_steps(*pulli_stroke(rows, cols, 1, 0))
+        dots = np.array([[1, 1, 0, 1], [0, 1, 1, 1], [1, 1, 0, 1]], dtype=bool)
+        stroke_steps(*trace_pulli(dots))
+        try:
+            trace_pulli(np.array([[1, 1, 0, 1]], dtype=bool))
+            raise AssertionError("disconnected dots were traced")
+        except ValueError:
+            pass
+        try:
+            trace_pulli(np.ones((201, 200), dtype=bool))
+            raise AssertionError("a mask above MAX_TRACE_DOTS was traced")
+        except ValueError:
+            pass
+        print("✅ The graph traversal matches the closed form and traces any connected dots")
+        
+        start = time.time()
+        points, ops = pulli_stroke(500, 500, 40, 40)
+        assert time.time() - start < 1.0
+        print(f"✅ 500x500 stroke of {len(ops)} points built in {time.time() - start:.3f}s")
+        
+        frames = generate_animation_frames('', 5, 'pulli', frame_count=10)
+        lengths = [len(frame) for frame in frames]
+        assert lengths == sorted(lengths) and lengths[0] < lengths[-1]
+        print("✅ The animation traces the stroke in drawing order")
+        
+        from kolam.animated_generator import generate_clean_animation_frames
+        from kolam.patterns.pulli import generate_pulli_pattern
+        from kolam.svg import iter_svg_elements
+        geometry = generate_pulli_pattern(5, 40, 20)
+        assert geometry.head_segments(10 ** 6) is geometry
+        head = geometry.head_segments(7)
+        assert np.count_nonzero(head.ops != OP_CTRL) == 8
+        assert np.array_equal(head.points, geometry.points[:len(head.ops)])
+        frames = generate_clean_animation_frames(5, 'pulli', 10)
+        assert frames[0].count('<path') == 0 and frames[-1].count('<path') == 1
+        assert ''.join(iter_svg_elements(head)).split(' d=')[0] in frames[-1]
+        print("✅ Clean frames draw a prefix of the pattern geometry")
+        
+        return True
+    except Exception as e:
+        print(f"❌ Pulli stroke error: {e}")
+        return False
+
+def test_sikku_curves():
+    """Test tracing mirror curves and counting their loops."""
+    try:
+        import math
+        import time
+        import numpy as np
+        from kolam.patterns.sikku import count_loops, trace_mirror_curves, MIRROR_ON
+        from kolam.generator import generate_kolam_with_analysis
+        
+        for rows, cols in ((1, 1), (3, 3), (4, 6), (5, 7)):
+            assert count_loops(rows, cols) == math.gcd(rows, cols)
+            on = (np.full((rows, cols - 1), MIRROR_ON), np.full((rows - 1, cols), MIRROR_ON))
+            assert count_loops(rows, cols, *on) == rows * cols
+        print("✅ Loop counts match gcd(rows, cols) without mirrors and one per dot with all of them")
+        
+        rng = np.random.default_rng(7)
+        vertical, horizontal = rng.integers(0, 3, (6, 8)), rng.integers(0, 3, (5, 9))
+        states, _, _, lengths = trace_mirror_curves(6, 9, vertical, horizontal)
+        assert len(np.unique(states // 2)) == len(states) == 4 * 6 * 9
+        assert len(lengths) == count_loops(6, 9, vertical, horizontal)
+        print(f"✅ {len(lengths)} curves cover every segment exactly once")
+        
+        start = time.time()
+        trace_mirror_curves(300, 300)
+        assert time.time() - start < 2.0
+        print(f"✅ 300x300 lattice traced in {time.time() - start:.3f}s")
+        
+        analysis = generate_kolam_with_analysis(7, 'sikku')['analysis']
+        assert analysis["loops"] == 9
+        print("✅ Analysis reports the number of closed loops")
+        
+        from kolam.animated_generator import generate_clean_animation_frames
+        frames = generate_clean_animation_frames(7, 'sikku', 10)
+        paths = [frame.count('<path') for frame in frames]
+        assert paths == sorted(paths) and paths[0] == 0 and 1 < paths[-1] <= 9
+        assert all('stroke="#1E3A8A"' in frame for frame in frames[1:])
+        print("✅ Clean frames draw the mirror curves one after another")
+        
+        return True
+    except Exception as e:
+        print(f"❌ Sikku curves error: {e}")
+        return False
+
+def test_kolam_enumeration():
+    """Test enumerating mirror kolams once per symmetry orbit, with resume."""
+    try:
+        import tempfile
+        from kolam.enumeration import (enumerate_kolams, load_kolam_index,
+                                       count_distinct_kolams, decode_mirrors)
+        from kolam.patterns.sikku import count_loops
+        
+        # 2x2 lattices: 21 of the 81 configurations are distinct up to D4
+        assert count_distinct_kolams(2) == 21
+        assert count_distinct_kolams(3, kinds=2) == 570
+        print("✅ Burnside counts match")
+        
+        with tempfile.TemporaryDirectory() as folder:
+            index_path = os.path.join(folder, 'kolams.bin')
+            summary = enumerate_kolams(3, index_path, workers=1, max_tasks=2)
+            assert not summary["complete"]
+            summary = enumerate_kolams(3, index_path, workers=2)
+            assert summary["complete"] and summary["distinct"] == summary["expected"] == 67257
+            print("✅ An interrupted run resumes from its checkpoint")
+            
+            records = load_kolam_index(index_path)
+            assert len(set(records['code'].tolist())) == len(records)
+            assert records['orbit'].astype(int).sum() == 3 ** 12
+            vertical, horizontal = decode_mirrors(int(records['code'][100]), 3)
+            assert count_loops(3, 3, vertical, horizontal) == records['loops'][100]
+            print(f"✅ {len(records)} distinct 3x3 kolams indexed, orbits cover every configuration")
+        
+        return True
+    except Exception as e:
+        print(f"❌ Kolam enumeration error: {e}")
+        return False
+
+def test_pattern_variants():
+    """Test seeded pattern variants and the shared shape cache."""
+    try:
+        from kolam.variation import generate_variant, variant_parameters
+        from kolam.generator import generate_kolam, get_render_cache_stats
+        
+        for pattern in ('flower', 'lotus', 'rose', 'star', 'sunburst', 'mandala'):
+            svg, parameters = generate_variant(9, pattern, seed=42)
+            assert generate_variant(9, pattern, seed=42) == (svg, parameters)
+            assert generate_variant(9, pattern, seed=43)[0] != svg
+            # No seed and no parameters draws the pattern as registered
+            assert generate_variant(9, pattern)[0] == generate_kolam(9, pattern)
+        print("✅ The same seed gives the same variant, other seeds differ")
+        
+        parameters = variant_parameters('flower', seed=7, petals=100, palette=[10, 20, 30, 40])
+        assert parameters['petals'] == 12 and parameters['palette'] == (10, 20, 50, 40)
+        try:
+            variant_parameters('flower', seed=7, spokes=3)
+            assert False, "unknown parameter accepted"
+        except ValueError:
+            pass
+        print("✅ Given parameters are clamped, unknown ones rejected")
+        
+        hits = get_render_cache_stats()["shapes"]["hits"]
+        generate_variant(11, 'flower', seed=42)
+        assert get_render_cache_stats()["shapes"]["hits"] > hits
+        print("✅ Variants at other sizes reuse memoized shapes")
+        
+        return True
+    except Exception as e:
+        print(f"❌ Pattern variants error: {e}")
+        return False
+
+def test_direct_raster():
+    """Test drawing geometry straight to PNG/JPG against the SVG rasterizer."""
+    try:
+        import numpy as np
+        import tempfile
+        from PIL import Image, ImageChops
+        from kolam.generator import build_kolam_geometry
+        from kolam.geometry import merge_elements
+        from kolam.svg import geometry_to_svg
+        from kolam.exporter import convert_svg_to_png, geometry_to_png, geometry_to_jpg
+        from kolam.raster import flatten_points
+        
+        points = np.array([(0, 0), (10, 20), (20, 0), (30, 0)])
+        flat, sources = flatten_points(points, [0, 2, 3, 1], steps=4)
+        assert sources.tolist() == [0, 2, 2, 2, 2, 3]
+        assert np.allclose(flat[2], (10, 10)) and np.allclose(flat[4], (20, 0))
+        print("✅ Curves flatten to polylines in one pass")
+        
+        with tempfile.TemporaryDirectory() as folder:
+            for pattern in ('flower', 'rose', 'star', 'mandala', 'sikku'):
+                geometry = build_kolam_geometry(grid_size=9, pattern=pattern, show_grid=False)
+                convert_svg_to_png(geometry_to_svg(geometry), 'parsed.png', folder)
+                geometry_to_png(geometry, 'direct.png', folder)
+                geometry_to_png(merge_elements(geometry), 'merged.png', folder)
+                with Image.open(os.path.join(folder, 'parsed.png')) as a, \
+                     Image.open(os.path.join(folder, 'direct.png')) as b, \
+                     Image.open(os.path.join(folder, 'merged.png')) as c:
+                    assert a.size == b.size
+                    # Circles drop the parser's default black outline and
+                    # closed subpaths get their closing segment
+                    changed = np.asarray(ImageChops.difference(a, b).convert('L')) > 40
+                    assert changed.mean() < 0.01, f"{pattern}: {changed.mean():.4f}"
+                    assert ImageChops.difference(b, c).getbbox() is None
+            print("✅ Direct PNGs match the SVG rasterizer")
+            
+            geometry_to_jpg(geometry, 'direct.jpg', folder)
+            assert sorted(os.listdir(folder)) == ['direct.jpg', 'direct.png', 'merged.png', 'parsed.png']
+            with Image.open(os.path.join(folder, 'direct.jpg')) as image:
+                assert image.format == 'JPEG'
+            print("✅ JPGs are written without a temporary PNG")
+        
+        return True
+    except Exception as e:
+        print(f"❌ Direct raster error: {e}")
+        return False
+
+def test_curve_flattening():
+    """Test flattening quadratic, cubic and arc commands in one pass."""
+    try:
+        import numpy as np
+        import tempfile
+        from PIL import Image
+        from kolam.raster import flatten_commands, flatten_paths
+        from kolam.exporter import convert_svg_to_png
+        
+        # A half circle of radius 10 round (10, 0), then a cubic and a quadratic
+        flat, moves = flatten_commands([('M', [0, 0]), ('A', [10, 10, 0, 0, 1, 20, 0]),
+                                        ('M', [0, 50]), ('C', [0, 60, 10, 60, 10, 50]),
+                                        ('Q', [15, 40, 20, 50])], steps=8)
+        assert moves.tolist() == [0, 9] and len(flat) == 26
+        assert np.allclose(np.linalg.norm(flat[:9] - (10, 0), axis=1), 10)
+        assert flat[4, 1] < -9.9 and np.allclose(flat[[8, 17, 25]], [(20, 0), (10, 50), (20, 50)])
+        fine, _ = flatten_commands([('M', [0, 0]), ('A', [100, 100, 0, 0, 1, 200, 0])], tolerance=0.1)
+        assert 20 < len(fine) < 64
+        print("✅ Arcs, cubics and quadratics flatten to polylines")
+        
+        flat, moves, bounds = flatten_paths([[('M', [0, 0]), ('L', [5, 5])], [],
+                                             [('M', [1, 1]), ('Q', [2, 2, 3, 1]), ('Z', [])]], steps=4)
+        assert bounds.tolist() == [0, 2, 2, 8] and moves.tolist() == [0, 2]
+        assert np.allclose(flat[-1], (1, 1))
+        print("✅ Many paths flatten together")
+        
+        # Relative arcs and smooth curves from a hand-written SVG
+        svg = ('<svg width="200" height="200" xmlns="http://www.w3.org/2000/svg">'
+               '<rect width="100%" height="100%" fill="white"/>'
+               '<path d="M10 90 a40 40 0 0 1 80 0" fill="none" stroke="#000000" stroke-width="4"/>'
+               '<path d="M10 150 c0 40 40 40 40 0 s40 -40 40 0" fill="none" stroke="#000000" stroke-width="4"/>'
+               '<path d="M110 90 q40 -80 80 0 t80 0" fill="none" stroke="#000000" stroke-width="4"/>'
+               '</svg>')
+        with tempfile.TemporaryDirectory() as folder:
+            convert_svg_to_png(svg, 'curves.png', folder)
+            with Image.open(os.path.join(folder, 'curves.png')) as image:
+                pixels = np.asarray(image.convert('L'))
+        # Top of the arc, the dip of the cubic and its reflected bump, the quadratic's peak
+        for x, y in ((50, 50), (30, 180), (70, 120), (150, 50)):
+            assert pixels[y - 2:y + 3, x - 2:x + 3].min() < 64, (x, y)
+        print("✅ Relative arcs and smooth curves render where they should")
+        
+        return True
+    except Exception as e:
+        print(f"❌ Curve flattening error: {e}")
+        return False
+
+def test_supersampling():
+    """Test scaled, supersampled rasterization and its memory bands."""
+    try:
+        import numpy as np
+        import tempfile
+        from PIL import Image
+        import kolam.raster as raster
+        from kolam.generator import build_kolam_geometry
+        from kolam.svg import geometry_to_svg
+        from kolam.exporter import convert_svg_to_png, geometry_to_png
+        
+        geometry = build_kolam_geometry(grid_size=7, pattern='rose', show_grid=True)
+        plain = np.asarray(raster.render_geometry(geometry).convert('L'))
+        smooth = np.asarray(raster.render_geometry(geometry, supersample=4).convert('L'))
+        assert plain.shape == smooth.shape
+        # Aliased edges are only ink or paper; supersampled ones are shaded
+        assert len(np.unique(smooth)) > 4 * len(np.unique(plain))
+        assert raster.render_geometry(geometry, scale=1.5).size == (int(geometry.width * 1.5),) * 2
+        print("✅ Supersampling anti-aliases at the nominal size and scales")
+        
+        for resample in raster.RESAMPLE_FILTERS:
+            whole = np.asarray(raster.render_geometry(geometry, None, 1.5, 3, resample))
+            band_pixels = raster.MAX_BAND_PIXELS
+            raster.MAX_BAND_PIXELS = 1 << 17
+            try:
+                banded = np.asarray(raster.render_geometry(geometry, None, 1.5, 3, resample))
+                again = np.asarray(raster.render_geometry(geometry, None, 1.5, 3, resample))
+            finally:
+                raster.MAX_BAND_PIXELS = band_pixels
+            assert np.array_equal(banded, again)
+            assert np.array_equal(whole, banded), resample
+        print("✅ Banded renders are deterministic and match one-band renders")
+        
+        def ink(width):
+            svg = (f'<svg xmlns="http://www.w3.org/2000/svg" width="40" height="40">'
+                   f'<path d="M 0 20 L 40 20" stroke="black" stroke-width="{width}"/></svg>')
+            with tempfile.TemporaryDirectory() as folder:
+                convert_svg_to_png(svg, 'line.png', folder, supersample=4)
+                with Image.open(os.path.join(folder, 'line.png')) as image:
+                    return (255 - np.asarray(image.convert('L'), dtype=float)[:, 20]).sum() / 255
+        # Fractional widths keep their weight instead of truncating
+        assert abs(ink(1.5) - 1.5) < 0.3 and abs(ink(2.5) - 2.5) < 0.3, (ink(1.5), ink(2.5))
+        print("✅ Fractional stroke widths survive supersampling")
+        
+        with tempfile.TemporaryDirectory() as folder:
+            geometry_to_png(geometry, 'print.png', folder, dpi=192, supersample=2)
+            convert_svg_to_png(geometry_to_svg(geometry), 'parsed.png', folder, dpi=192,
+                               supersample=2)
+            with Image.open(os.path.join(folder, 'print.png')) as a, \
+                 Image.open(os.path.join(folder, 'parsed.png')) as b:
+                assert a.size == b.size == (int(geometry.width * 2),) * 2
+                assert round(a.info['dpi'][0]) == 192 and round(b.info['dpi'][0]) == 192
+        for options in ({'scale': 0}, {'supersample': 0}, {'resample': 'nearest'}):
+            try:
+                raster.render_geometry(geometry, **options)
+            except ValueError:
+                continue
+            raise AssertionError(f"{options} accepted")
+        print("✅ DPI is recorded in the file and bad options are rejected")
+        
+        return True
+    except Exception as e:
+        print(f"❌ Supersampling error: {e}")
+        return False
+
+def test_export_bytes():
+    """Test encoding exports in memory and writing them as an optional sink."""
+    try:
+        import tempfile
+        from io import BytesIO
+        from PIL import Image
+        from kolam.generator import build_kolam_geometry
+        from kolam.svg import geometry_to_svg
+        from kolam.exporter import (EXPORT_MIMETYPES, export_bytes, write_export,
+                                    convert_svg_to_jpg, geometry_to_png)
+        
+        geometry = build_kolam_geometry(grid_size=7, pattern='star', show_grid=False)
+        svg = geometry_to_svg(geometry)
+        with tempfile.TemporaryDirectory() as folder:
+            before = set(os.listdir('exports'))
+            assert export_bytes(svg, 'svg') == export_bytes(geometry, 'svg') == svg.encode('utf-8')
+            for format_type, name in (('png', 'PNG'), ('jpg', 'JPEG')):
+                for drawing in (geometry, svg):
+                    with Image.open(BytesIO(export_bytes(drawing, format_type))) as image:
+                        assert image.format == name and image.size == (geometry.width,) * 2
+            assert set(os.listdir('exports')) == before
+            print("✅ SVG, PNG and JPG encode in memory")
+            
+            geometry_to_png(geometry, 'star.png', folder)
+            with open(os.path.join(folder, 'star.png'), 'rb') as f:
+                assert f.read() == export_bytes(geometry, 'png')
+            convert_svg_to_jpg(svg, 'star.jpg', folder)
+            write_export(b'<svg/>', 'star.svg', folder)
+            assert sorted(os.listdir(folder)) == ['star.jpg', 'star.png', 'star.svg']
+            print("✅ Files hold the same bytes, with no temporary files left over")
+        
+        assert sorted(EXPORT_MIMETYPES) == ['jpg', 'png', 'svg']
+        try:
+            export_bytes(svg, 'gif')
+        except ValueError:
+            print("✅ Unsupported formats are rejected")
+        else:
+            raise AssertionError("gif accepted")
+        
+        return True
+    except Exception as e:
+        print(f"❌ Export bytes error: {e}")
+        return False
+
+def main():
+    """Run geometry tests."""
+    print("🧪 Testing Geometry IR...")
+    print("=" * 50)
+    
+    tests = [
+        ("Geometry Build", test_geometry_build),
+        ("SVG Serialization", test_svg_serialization),
+        ("Compact Encoding", test_compact_encoding),
+        ("Merged Styles", test_merged_styles),
+        ("Level of Detail", test_level_of_detail),
+        ("Pattern Registry", test_pattern_registry),
+        ("Rotated Copies", test_rotated_copies),
+        ("Pulli Stroke", test_pulli_stroke),
+        ("Sikku Curves", test_sikku_curves),
+        ("Kolam Enumeration", test_kolam_enumeration),
+        ("Pattern Variants", test_pattern_variants),
+        ("Direct Raster", test_direct_raster),
+        ("Curve Flattening", test_curve_flattening),
+        ("Supersampling", test_supersampling),
+        ("Export Bytes", test_export_bytes)
+    ]
+    
+    passed = 0
+    total = len(tests)
+    
+    for test_name, test_func in tests:
+        print(f"\n🔍 Running {test_name}...")
+        if test_func():
+            passed += 1
+        else:
+            print(f"❌ {test_name} failed")
+    
+    print("\n" + "=" * 50)
+    print(f"📊 Test Results: {passed}/{total} tests passed")
+    
+    if passed == total:
+        print("🎉 All geometry tests passed!")
+        return True
+    else:
+        print("⚠️  Some geometry tests failed. Please check the errors above.")
+        return False
+
+if __name__ == "__main__":
+    success = main()
+    sys.exit(0 if success else 1)